@@ -0,0 +1,86 @@
+"""
+Bulk is_staff / is_active changes for HR.
+
+The flags are written with one UPDATE over the faculty whose values actually
+change, and every change gets a FacultyStatusChange row from one bulk_create.
+queryset.update() sends no post_save, so the cached principals, the directory
+and the typeahead index are invalidated here, the same way the Faculty signal
+receivers would. Faculty who become staff (HR approval of a registration) are
+sent one welcome notification in a single batched dispatch.
+"""
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from notifications.sender import send_push_to_users
+
+from .directory import bump_directory_version
+from .models import Faculty, FacultyStatusChange
+from .principal_cache import invalidate_principal
+from .typeahead import record_changes
+
+logger = logging.getLogger('authentication')
+
+STATUS_FIELDS = ('is_staff', 'is_active')
+WELCOME_TITLE = 'Welcome to Prabandh'
+WELCOME_BODY = 'Your account has been approved by HR. You can now use all faculty services.'
+
+
+def _send_welcome(faculty_ids):
+    try:
+        send_push_to_users(faculty_ids, WELCOME_TITLE, WELCOME_BODY, kind='account_approved')
+    except Exception:
+        logger.exception('Welcome notifications failed for %d faculty', len(faculty_ids))
+
+
+def set_account_flags(faculty_ids, flags, changed_by=None):
+    """
+    Apply flags ({'is_staff': bool, 'is_active': bool}, either optional) to the
+    given faculty. Returns {'updated': [ids], 'unchanged': [ids], 'missing': [ids]}.
+    """
+    flags = {field: value for field, value in flags.items() if field in STATUS_FIELDS}
+    now = timezone.now()
+    with transaction.atomic():
+        current = {
+            row['id']: row
+            for row in Faculty.objects.select_for_update()
+            .filter(id__in=faculty_ids)
+            .values('id', *flags)
+        }
+        changes = [
+            FacultyStatusChange(
+                faculty_id=faculty_id,
+                changed_by=changed_by,
+                field=field,
+                old_value=current[faculty_id][field],
+                new_value=value,
+                changed_at=now,
+            )
+            for faculty_id in faculty_ids if faculty_id in current
+            for field, value in flags.items() if current[faculty_id][field] != value
+        ]
+        updated = list(dict.fromkeys(change.faculty_id for change in changes))
+        if updated:
+            Faculty.objects.filter(id__in=updated).update(**flags)
+            FacultyStatusChange.objects.bulk_create(changes)
+
+            welcomed = [
+                change.faculty_id for change in changes
+                if change.field == 'is_staff' and change.new_value
+            ]
+            # update() skips the Faculty signals; do their invalidation once for the whole batch
+            transaction.on_commit(lambda: invalidate_principal(updated))
+            transaction.on_commit(bump_directory_version)
+            transaction.on_commit(lambda: record_changes(updated))
+            if welcomed:
+                transaction.on_commit(lambda: _send_welcome(welcomed))
+
+    changed = set(updated)
+    if updated:
+        logger.info('%s changed %s for %d faculty', changed_by, ', '.join(sorted(flags)), len(updated))
+    return {
+        'updated': updated,
+        'unchanged': [faculty_id for faculty_id in faculty_ids if faculty_id in current and faculty_id not in changed],
+        'missing': [faculty_id for faculty_id in faculty_ids if faculty_id not in current],
+    }
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Faculty, School, FacultyDocument
+from .models import Faculty, School, FacultyDocument, FacultyStatusChange
 from facultyservices.models import EventsDetails
 
 class FacultyAdmin(admin.ModelAdmin):
@@ -13,16 +13,18 @@ class FacultyAdmin(admin.ModelAdmin):
         'is_active',
         'date_joined',
     )
-    search_fields = ('registration_no', 'primary_email', 'name', 'department', 'emptype')  # Added emptype to search
+    search_fields = ('registration_no', 'primary_email', 'name', 'department__name', 'emptype')  # Added emptype to search
     list_filter = ('department', 'is_active', 'emptype')  # Added emptype to filters
+    list_select_related = ('department',)
     
     def get_department(self, obj):
         # Return department if it exists, otherwise return a default value
-        return obj.department if obj.department else "-"
+        return obj.department.name if obj.department else "-"
     get_department.short_description = 'Department'  # Sets the column header
 
 
 admin.site.register(Faculty, FacultyAdmin)
 admin.site.register(EventsDetails)
 admin.site.register(School)
-admin.site.register(FacultyDocument)
\ No newline at end of file
+admin.site.register(FacultyDocument)
+admin.site.register(FacultyStatusChange)
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""
+DRF authentication classes that avoid a Faculty query on every request.
+
+Decoded access tokens are kept in a small per-process LRU until they expire,
+and users come from the snapshot cache in authentication.principal_cache.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import Faculty
+from .principal_cache import get_principal
+
+DECODED_TOKEN_CACHE_SIZE = 2048
+TOKEN_KEY_CACHE_TIMEOUT = 60 * 60
+
+
+class _DecodedTokenCache:
+    """LRU of validated access tokens keyed by the raw token; entries are dropped when the token expires."""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, raw_token):
+        with self._lock:
+            entry = self._entries.get(raw_token)
+            if entry is None:
+                return None
+            validated_token, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[raw_token]
+                return None
+            self._entries.move_to_end(raw_token)
+            return validated_token
+
+    def set(self, raw_token, validated_token):
+        expires_at = validated_token.get('exp')
+        if not expires_at:
+            return
+        with self._lock:
+            self._entries[raw_token] = (validated_token, expires_at)
+            self._entries.move_to_end(raw_token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+_decoded_tokens = _DecodedTokenCache(DECODED_TOKEN_CACHE_SIZE)
+
+
+def _load_user(user_id):
+    try:
+        user = get_principal(user_id)
+    except (Faculty.DoesNotExist, ValueError, TypeError):
+        raise AuthenticationFailed(_("User not found"), code="user_not_found")
+    if not user.is_active:
+        raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+    return user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_validated_token(self, raw_token):
+        validated_token = _decoded_tokens.get(raw_token)
+        if validated_token is None:
+            validated_token = super().get_validated_token(raw_token)
+            _decoded_tokens.set(raw_token, validated_token)
+        return validated_token
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # Revocation compares against the password hash, which snapshots leave out
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        return _load_user(user_id)
+
+
+def _token_key_cache_key(key):
+    return f'authentication:drf_token:{hashlib.sha256(key.encode("utf-8")).hexdigest()}'
+
+
+def forget_token_key(key):
+    cache.delete(_token_key_cache_key(key))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Legacy "Token <key>" authentication with the key -> user id mapping cached."""
+
+    def authenticate_credentials(self, key):
+        cache_key = _token_key_cache_key(key)
+        user_id = cache.get(cache_key)
+        if user_id is None:
+            user_id = Token.objects.filter(key=key).values_list('user_id', flat=True).first()
+            if user_id is None:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            cache.set(cache_key, user_id, TOKEN_KEY_CACHE_TIMEOUT)
+        try:
+            user = _load_user(user_id)
+        except AuthenticationFailed as e:
+            raise exceptions.AuthenticationFailed(e.detail)
+        return (user, key)
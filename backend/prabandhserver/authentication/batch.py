@@ -0,0 +1,44 @@
+"""
+Helpers for the `?ids=1,2,3` batch retrieval endpoints.
+
+A batch endpoint loads every requested object the user may see with one
+filtered query (plus its prefetches) and returns them in the order they were
+asked for. Ids that do not exist and ids the user may not see are both
+reported under 'missing', so a batch never reveals more than the matching
+detail endpoint would.
+"""
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+MAX_BATCH_SIZE = 100
+
+
+def parse_ids(value, limit=MAX_BATCH_SIZE):
+    """The distinct ids of a comma-separated `ids` parameter, in request order."""
+    ids = []
+    for part in (value or '').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if not part.isdigit():
+            raise ValidationError({'error': f'Invalid id "{part}".'})
+        if int(part) not in ids:
+            ids.append(int(part))
+    if not ids:
+        raise ValidationError({'error': 'ids is required, e.g. ?ids=1,2,3.'})
+    if len(ids) > limit:
+        raise ValidationError({'error': f'At most {limit} ids can be requested at once.'})
+    return ids
+
+
+def batch_response(queryset, ids, serializer_class, context):
+    """
+    Serialize the objects of queryset with the given ids in request order.
+    queryset must already be limited to what the user may see.
+    """
+    found = {obj.pk: obj for obj in queryset.filter(pk__in=ids)}
+    objects = [found[pk] for pk in ids if pk in found]
+    return Response({
+        'results': serializer_class(objects, many=True, context=context).data,
+        'missing': [pk for pk in ids if pk not in found],
+    })
@@ -0,0 +1,114 @@
+"""
+Everything the frontend needs on app load, in two queries.
+
+The first query loads the user with their department, school, leave balance
+and unread notification total (all one-to-one joins); the second counts the
+user's own applications and their approval inbox with one conditional
+aggregate. The query count does not depend on role or data size.
+"""
+import hashlib
+import json
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Count, Q
+
+from leave_management.models import LeaveApplication
+
+from .models import Faculty
+
+AWAITING_STATUSES = ['pending', 'forwarded_to_hr', 'forwarded_to_hod', 'forwarded_to_dean', 'forwarded_to_vc']
+APPROVED_STATUSES = ['approved', 'approved_by_hr', 'approved_by_hod', 'approved_by_dean', 'approved_by_vc']
+REJECTED_STATUSES = ['rejected', 'rejected_by_hr', 'rejected_by_hod', 'rejected_by_dean', 'rejected_by_vc']
+
+ROLE_ALIASES = {
+    'hr': 'hr',
+    'hod': 'hod',
+    'head of department': 'hod',
+    'dean': 'dean',
+    'vc': 'vc',
+    'vice chancellor': 'vc',
+}
+
+
+def approval_inbox(user, role):
+    """Q for the applications waiting on this user, matching the *_approvals lists of LeaveApplicationViewSet."""
+    forwarded_to_me = Q(forward_to=str(user.id))
+    if role == 'hod':
+        return forwarded_to_me & Q(status='pending')
+    if role in ('hr', 'dean', 'vc'):
+        return Q(status=f'forwarded_to_{role}') | (forwarded_to_me & Q(status__in=AWAITING_STATUSES))
+    return None
+
+
+def _balance_summary(balance):
+    if balance is None:
+        return None
+    summary = {}
+    for code, _ in LeaveApplication.LEAVE_TYPE_CHOICES:
+        total = getattr(balance, f'{code}_leave')
+        used = getattr(balance, f'{code}_leave_used')
+        summary[code] = {'total': total, 'used': used, 'remaining': total - used}
+    return summary
+
+
+def build_bootstrap(user, request=None):
+    member = (
+        Faculty.objects
+        .select_related('department', 'school', 'leave_balance', 'notification_unread_count')
+        .get(id=user.id)
+    )
+    try:
+        balance = member.leave_balance
+    except ObjectDoesNotExist:
+        balance = None
+    try:
+        unread = member.notification_unread_count.unread
+    except ObjectDoesNotExist:
+        unread = 0
+
+    role = ROLE_ALIASES.get((member.emptype or '').lower(), 'faculty')
+    own = Q(faculty_id=member.id)
+    counts = {
+        'my_pending': Count('id', filter=own & Q(status__in=AWAITING_STATUSES)),
+        'my_approved': Count('id', filter=own & Q(status__in=APPROVED_STATUSES)),
+        'my_rejected': Count('id', filter=own & Q(status__in=REJECTED_STATUSES)),
+    }
+    scope = own
+    inbox = approval_inbox(member, role)
+    if inbox is not None:
+        counts['inbox_pending'] = Count('id', filter=inbox)
+        scope |= inbox
+    counts = LeaveApplication.objects.filter(scope).aggregate(**counts)
+
+    profile_image = member.profile_image.url if member.profile_image else None
+    if profile_image and request is not None:
+        profile_image = request.build_absolute_uri(profile_image)
+
+    return {
+        'profile': {
+            'id': member.id,
+            'name': member.name,
+            'registration_no': member.registration_no,
+            'primary_email': member.primary_email,
+            'designation': member.designation,
+            'department': member.department.name if member.department else '',
+            'school': {'id': member.school.id, 'name': member.school.name} if member.school else None,
+            'profile_image': profile_image,
+            'is_staff': member.is_staff,
+        },
+        'role': role,
+        'emptype': member.emptype,
+        'leave_balance': _balance_summary(balance),
+        'applications': {
+            'pending': counts['my_pending'],
+            'approved': counts['my_approved'],
+            'rejected': counts['my_rejected'],
+        },
+        'inbox': {'pending': counts.get('inbox_pending', 0)},
+        'notifications': {'unread': unread},
+    }
+
+
+def bootstrap_etag(data):
+    payload = json.dumps(data, sort_keys=True, default=str).encode('utf-8')
+    return f'"{hashlib.sha1(payload).hexdigest()}"'
@@ -0,0 +1,182 @@
+"""
+Bulk faculty onboarding from a CSV or XLSX file.
+
+The whole file is validated before anything is written, and every bad row is
+reported with its line number. Valid files are then imported in one
+transaction: passwords are hashed (across a process pool from the
+import_faculty command, in-process from the HR endpoint; see
+authentication.hashing), and Faculty and LeaveBalance rows are inserted with
+bulk_create. bulk_create skips the post_save signal, so leave balances are
+inserted here with the model defaults, which match the signal's allocation.
+"""
+import csv
+import io
+import os
+from datetime import date, datetime
+
+from django.contrib.auth.models import BaseUserManager
+from django.db import transaction
+from rest_framework import serializers
+
+from deputy_registrar.models import School
+from leave_management.models import LeaveBalance
+
+from .departments import DEFAULT_FUZZY_CUTOFF, DepartmentMatcher
+from .directory import bump_directory_version
+from .hashing import hash_passwords
+from .models import Faculty
+from .typeahead import record_changes
+from .serializers import FacultyImportRowSerializer
+
+DEFAULT_CHUNK_SIZE = 500
+# Rows the HR endpoint imports within one request; larger files go through the command
+DEFAULT_WEB_IMPORT_MAX_ROWS = 50
+
+
+def _cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        # Spreadsheets store registration numbers and phone numbers as floats
+        return str(int(value))
+    if isinstance(value, (datetime, date)):
+        return value.strftime('%Y-%m-%d')
+    return str(value).strip()
+
+
+def read_rows(fileobj, filename):
+    """
+    Rows of a .csv or .xlsx file as (line_number, dict) pairs keyed by the
+    lower-cased header. Blank rows are skipped. Raises ValueError for other file types.
+    """
+    extension = os.path.splitext(filename or '')[1].lower()
+    if extension == '.csv':
+        text = fileobj.read()
+        if isinstance(text, bytes):
+            text = text.decode('utf-8-sig')
+        table = list(csv.reader(io.StringIO(text)))
+    elif extension == '.xlsx':
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise ValueError('Importing .xlsx files requires openpyxl to be installed.')
+        workbook = load_workbook(fileobj, read_only=True, data_only=True)
+        table = list(workbook.worksheets[0].iter_rows(values_only=True))
+        workbook.close()
+    else:
+        raise ValueError('Upload a .csv or .xlsx file.')
+
+    if not table:
+        return []
+    headers = [_cell(header).lower() for header in table[0]]
+    rows = []
+    for line_number, values in enumerate(table[1:], start=2):
+        row = {header: _cell(value) for header, value in zip(headers, values) if header}
+        if any(row.values()):
+            rows.append((line_number, row))
+    return rows
+
+
+def _school_lookup():
+    lookup = {}
+    for school_id, name in School.objects.values_list('id', 'name'):
+        lookup[str(school_id)] = school_id
+        lookup[name.strip().lower()] = school_id
+    return lookup
+
+
+def validate_rows(rows):
+    """
+    Validate every row. Returns (valid, errors): valid is a list of
+    validated_data dicts with school_id and department_id resolved, errors a
+    list of {'row': line_number, 'errors': {...}}.
+    """
+    schools = _school_lookup()
+    departments = DepartmentMatcher()
+    valid, errors = [], []
+    seen_emails, seen_registrations = {}, {}
+    # One serializer for every row: building a ModelSerializer's fields costs more than validating a row
+    serializer = FacultyImportRowSerializer()
+
+    for line_number, row in rows:
+        school = row.pop('school', '')
+        try:
+            data, row_errors = dict(serializer.run_validation(row)), {}
+        except serializers.ValidationError as e:
+            data, row_errors = {}, dict(e.detail)
+
+        if school and school.lower() not in schools:
+            row_errors['school'] = [f'Unknown school "{school}".']
+        if data:
+            data['primary_email'] = BaseUserManager.normalize_email(data['primary_email'])
+            data['school_id'] = schools.get(school.lower()) if school else None
+            department = data.pop('department', '')
+            if department:
+                data['department_id'] = departments.match(department, data['school_id'], cutoff=DEFAULT_FUZZY_CUTOFF)
+                if data['department_id'] is None:
+                    row_errors['department'] = [f'Unknown department "{department}".']
+            for field, seen in (('primary_email', seen_emails), ('registration_no', seen_registrations)):
+                if data[field] in seen:
+                    row_errors[field] = [f'Duplicate of row {seen[data[field]]}.']
+                else:
+                    seen[data[field]] = line_number
+
+        if row_errors:
+            errors.append({'row': line_number, 'errors': row_errors})
+        else:
+            valid.append((line_number, data))
+
+    # One query per field for clashes with existing faculty, instead of one per row
+    clashes = {}
+    for field in ('primary_email', 'registration_no'):
+        values = [data[field] for _, data in valid]
+        existing = set()
+        for start in range(0, len(values), DEFAULT_CHUNK_SIZE):
+            existing.update(
+                Faculty.objects.filter(**{f'{field}__in': values[start:start + DEFAULT_CHUNK_SIZE]})
+                .values_list(field, flat=True)
+            )
+        for line_number, data in valid:
+            if data[field] in existing:
+                clashes.setdefault(line_number, {})[field] = ['Faculty with this value already exists.']
+
+    errors.extend({'row': line_number, 'errors': row_errors} for line_number, row_errors in clashes.items())
+    errors.sort(key=lambda error: error['row'])
+    return [data for line_number, data in valid if line_number not in clashes], errors
+
+
+def create_faculty(rows, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Insert validated rows with their leave balances. Returns the created Faculty."""
+    hashes = hash_passwords([data.pop('password') for data in rows], workers=workers)
+    faculty = [Faculty(password=password_hash, **data) for data, password_hash in zip(rows, hashes)]
+
+    with transaction.atomic():
+        Faculty.objects.bulk_create(faculty, batch_size=chunk_size)
+        if any(member.pk is None for member in faculty):
+            # Backends that cannot return ids from a bulk insert
+            ids = dict(
+                Faculty.objects.filter(primary_email__in=[member.primary_email for member in faculty])
+                .values_list('primary_email', 'id')
+            )
+            for member in faculty:
+                member.pk = ids[member.primary_email]
+        LeaveBalance.objects.bulk_create(
+            [LeaveBalance(faculty_id=member.pk) for member in faculty],
+            batch_size=chunk_size,
+        )
+    # bulk_create sends no post_save, so the directory signal does not run
+    transaction.on_commit(bump_directory_version)
+    transaction.on_commit(lambda: record_changes([member.pk for member in faculty]))
+    return faculty
+
+
+def import_faculty(rows, dry_run=False, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Validate and, when the whole file is valid, import it.
+    Returns {'rows': n, 'created': n, 'errors': [...]}.
+    """
+    valid, errors = validate_rows(rows)
+    created = 0
+    if not errors and not dry_run:
+        created = len(create_faculty(valid, workers=workers, chunk_size=chunk_size))
+    return {'rows': len(rows), 'created': created, 'errors': errors}
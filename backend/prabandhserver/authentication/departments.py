@@ -0,0 +1,71 @@
+"""
+Matching free-text department names to deputy_registrar.Department rows.
+
+Used when a department is given by name: registration and profile updates,
+the bulk import and the backfill_faculty_departments command. Names match
+ignoring case and spacing, then by acronym ("CSE" for "Computer Science and
+Engineering"), then, when a cutoff is given, by difflib similarity. The
+faculty member's own school is tried before departments of other schools,
+and a name shared by departments of several schools never matches outside
+the school.
+"""
+import difflib
+from collections import defaultdict
+
+from deputy_registrar.models import Department
+
+DEFAULT_FUZZY_CUTOFF = 0.85
+ACRONYM_STOPWORDS = {'and', 'of', 'the', 'for', 'in', '&'}
+
+
+def normalize_name(name):
+    return ' '.join((name or '').replace('&', ' & ').split()).casefold()
+
+
+def acronym(name):
+    words = [word for word in normalize_name(name).replace('-', ' ').split() if word not in ACRONYM_STOPWORDS]
+    return ''.join(word[0] for word in words) if len(words) > 1 else ''
+
+
+class DepartmentMatcher:
+    """Resolves names against one snapshot of the Department table."""
+
+    def __init__(self, departments=None):
+        if departments is None:
+            departments = Department.objects.values_list('id', 'name', 'school_id')
+        # {school_id or None: {key: {department ids}}}, None holding every school
+        self._names = defaultdict(lambda: defaultdict(set))
+        self._acronyms = defaultdict(lambda: defaultdict(set))
+        for department_id, name, school_id in departments:
+            for scope in (school_id, None):
+                self._names[scope][normalize_name(name)].add(department_id)
+                if acronym(name):
+                    self._acronyms[scope][acronym(name)].add(department_id)
+
+    @staticmethod
+    def _unique(ids):
+        return next(iter(ids)) if len(ids) == 1 else None
+
+    def match(self, name, school_id=None, cutoff=None):
+        """The Department id for name, or None when there is no single match."""
+        key = normalize_name(name)
+        if not key:
+            return None
+        scopes = [school_id, None] if school_id else [None]
+
+        for index in (self._names, self._acronyms):
+            for scope in scopes:
+                if key in index[scope]:
+                    found = self._unique(index[scope][key])
+                    if found:
+                        return found
+
+        if cutoff:
+            for scope in scopes:
+                candidates = {
+                    candidate: ids for candidate, ids in self._names[scope].items() if len(ids) == 1
+                }
+                close = difflib.get_close_matches(key, list(candidates), n=1, cutoff=cutoff)
+                if close:
+                    return self._unique(candidates[close[0]])
+        return None
@@ -0,0 +1,170 @@
+"""
+Cached faculty directory for dropdowns and pickers.
+
+Each listing (faculty grouped by emptype, by department, the department names,
+full profiles by emptype) is built with one query and cached under the
+directory version. The Faculty post_save / post_delete signals move the version
+on, so every listing is rebuilt on its next read. Rebuilds are single-flight: a
+burst of requests after an invalidation runs one query, the others wait for
+its result.
+"""
+import time
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.db.models.functions import Upper
+
+from .models import Faculty
+
+DIRECTORY_VERSION_KEY = 'authentication:directory_version'
+DIRECTORY_TIMEOUT = 60 * 60
+# How long a rebuild may hold the lock, and how long others wait for it
+REBUILD_LOCK_TIMEOUT = 10
+REBUILD_POLL_INTERVAL = 0.05
+
+# Saving only these fields (logins, lockout bookkeeping) leaves the directory unchanged
+NON_DIRECTORY_FIELDS = {
+    'password', 'last_login', 'last_login_ip', 'password_changed_at',
+    'failed_login_attempts', 'last_failed_login', 'account_locked_until',
+}
+
+
+def get_directory_version():
+    version = cache.get(DIRECTORY_VERSION_KEY)
+    if version is None:
+        # A fresh, never-used value, so listings cached before an eviction are not picked up again
+        cache.add(DIRECTORY_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(DIRECTORY_VERSION_KEY)
+    return version
+
+
+def bump_directory_version():
+    cache.set(DIRECTORY_VERSION_KEY, time.time_ns(), None)
+
+
+def _cached(name, build):
+    """The cached value of a listing, rebuilt by one caller at a time on a miss."""
+    key = f'authentication:directory:{get_directory_version()}:{name}'
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    lock_key = f'{key}:lock'
+    deadline = time.monotonic() + REBUILD_LOCK_TIMEOUT
+    while not cache.add(lock_key, 1, REBUILD_LOCK_TIMEOUT):
+        # Someone else is rebuilding; use their result once it lands
+        time.sleep(REBUILD_POLL_INTERVAL)
+        value = cache.get(key)
+        if value is not None:
+            return value
+        if time.monotonic() > deadline:
+            return build()
+    try:
+        value = cache.get(key)
+        if value is None:
+            value = build()
+            cache.set(key, value, DIRECTORY_TIMEOUT)
+        return value
+    finally:
+        cache.delete(lock_key)
+
+
+def department_rows(rows):
+    """Rename department__name to department ('' for none) in values() rows, as the API returns it."""
+    for row in rows:
+        row['department'] = row.pop('department__name') or ''
+        yield row
+
+
+def _group(rows, field):
+    grouped = {}
+    for row in rows:
+        grouped.setdefault(row.pop(field), []).append(row)
+    return grouped
+
+
+def faculty_by_emptype():
+    """{emptype: [{id, name, registration_no, department}, ...]} for every non-blank emptype."""
+    return _cached('by_emptype', lambda: _group(
+        department_rows(
+            Faculty.objects.exclude(emptype='')
+            .order_by('emptype', 'id')
+            .values('emptype', 'id', 'name', 'registration_no', 'department__name')
+        ),
+        'emptype',
+    ))
+
+
+def faculty_by_department():
+    """{department name: [{id, name, registration_no, designation, primary_email}, ...]}."""
+    return _cached('by_department', lambda: _group(
+        department_rows(
+            Faculty.objects.filter(department__isnull=False)
+            .order_by('department__name', 'id')
+            .values('department__name', 'id', 'name', 'registration_no', 'designation', 'primary_email')
+        ),
+        'department',
+    ))
+
+
+def department_names():
+    return _cached('departments', lambda: list(
+        Faculty.objects.filter(department__isnull=False).order_by('department__name')
+        .values_list('department__name', flat=True).distinct()
+    ))
+
+
+def profiles_by_emptype(serializer_class, context, base_url):
+    """
+    {emptype: [serialized profile, ...]} ordered by name. Cached per base URL,
+    since serialized profile_image URLs are absolute.
+    """
+    def build():
+        faculty = list(Faculty.objects.exclude(emptype='').select_related('department').order_by('name'))
+        grouped = {}
+        for data, member in zip(serializer_class(faculty, many=True, context=context).data, faculty):
+            grouped.setdefault(member.emptype, []).append(data)
+        return grouped
+
+    return _cached(f'profiles_by_emptype:{base_url}', build)
+
+
+def search_faculty(queryset, query):
+    """
+    Faculty whose name, registration_no or primary_email starts with query,
+    ignoring case. Written as a range on UPPER(column) so each branch uses the
+    matching expression index on Faculty instead of a LIKE scan.
+    """
+    prefix = query.strip().upper()
+    if not prefix:
+        return queryset
+    # Every string starting with prefix sorts between prefix and prefix + U+FFFF
+    upper_bound = prefix + '\uffff'
+    condition = Q()
+    for field in ('name', 'registration_no', 'primary_email'):
+        alias = f'{field}_upper'
+        queryset = queryset.alias(**{alias: Upper(field)})
+        condition |= Q(**{f'{alias}__gte': prefix, f'{alias}__lt': upper_bound})
+    return queryset.filter(condition)
+
+
+def filter_faculty(queryset, params):
+    """
+    Apply the directory filters: school (id), department (id or name), emptype,
+    is_staff and q (prefix search).
+    """
+    school = params.get('school')
+    if school:
+        queryset = queryset.filter(school_id=school)
+    department = params.get('department')
+    if department:
+        if department.isdigit():
+            queryset = queryset.filter(department_id=department)
+        else:
+            queryset = queryset.filter(department__name=department)
+    if params.get('emptype'):
+        queryset = queryset.filter(emptype=params['emptype'])
+    is_staff = params.get('is_staff', '').lower()
+    if is_staff in ('true', '1', 'false', '0'):
+        queryset = queryset.filter(is_staff=is_staff in ('true', '1'))
+    return search_faculty(queryset, params.get('q', ''))
@@ -0,0 +1,26 @@
+"""
+Password hashing across a process pool, for bulk onboarding from the
+import_faculty management command. Web requests pass workers=1: forking a
+threaded server worker can deadlock, and the pool would take every core.
+
+Kept free of model imports so worker processes started with the "spawn"
+method only need DJANGO_SETTINGS_MODULE to hash.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+
+# Below this many passwords starting the pool costs more than it saves
+MIN_PARALLEL_PASSWORDS = 32
+
+
+def hash_passwords(passwords, workers=None):
+    """make_password() for every password, in order, spread over `workers` processes."""
+    passwords = list(passwords)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(passwords) < MIN_PARALLEL_PASSWORDS:
+        return [make_password(password) for password in passwords]
+    chunksize = max(1, len(passwords) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(make_password, passwords, chunksize=chunksize))
@@ -0,0 +1,160 @@
+"""
+Login throttling and progressive account lockout.
+
+Every login attempt is counted against a per-IP and a per-account limit for the
+current one-minute window, and locked accounts are refused, all before
+authenticate() runs the password hasher. Failed attempts count up
+Faculty.failed_login_attempts; from LOGIN_LOCKOUT_THRESHOLD failures on the
+account is locked, twice as long for each further failure.
+
+Staff sign in from behind the campus NAT, so many people share one address:
+the per-IP limit only stops floods from a single source and is set far above
+the per-account limit, which together with the lockout stops password guessing.
+"""
+import hashlib
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+from rest_framework.exceptions import Throttled
+
+from .models import Faculty
+
+DEFAULTS = {
+    'LOGIN_THROTTLE_ENABLED': True,
+    # Reverse proxies in front of the app; 0 takes the client address from REMOTE_ADDR
+    'LOGIN_TRUSTED_PROXY_COUNT': 0,
+    'LOGIN_THROTTLE_IP_PER_MINUTE': 300,
+    'LOGIN_THROTTLE_ACCOUNT_PER_MINUTE': 5,
+    'LOGIN_LOCKOUT_THRESHOLD': 5,
+    'LOGIN_LOCKOUT_BASE_SECONDS': 60,
+    'LOGIN_LOCKOUT_MAX_SECONDS': 60 * 60,
+    # Failures older than this no longer count towards a lockout
+    'LOGIN_LOCKOUT_RESET_SECONDS': 24 * 60 * 60,
+}
+WINDOW_SECONDS = 60
+
+
+def _setting(name):
+    return getattr(settings, name, DEFAULTS[name])
+
+
+def client_ip(request):
+    """
+    The client address. Behind LOGIN_TRUSTED_PROXY_COUNT proxies it is the
+    X-Forwarded-For entry that many hops from the right: the last proxy appends
+    the address that connected to it, and anything further left was sent by
+    the client and cannot be trusted.
+    """
+    if request is None:
+        return ''
+    trusted = _setting('LOGIN_TRUSTED_PROXY_COUNT')
+    hops = [hop.strip() for hop in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if hop.strip()]
+    if trusted and hops:
+        return hops[-min(trusted, len(hops))]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _window_key(scope, identity, window):
+    digest = hashlib.sha256(identity.encode('utf-8')).hexdigest()
+    return f'authentication:login_window:{scope}:{digest}:{window}'
+
+
+def _count_attempt(scope, identity, limit):
+    """
+    Count one attempt in the current window. Returns 0 when it is within limit,
+    otherwise the seconds until the window ends.
+
+    Each attempt claims its own numbered slot with cache.add(), which is atomic
+    on every backend (an INSERT on the database cache), so concurrent attempts
+    cannot share a slot and slip past the limit; incr() is a read-modify-write
+    on the database cache. The counter key only says where to start looking.
+    """
+    now = time.time()
+    window = int(now // WINDOW_SECONDS)
+    key = _window_key(scope, identity, window)
+    slot = cache.get(key, 0)
+    while slot < limit:
+        if cache.add(f'{key}:{slot}', True, WINDOW_SECONDS * 2):
+            cache.set(key, slot + 1, WINDOW_SECONDS * 2)
+            return 0
+        slot += 1
+    return (window + 1) * WINDOW_SECONDS - now
+
+
+def _account(email):
+    """
+    The account a login for email is checked against: an exact match on the
+    normalized address, as create_user() stores it, so the unique index on
+    primary_email is used.
+    """
+    return Faculty.objects.filter(primary_email=Faculty.objects.normalize_email((email or '').strip()))
+
+
+def check_login_allowed(request, email):
+    """Raise Throttled when the IP or account is out of attempts or the account is locked."""
+    if not _setting('LOGIN_THROTTLE_ENABLED'):
+        return
+    for scope, identity, limit in (
+        ('ip', client_ip(request), _setting('LOGIN_THROTTLE_IP_PER_MINUTE')),
+        # Case variants of one address share the window
+        ('account', (email or '').strip().lower(), _setting('LOGIN_THROTTLE_ACCOUNT_PER_MINUTE')),
+    ):
+        wait = _count_attempt(scope, identity, limit)
+        if wait:
+            raise Throttled(wait=wait, detail='Too many login attempts. Please try again later.')
+
+    locked_until = (
+        _account(email)
+        .values_list('account_locked_until', flat=True)
+        .first()
+    )
+    if locked_until and locked_until > timezone.now():
+        raise Throttled(
+            wait=(locked_until - timezone.now()).total_seconds(),
+            detail='Account temporarily locked after repeated failed logins. Please try again later.',
+        )
+
+
+def record_failed_login(email):
+    if not _setting('LOGIN_THROTTLE_ENABLED'):
+        return
+    now = timezone.now()
+    reset_before = now - timedelta(seconds=_setting('LOGIN_LOCKOUT_RESET_SECONDS'))
+    account = _account(email)
+
+    # update() rather than save(): lockout bookkeeping must not invalidate cached principals.
+    # The count is incremented in the database so concurrent failures are all counted.
+    with transaction.atomic():
+        updated = account.update(
+            failed_login_attempts=Case(
+                When(last_failed_login__lt=reset_before, then=Value(1)),
+                default=F('failed_login_attempts') + 1,
+            ),
+            last_failed_login=now,
+        )
+        if not updated:
+            return
+        account_id, attempts = account.values_list('id', 'failed_login_attempts').first()
+
+        threshold = _setting('LOGIN_LOCKOUT_THRESHOLD')
+        if attempts >= threshold:
+            lock_seconds = min(
+                _setting('LOGIN_LOCKOUT_BASE_SECONDS') * 2 ** (attempts - threshold),
+                _setting('LOGIN_LOCKOUT_MAX_SECONDS'),
+            )
+            Faculty.objects.filter(id=account_id).update(account_locked_until=now + timedelta(seconds=lock_seconds))
+
+
+def record_successful_login(user):
+    if user.failed_login_attempts or user.account_locked_until:
+        Faculty.objects.filter(id=user.id).update(
+            failed_login_attempts=0, last_failed_login=None, account_locked_until=None
+        )
+        user.failed_login_attempts = 0
+        user.last_failed_login = None
+        user.account_locked_until = None
@@ -0,0 +1,89 @@
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from authentication.departments import DEFAULT_FUZZY_CUTOFF, DepartmentMatcher, normalize_name
+from authentication.directory import bump_directory_version
+from authentication.models import Faculty
+from authentication.principal_cache import invalidate_principal
+from authentication.typeahead import record_changes
+from deputy_registrar.models import Department
+
+
+class Command(BaseCommand):
+    help = (
+        'Link faculty to a Department from their free-text legacy_department, matching '
+        'names ignoring case, by acronym and fuzzily. Unmatched names are listed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--cutoff',
+            type=float,
+            default=DEFAULT_FUZZY_CUTOFF,
+            help='Minimum difflib similarity (0-1) for a fuzzy match; 1 disables fuzzy matching',
+        )
+        parser.add_argument(
+            '--create-missing',
+            action='store_true',
+            help="Create a Department in the faculty member's school for names that match nothing",
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report matches without saving them',
+        )
+
+    def handle(self, *args, **options):
+        cutoff = options['cutoff'] if options['cutoff'] < 1 else None
+        pending = list(
+            Faculty.objects.filter(department__isnull=True).exclude(legacy_department='')
+            .only('id', 'school_id', 'legacy_department')
+        )
+        names = dict(Department.objects.values_list('id', 'name'))
+        matcher = DepartmentMatcher()
+
+        matched, unmatched = [], []
+        for faculty in pending:
+            faculty.department_id = matcher.match(faculty.legacy_department, faculty.school_id, cutoff=cutoff)
+            (matched if faculty.department_id else unmatched).append(faculty)
+
+        created = 0
+        if options['create_missing'] and not options['dry_run']:
+            new_departments = {}
+            for faculty in [faculty for faculty in unmatched if faculty.school_id]:
+                key = (faculty.school_id, normalize_name(faculty.legacy_department))
+                if key not in new_departments:
+                    new_departments[key] = Department.objects.create(
+                        name=' '.join(faculty.legacy_department.split()), school_id=faculty.school_id
+                    )
+                    created += 1
+                faculty.department_id = new_departments[key].id
+                names[faculty.department_id] = new_departments[key].name
+                matched.append(faculty)
+            unmatched = [faculty for faculty in unmatched if not faculty.department_id]
+
+        mappings = Counter((faculty.legacy_department, names[faculty.department_id]) for faculty in matched)
+        for (legacy, name), count in sorted(mappings.items()):
+            if legacy != name:
+                self.stdout.write(f'"{legacy}" -> "{name}" ({count})')
+        for legacy, count in sorted(Counter(faculty.legacy_department for faculty in unmatched).items()):
+            self.stdout.write(self.style.WARNING(f'No department for "{legacy}" ({count})'))
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(
+                f'Dry run: {len(matched)} of {len(pending)} faculty would be linked'
+            ))
+            return
+
+        with transaction.atomic():
+            Faculty.objects.bulk_update(matched, ['department'], batch_size=500)
+        # bulk_update sends no post_save
+        invalidate_principal([faculty.id for faculty in matched])
+        bump_directory_version()
+        record_changes([faculty.id for faculty in matched])
+        self.stdout.write(self.style.SUCCESS(
+            f'Linked {len(matched)} of {len(pending)} faculty, created {created} departments, '
+            f'{len(unmatched)} left unmatched. Run sync_fcm_topics to update department topics.'
+        ))
@@ -0,0 +1,90 @@
+import re
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+
+from authentication.models import Faculty
+
+WRITE_PATTERN = re.compile(r'^\s*(INSERT|UPDATE|DELETE)\b', re.IGNORECASE)
+SESSION_CLASS = 'rest_framework.authentication.SessionAuthentication'
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare database writes per authenticated API request with session auth and '
+        'with AUTH_STATELESS. Runs against a throwaway test database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=50,
+            help='Number of authenticated API requests per mode',
+        )
+        parser.add_argument(
+            '--path',
+            default='/api/auth/check-auth/',
+            help='API path to request',
+        )
+
+    def _mode_settings(self, stateless):
+        authentication_classes = [
+            cls for cls in settings.REST_FRAMEWORK['DEFAULT_AUTHENTICATION_CLASSES']
+            if cls != SESSION_CLASS
+        ]
+        if not stateless:
+            authentication_classes.append(SESSION_CLASS)
+        return override_settings(
+            AUTH_STATELESS=stateless,
+            SESSION_SAVE_EVERY_REQUEST=not stateless,
+            REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_AUTHENTICATION_CLASSES': authentication_classes},
+        )
+
+    def _run(self, stateless, email, password, count, path):
+        with self._mode_settings(stateless):
+            # Behaves like the browser: keeps cookies and sends the Bearer token
+            client = Client()
+            response = client.post('/api/auth/login/', {'primary_email': email, 'password': password})
+            access = response.json()['access']
+
+            with CaptureQueriesContext(connection) as queries:
+                for _ in range(count):
+                    client.get(path, HTTP_AUTHORIZATION=f'Bearer {access}')
+
+        statements = [query['sql'] for query in queries.captured_queries]
+        writes = [sql for sql in statements if WRITE_PATTERN.match(sql)]
+        session = [sql for sql in statements if 'django_session' in sql]
+        return {
+            'queries': len(statements) / count,
+            'writes': len(writes) / count,
+            'session': len(session) / count,
+        }
+
+    def handle(self, *args, **options):
+        count = options['requests']
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            email, password = 'benchmark@example.com', 'benchmark-pass-123'
+            Faculty.objects.create_user(
+                email=email, password=password, name='Benchmark', registration_no='BENCH-1', emptype='faculty'
+            )
+            results = {
+                'session (current)': self._run(False, email, password, count, options['path']),
+                'stateless (JWT only)': self._run(True, email, password, count, options['path']),
+            }
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(f"GET {options['path']} x {count}, per request:")
+        self.stdout.write(f"{'mode':<24}{'queries':>10}{'writes':>10}{'session':>10}")
+        for mode, result in results.items():
+            self.stdout.write(
+                f"{mode:<24}{result['queries']:>10.2f}{result['writes']:>10.2f}{result['session']:>10.2f}"
+            )
+        self.stdout.write(self.style.SUCCESS('Done'))
@@ -0,0 +1,93 @@
+import time
+from collections import Counter
+from unittest import mock
+
+from django.contrib.auth.hashers import get_hasher
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from authentication.models import Faculty
+
+
+class Command(BaseCommand):
+    help = (
+        'Load test the login endpoint with a password-guessing attack, with and without '
+        'login throttling, and report password hashes computed and CPU time used. '
+        'Runs against a throwaway test database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--attempts',
+            type=int,
+            default=300,
+            help='Number of failed login attempts per scenario',
+        )
+        parser.add_argument(
+            '--ips',
+            type=int,
+            default=1,
+            help='Number of source IPs the attack rotates through',
+        )
+
+    def _attack(self, enabled, email, attempts, ips):
+        cache.clear()
+        Faculty.objects.filter(primary_email=email).update(
+            failed_login_attempts=0, last_failed_login=None, account_locked_until=None
+        )
+        hasher_class = type(get_hasher('default'))
+        original_encode = hasher_class.encode
+        hashes = Counter()
+
+        def counting_encode(hasher, *args, **kwargs):
+            hashes['count'] += 1
+            return original_encode(hasher, *args, **kwargs)
+
+        client = Client()
+        statuses = Counter()
+        with override_settings(LOGIN_THROTTLE_ENABLED=enabled), \
+                mock.patch.object(hasher_class, 'encode', counting_encode):
+            cpu_started, wall_started = time.process_time(), time.perf_counter()
+            for attempt in range(attempts):
+                response = client.post(
+                    '/api/auth/login/',
+                    {'primary_email': email, 'password': f'guess-{attempt}'},
+                    REMOTE_ADDR=f'10.0.{attempt % ips // 256}.{attempt % ips % 256}',
+                )
+                statuses[response.status_code] += 1
+            cpu = time.process_time() - cpu_started
+            wall = time.perf_counter() - wall_started
+        return {'hashes': hashes['count'], 'cpu': cpu, 'wall': wall, 'statuses': statuses}
+
+    def handle(self, *args, **options):
+        attempts, ips = options['attempts'], max(options['ips'], 1)
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            email = 'benchmark@example.com'
+            Faculty.objects.create_user(
+                email=email, password='benchmark-pass-123', name='Benchmark', registration_no='BENCH-1', emptype='faculty'
+            )
+            results = {
+                'unthrottled': self._attack(False, email, attempts, ips),
+                'throttled': self._attack(True, email, attempts, ips),
+            }
+            locked_until = Faculty.objects.get(primary_email=email).account_locked_until
+        finally:
+            cache.clear()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(f'{attempts} failed logins against one account from {ips} IP(s):')
+        self.stdout.write(f"{'mode':<14}{'hashes':>8}{'cpu s':>9}{'wall s':>9}{'cpu ms/try':>12}  statuses")
+        for mode, result in results.items():
+            statuses = ', '.join(f'{code}: {count}' for code, count in sorted(result['statuses'].items()))
+            self.stdout.write(
+                f"{mode:<14}{result['hashes']:>8}{result['cpu']:>9.2f}{result['wall']:>9.2f}"
+                f"{result['cpu'] * 1000 / attempts:>12.2f}  {statuses}"
+            )
+        self.stdout.write(f'Account locked until: {locked_until}')
+        self.stdout.write(self.style.SUCCESS('Done'))
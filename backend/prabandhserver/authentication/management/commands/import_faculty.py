@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from authentication.bulk_import import DEFAULT_CHUNK_SIZE, import_faculty, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        'Onboard faculty in bulk from a .csv or .xlsx file with a header row '
+        '(primary_email, password, name, registration_no, emptype, department, school, ...). '
+        'Nothing is imported unless every row is valid.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Path to the .csv or .xlsx file')
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only validate the file',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Processes used for password hashing (default: number of CPUs)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Rows inserted per query',
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            with open(options['path'], 'rb') as fileobj:
+                rows = read_rows(fileobj, options['path'])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        result = import_faculty(
+            rows, dry_run=options['dry_run'], workers=options['workers'], chunk_size=options['chunk_size']
+        )
+        for error in result['errors']:
+            details = '; '.join(f"{field}: {' '.join(str(message) for message in messages)}"
+                                for field, messages in error['errors'].items())
+            self.stdout.write(self.style.ERROR(f"Row {error['row']}: {details}"))
+        if result['errors']:
+            raise CommandError(f"{len(result['errors'])} of {result['rows']} rows are invalid; nothing was imported.")
+
+        elapsed = time.perf_counter() - started
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"All {result['rows']} rows are valid ({elapsed:.1f}s)"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Imported {result['created']} faculty in {elapsed:.1f}s"))
@@ -0,0 +1,108 @@
+import logging
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+logger = logging.getLogger('authentication')
+
+# (model, column) pairs that need an index; refresh, blacklist checks and pruning depend on them
+REQUIRED_INDEXES = [
+    (OutstandingToken, 'jti'),
+    (OutstandingToken, 'expires_at'),
+    (BlacklistedToken, 'token_id'),
+]
+
+
+def missing_indexes():
+    missing = []
+    with connection.cursor() as cursor:
+        for model, column in REQUIRED_INDEXES:
+            table = model._meta.db_table
+            constraints = connection.introspection.get_constraints(cursor, table)
+            if not any(
+                (info['index'] or info['unique']) and info['columns'] and info['columns'][0] == column
+                for info in constraints.values()
+            ):
+                missing.append(f'{table}({column})')
+    return missing
+
+
+def table_growth(now):
+    """Row counts and rows added per day over the last day and week."""
+    day_ago, week_ago = now - timedelta(days=1), now - timedelta(days=7)
+    return {
+        'outstanding': (
+            OutstandingToken.objects.count(),
+            OutstandingToken.objects.filter(created_at__gte=day_ago).count(),
+            OutstandingToken.objects.filter(created_at__gte=week_ago).count() / 7,
+        ),
+        'blacklisted': (
+            BlacklistedToken.objects.count(),
+            BlacklistedToken.objects.filter(blacklisted_at__gte=day_ago).count(),
+            BlacklistedToken.objects.filter(blacklisted_at__gte=week_ago).count() / 7,
+        ),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete expired JWT outstanding and blacklisted tokens in chunks, verify the '
+        'indexes token refresh relies on and report table growth. Schedule daily.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Number of outstanding tokens deleted per query',
+        )
+        parser.add_argument(
+            '--check-only',
+            action='store_true',
+            help='Only verify indexes and report growth, do not delete',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        now = timezone.now()
+
+        missing = missing_indexes()
+        if missing:
+            logger.error(f"JWT token tables are missing indexes: {', '.join(missing)}")
+            if options['check_only']:
+                raise CommandError(f"Missing indexes: {', '.join(missing)}. Run migrate.")
+            self.stdout.write(self.style.WARNING(f"Missing indexes: {', '.join(missing)}. Run migrate."))
+
+        deleted_outstanding = deleted_blacklisted = 0
+        while not options['check_only']:
+            # Walk the expires_at index in small batches to keep write locks short
+            ids = list(
+                OutstandingToken.objects.filter(expires_at__lte=now)
+                .order_by('expires_at')
+                .values_list('id', flat=True)[:chunk_size]
+            )
+            if not ids:
+                break
+            # An expired refresh token is rejected anyway, so its blacklist entry goes too
+            deleted_blacklisted += BlacklistedToken.objects.filter(token_id__in=ids).delete()[0]
+            deleted_outstanding += OutstandingToken.objects.filter(id__in=ids).delete()[0]
+
+        for table, (rows, last_day, weekly_average) in table_growth(now).items():
+            message = (
+                f'{table} tokens: {rows} rows, +{last_day} in the last day, '
+                f'+{weekly_average:.1f}/day over the last week'
+            )
+            logger.info(message)
+            self.stdout.write(message)
+
+        if not options['check_only']:
+            logger.info(
+                f'Pruned {deleted_outstanding} expired outstanding and {deleted_blacklisted} blacklisted tokens'
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f'Deleted {deleted_outstanding} expired outstanding and {deleted_blacklisted} blacklisted tokens'
+            ))
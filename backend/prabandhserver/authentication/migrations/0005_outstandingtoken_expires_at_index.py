@@ -0,0 +1,22 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    token_blacklist.OutstandingToken.expires_at has no index, so pruning expired
+    tokens scans the whole table. The model lives in simplejwt, so the index is
+    created here with raw SQL.
+    """
+
+    dependencies = [
+        ('authentication', '0004_faculty_aadhar_number_faculty_blood_group_and_more'),
+        ('token_blacklist', '0013_alter_blacklistedtoken_options_and_more'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE INDEX IF NOT EXISTS outstandingtoken_expires_idx '
+                'ON token_blacklist_outstandingtoken (expires_at)',
+            reverse_sql='DROP INDEX IF EXISTS outstandingtoken_expires_idx',
+        ),
+    ]
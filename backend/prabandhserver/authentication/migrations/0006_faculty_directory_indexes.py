@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:37
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0005_outstandingtoken_expires_at_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='faculty',
+            index=models.Index(fields=['name'], name='faculty_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='faculty',
+            index=models.Index(fields=['emptype', 'name'], name='faculty_emptype_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='faculty',
+            index=models.Index(fields=['department', 'name'], name='faculty_department_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='faculty',
+            index=models.Index(django.db.models.functions.text.Upper('name'), name='faculty_name_upper_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='faculty',
+            index=models.Index(django.db.models.functions.text.Upper('registration_no'), name='faculty_regno_upper_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='faculty',
+            index=models.Index(django.db.models.functions.text.Upper('primary_email'), name='faculty_email_upper_idx'),
+        ),
+    ]
@@ -0,0 +1,70 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def normalize_name(name):
+    return ' '.join((name or '').split()).casefold()
+
+
+def link_exact_matches(apps, schema_editor):
+    """
+    Point faculty at the Department whose name equals their free-text department,
+    ignoring case and spacing: one in their own school first, otherwise one that
+    is unique across schools. backfill_faculty_departments handles the rest.
+    """
+    Department = apps.get_model('deputy_registrar', 'Department')
+    Faculty = apps.get_model('authentication', 'Faculty')
+
+    by_school, everywhere = {}, {}
+    for department_id, name, school_id in Department.objects.values_list('id', 'name', 'school_id'):
+        key = normalize_name(name)
+        by_school.setdefault((school_id, key), set()).add(department_id)
+        everywhere.setdefault(key, set()).add(department_id)
+
+    changed = []
+    for faculty in Faculty.objects.exclude(legacy_department='').only('id', 'school_id', 'legacy_department'):
+        key = normalize_name(faculty.legacy_department)
+        ids = by_school.get((faculty.school_id, key)) or everywhere.get(key) or set()
+        if len(ids) == 1:
+            faculty.department_id = next(iter(ids))
+            changed.append(faculty)
+    Faculty.objects.bulk_update(changed, ['department'], batch_size=500)
+
+
+def restore_names(apps, schema_editor):
+    Faculty = apps.get_model('authentication', 'Faculty')
+    changed = []
+    for faculty in Faculty.objects.filter(legacy_department='', department__isnull=False).select_related('department'):
+        faculty.legacy_department = faculty.department.name[:70]
+        changed.append(faculty)
+    Faculty.objects.bulk_update(changed, ['legacy_department'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('deputy_registrar', '0005_department_name_index'),
+        ('authentication', '0006_faculty_directory_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='faculty',
+            name='faculty_department_name_idx',
+        ),
+        migrations.RenameField(
+            model_name='faculty',
+            old_name='department',
+            new_name='legacy_department',
+        ),
+        migrations.AddField(
+            model_name='faculty',
+            name='department',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='faculty', to='deputy_registrar.department'),
+        ),
+        migrations.AddIndex(
+            model_name='faculty',
+            index=models.Index(fields=['department', 'name'], name='faculty_department_name_idx'),
+        ),
+        migrations.RunPython(link_exact_matches, restore_names),
+    ]
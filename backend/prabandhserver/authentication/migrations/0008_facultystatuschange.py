@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:44
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0007_faculty_department_fk'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacultyStatusChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(choices=[('is_staff', 'is_staff'), ('is_active', 'is_active')], max_length=20)),
+                ('old_value', models.BooleanField()),
+                ('new_value', models.BooleanField()),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('changed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('faculty', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_changes', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-changed_at'],
+                'indexes': [models.Index(fields=['faculty', '-changed_at'], name='faculty_status_change_idx')],
+            },
+        ),
+    ]
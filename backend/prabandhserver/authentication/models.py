@@ -1,8 +1,11 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Upper
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
 from django.utils import timezone
-from deputy_registrar.models import School
+from deputy_registrar.models import Department, School
 from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 
 class FacultyManager(BaseUserManager):
     def create_user(self, email, password=None, **extra_fields):
@@ -34,7 +37,9 @@ class FacultyManager(BaseUserManager):
 
 class Faculty(AbstractBaseUser, PermissionsMixin):
     school = models.ForeignKey(School, on_delete=models.SET_NULL, null=True, blank=True)
-    department = models.CharField(max_length=70, blank=True)
+    department = models.ForeignKey(Department, on_delete=models.SET_NULL, null=True, blank=True, related_name='faculty')
+    # Free-text department from before the foreign key; read by backfill_faculty_departments
+    legacy_department = models.CharField(max_length=70, blank=True)
     emptype = models.CharField(max_length=70, blank=False)  # Making emptype required
     registration_no = models.CharField(max_length=50, unique=True)
     name = models.CharField(max_length=70)
@@ -76,6 +81,17 @@ class Faculty(AbstractBaseUser, PermissionsMixin):
     EMAIL_FIELD = 'primary_email'
     REQUIRED_FIELDS = ['name', 'registration_no']
 
+    class Meta:
+        indexes = [
+            # Directory listing, filters and case-insensitive prefix search (authentication.directory)
+            models.Index(fields=['name'], name='faculty_name_idx'),
+            models.Index(fields=['emptype', 'name'], name='faculty_emptype_name_idx'),
+            models.Index(fields=['department', 'name'], name='faculty_department_name_idx'),
+            models.Index(Upper('name'), name='faculty_name_upper_idx'),
+            models.Index(Upper('registration_no'), name='faculty_regno_upper_idx'),
+            models.Index(Upper('primary_email'), name='faculty_email_upper_idx'),
+        ]
+
     def __str__(self):
         return f"{self.name} ({self.primary_email})"
 
@@ -95,3 +111,50 @@ class FacultyDocument(models.Model):
 
     def __str__(self):
         return f"{self.faculty.name} - {self.document_type}"
+
+class FacultyStatusChange(models.Model):
+    """Audit row for every is_staff / is_active change made through the HR bulk endpoint."""
+    FIELD_CHOICES = [
+        ('is_staff', 'is_staff'),
+        ('is_active', 'is_active'),
+    ]
+    faculty = models.ForeignKey(Faculty, on_delete=models.CASCADE, related_name='status_changes')
+    changed_by = models.ForeignKey(Faculty, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    field = models.CharField(max_length=20, choices=FIELD_CHOICES)
+    old_value = models.BooleanField()
+    new_value = models.BooleanField()
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-changed_at']
+        indexes = [
+            models.Index(fields=['faculty', '-changed_at'], name='faculty_status_change_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.faculty_id} {self.field}: {self.old_value} -> {self.new_value}"
+
+# Cached request principals (authentication.principal_cache) are dropped on every
+# change to the user, which covers role, is_active and password changes
+@receiver(post_save, sender=Faculty)
+@receiver(post_delete, sender=Faculty)
+def invalidate_cached_principal(sender, instance, **kwargs):
+    from .principal_cache import invalidate_principal
+    invalidate_principal([instance.pk])
+
+@receiver(post_delete, sender='authtoken.Token')
+def forget_cached_token_key(sender, instance, **kwargs):
+    from .authentication import forget_token_key
+    forget_token_key(instance.key)
+
+@receiver(post_save, sender=Faculty)
+@receiver(post_delete, sender=Faculty)
+def invalidate_faculty_directory(sender, instance, update_fields=None, **kwargs):
+    from .directory import NON_DIRECTORY_FIELDS, bump_directory_version
+    from .typeahead import record_changes
+    if update_fields and set(update_fields) <= NON_DIRECTORY_FIELDS:
+        return
+    # After commit, so other requests rebuild from the committed row
+    faculty_id = instance.pk
+    transaction.on_commit(bump_directory_version)
+    transaction.on_commit(lambda: record_changes([faculty_id]))
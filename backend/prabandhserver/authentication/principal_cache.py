@@ -0,0 +1,131 @@
+"""
+Cached user snapshots for request authentication.
+
+A snapshot holds every concrete Faculty field except the password, tagged
+with the user's token_version. Saving a Faculty, changing its role, is_active
+flag or password included, moves its token_version on, so the next request
+finds an older snapshot and reloads the user.
+
+Snapshots are kept in two tiers. Each process keeps the users it served in an
+LRU for AUTH_PRINCIPAL_LOCAL_TTL seconds, so a warm request runs no query.
+Behind it, the token_version and the snapshot are read from CACHES with one
+get_many(), a single SELECT on the database cache. Invalidation drops this
+process's LRU entries at once; other processes see it when their entry
+expires. AUTH_PRINCIPAL_CACHE_TTL bounds how long a shared snapshot can
+outlive a change that bypassed signals (queryset.update()).
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Faculty
+
+DEFAULT_PRINCIPAL_CACHE_TTL = 60
+DEFAULT_PRINCIPAL_LOCAL_TTL = 5
+LOCAL_CACHE_SIZE = 4096
+# The password is never cached; reading it from a snapshot loads it from the database
+SNAPSHOT_EXCLUDED_FIELDS = {'password'}
+
+
+class _LocalSnapshots:
+    """Per-process LRU of snapshot values keyed by user id, each kept for a few seconds."""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            values, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return values
+
+    def set(self, user_id, values, timeout):
+        with self._lock:
+            self._entries[user_id] = (values, time.monotonic() + timeout)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_local_snapshots = _LocalSnapshots(LOCAL_CACHE_SIZE)
+
+
+def _version_key(user_id):
+    return f'authentication:token_version:{user_id}'
+
+
+def _snapshot_key(user_id):
+    return f'authentication:principal:{user_id}'
+
+
+def _snapshot_fields():
+    return [
+        field.attname for field in Faculty._meta.concrete_fields
+        if field.name not in SNAPSHOT_EXCLUDED_FIELDS
+    ]
+
+
+def invalidate_principal(user_ids):
+    """Move the token_version of these users on; their cached snapshots are no longer read."""
+    user_ids = [str(user_id) for user_id in user_ids]
+    cache.set_many({_version_key(user_id): time.time_ns() for user_id in user_ids}, timeout=None)
+    _local_snapshots.discard(user_ids)
+
+
+def clear_local_principals():
+    """Forget this process's snapshots (tests, where user ids are reused after a rollback)."""
+    _local_snapshots.clear()
+
+
+def _load_snapshot(user_id, fields):
+    version_key, snapshot_key = _version_key(user_id), _snapshot_key(user_id)
+    found = cache.get_many([version_key, snapshot_key])
+    version = found.get(version_key)
+    if version is None:
+        # A fresh, never-used value, so snapshots cached before an eviction are not picked up again
+        version = time.time_ns()
+        if not cache.add(version_key, version, timeout=None):
+            version = cache.get(version_key)
+    snapshot = found.get(snapshot_key)
+    if snapshot is not None and snapshot[0] == version:
+        return snapshot[1]
+    # The version is read before the user, so a change made meanwhile leaves this snapshot stale
+    values = Faculty.objects.filter(id=user_id).values_list(*fields).get()
+    cache.set(
+        snapshot_key, (version, values),
+        getattr(settings, 'AUTH_PRINCIPAL_CACHE_TTL', DEFAULT_PRINCIPAL_CACHE_TTL),
+    )
+    return values
+
+
+def get_principal(user_id):
+    """The Faculty for user_id, from the snapshot cache when possible. Raises Faculty.DoesNotExist."""
+    fields = _snapshot_fields()
+    user_id = str(user_id)
+    values = _local_snapshots.get(user_id)
+    if values is None:
+        values = _load_snapshot(user_id, fields)
+        _local_snapshots.set(
+            user_id, values, getattr(settings, 'AUTH_PRINCIPAL_LOCAL_TTL', DEFAULT_PRINCIPAL_LOCAL_TTL)
+        )
+    return Faculty.from_db('default', fields, values)
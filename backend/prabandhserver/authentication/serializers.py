@@ -1,11 +1,47 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
+from .departments import DEFAULT_FUZZY_CUTOFF, DepartmentMatcher
+from .login_throttle import check_login_allowed, record_failed_login, record_successful_login
 from .models import Faculty, FacultyDocument
 from deputy_registrar.models import School
 
 
-class FacultySerializer(serializers.ModelSerializer):
+class DepartmentNameField(serializers.CharField):
+    """Faculty.department read and written as the department name."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('required', False)
+        kwargs.setdefault('allow_blank', True)
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        return instance.department.name if instance.department_id else ''
+
+
+class DepartmentByNameMixin:
+    """Turns a validated department name into department_id, matched within the faculty member's school."""
+
+    def resolve_department(self, attrs):
+        if 'department' not in attrs:
+            return attrs
+        name = attrs.pop('department')
+        if not name:
+            attrs['department_id'] = None
+            return attrs
+        school = attrs['school'] if 'school' in attrs else getattr(self.instance, 'school', None)
+        department_id = DepartmentMatcher().match(name, school.id if school else None, cutoff=DEFAULT_FUZZY_CUTOFF)
+        if department_id is None:
+            raise serializers.ValidationError({'department': [f'Unknown department "{name}".']})
+        attrs['department_id'] = department_id
+        return attrs
+
+    def validate(self, attrs):
+        return self.resolve_department(super().validate(attrs))
+
+
+class FacultySerializer(DepartmentByNameMixin, serializers.ModelSerializer):
     profile_image = serializers.ImageField(required=False, allow_null=True)
+    department = DepartmentNameField()
     class Meta:
         model = Faculty
         fields = [
@@ -40,7 +76,6 @@ class FacultySerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id']
         extra_kwargs = {
-            'department': {'required': False, 'allow_blank': True},
             'school': {'required': False, 'allow_null': True},
             'father_name': {'required': False, 'allow_blank': True},
             'gender': {'required': False, 'allow_blank': True},
@@ -63,8 +98,9 @@ class FacultySerializer(serializers.ModelSerializer):
         }
 
 
-class RegisterSerializer(serializers.ModelSerializer):
+class RegisterSerializer(DepartmentByNameMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=True, style={'input_type': 'password'})
+    department = DepartmentNameField()
 
     class Meta:
         model = Faculty
@@ -74,7 +110,6 @@ class RegisterSerializer(serializers.ModelSerializer):
             'address', 'joining_date', 'qualification', 'experience', 'marital_status'
         ]
         extra_kwargs = {
-            'department': {'required': False, 'allow_blank': True},
             'school': {'required': False, 'allow_null': True},
             'father_name': {'required': False, 'allow_blank': True},
             'gender': {'required': False, 'allow_blank': True},
@@ -115,11 +150,18 @@ class LoginSerializer(serializers.Serializer):
         if not primary_email or not password:
             raise serializers.ValidationError('Both email and password are required.')
 
-        user = authenticate(request=self.context.get('request'), username=primary_email, password=password)
+        request = self.context.get('request')
+        # Throttled and locked-out attempts are refused before the password hasher runs
+        check_login_allowed(request, primary_email)
+
+        user = authenticate(request=request, username=primary_email, password=password)
 
         if not user:
+            record_failed_login(primary_email)
             raise serializers.ValidationError('Invalid credentials.')
 
+        record_successful_login(user)
+
         data['user'] = user
         return data
 
@@ -129,3 +171,38 @@ class FacultyDocumentSerializer(serializers.ModelSerializer):
         model = FacultyDocument
         fields = ['id', 'faculty', 'document_type', 'file', 'uploaded_at']
         read_only_fields = ['id', 'faculty', 'uploaded_at']
+
+
+class FacultyImportRowSerializer(RegisterSerializer):
+    """
+    One row of a bulk onboarding file. Email and registration number uniqueness,
+    the school and the department are checked for the whole file at once in
+    authentication.bulk_import, not with a query per row.
+    """
+
+    class Meta(RegisterSerializer.Meta):
+        fields = [field for field in RegisterSerializer.Meta.fields if field != 'school']
+        extra_kwargs = {
+            **RegisterSerializer.Meta.extra_kwargs,
+            'primary_email': {'validators': []},
+            'registration_no': {'validators': []},
+        }
+
+    def validate(self, attrs):
+        # Departments are matched for the whole file against one snapshot
+        return attrs
+
+
+class FacultyStatusUpdateSerializer(serializers.Serializer):
+    """Body of the HR bulk activation endpoint: faculty ids and the flags to set on all of them."""
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=500)
+    is_staff = serializers.BooleanField(required=False)
+    is_active = serializers.BooleanField(required=False)
+
+    def validate_ids(self, value):
+        return list(dict.fromkeys(value))
+
+    def validate(self, attrs):
+        if 'is_staff' not in attrs and 'is_active' not in attrs:
+            raise serializers.ValidationError('Set is_staff, is_active or both.')
+        return attrs
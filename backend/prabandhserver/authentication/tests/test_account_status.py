@@ -0,0 +1,90 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from authentication.account_status import WELCOME_TITLE
+from authentication.models import Faculty, FacultyStatusChange
+from leave_management.models import Notification
+
+from .utils import APITestCase, make_faculty
+
+STATUS_URL = '/api/auth/hr/faculty-status/'
+
+
+class HRFacultyStatusTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.pending = [make_faculty(is_staff=False) for _ in range(3)]
+        self.approved = make_faculty(is_staff=True)
+        self.hr = self.login(make_faculty(emptype='hr'))
+
+    def post(self, body):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(STATUS_URL, body, format='json')
+
+    def test_approving_faculty_updates_audits_and_welcomes_them(self):
+        ids = [member.id for member in self.pending] + [self.approved.id, 999999]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post({'ids': ids, 'is_staff': True})
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data, {
+            'updated': ids[:3], 'unchanged': [self.approved.id], 'missing': [999999],
+        })
+        self.assertEqual(Faculty.objects.filter(id__in=ids[:3], is_staff=True).count(), 3)
+        faculty_updates = [
+            query['sql'] for query in queries
+            if query['sql'].startswith('UPDATE') and Faculty._meta.db_table in query['sql']
+        ]
+        self.assertEqual(len(faculty_updates), 1)
+
+        changes = FacultyStatusChange.objects.filter(faculty_id__in=ids[:3])
+        self.assertEqual(changes.count(), 3)
+        self.assertEqual(
+            set(changes.values_list('field', 'old_value', 'new_value', 'changed_by')),
+            {('is_staff', False, True, self.hr.id)},
+        )
+
+        welcomed = Notification.objects.filter(kind='account_approved', title=WELCOME_TITLE)
+        self.assertEqual(sorted(welcomed.values_list('recipient_id', flat=True)), ids[:3])
+
+    def test_deactivating_sends_no_welcome(self):
+        response = self.post({'ids': [self.approved.id], 'is_active': False})
+
+        self.assertEqual(response.data['updated'], [self.approved.id])
+        self.assertFalse(Faculty.objects.get(id=self.approved.id).is_active)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_unchanged_faculty_are_not_audited_again(self):
+        self.post({'ids': [self.pending[0].id], 'is_staff': True})
+
+        response = self.post({'ids': [self.pending[0].id], 'is_staff': True})
+
+        self.assertEqual(response.data['unchanged'], [self.pending[0].id])
+        self.assertEqual(FacultyStatusChange.objects.count(), 1)
+        self.assertEqual(Notification.objects.count(), 1)
+
+    def test_changes_reach_the_cached_directory(self):
+        self.client.get('/api/auth/faculty-directory/', {'is_staff': 'true'})
+
+        self.post({'ids': [self.pending[0].id], 'is_staff': True})
+
+        response = self.client.get('/api/auth/faculty-directory/', {'is_staff': 'true'})
+        self.assertIn(self.pending[0].id, [row['id'] for row in response.data])
+
+    def test_validation(self):
+        for body in (
+            {'ids': [self.pending[0].id]},
+            {'ids': [], 'is_staff': True},
+            {'ids': ['abc'], 'is_staff': True},
+            {'ids': list(range(1, 502)), 'is_staff': True},
+        ):
+            with self.subTest(body=str(body)[:40]):
+                self.assertEqual(self.post(body).status_code, 400)
+        self.assertFalse(FacultyStatusChange.objects.exists())
+
+    def test_only_hr(self):
+        self.login(self.pending[0])
+
+        self.assertEqual(self.post({'ids': [self.pending[0].id], 'is_staff': True}).status_code, 403)
+        self.assertFalse(Faculty.objects.get(id=self.pending[0].id).is_staff)
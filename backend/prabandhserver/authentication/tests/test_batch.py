@@ -0,0 +1,47 @@
+from .utils import APITestCase, make_faculty
+
+BATCH_URL = '/api/auth/hr/faculty-detail/'
+
+
+class HRFacultyBatchTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.faculty = [make_faculty() for _ in range(3)]
+        self.login(make_faculty(emptype='hr'))
+
+    def batch(self, ids):
+        return self.client.get(BATCH_URL, {'ids': ids})
+
+    def test_profiles_come_back_in_request_order(self):
+        third, first = self.faculty[2], self.faculty[0]
+
+        response = self.batch(f'{third.id},{first.id},{third.id}')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['id'] for row in response.data['results']], [third.id, first.id])
+        self.assertEqual(response.data['results'][0]['primary_email'], third.primary_email)
+        self.assertEqual(response.data['missing'], [])
+
+    def test_unknown_ids_are_reported_missing(self):
+        response = self.batch(f'{self.faculty[0].id}, 999999')
+
+        self.assertEqual([row['id'] for row in response.data['results']], [self.faculty[0].id])
+        self.assertEqual(response.data['missing'], [999999])
+
+    def test_one_query_for_any_number_of_profiles(self):
+        ids = ','.join(str(member.id) for member in self.faculty)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.batch(ids).status_code, 200)
+
+    def test_invalid_ids(self):
+        for ids in ('', '1,abc', '-1', ','.join(str(number) for number in range(1, 102))):
+            with self.subTest(ids=ids[:20]):
+                response = self.batch(ids)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', response.data)
+
+    def test_only_hr(self):
+        self.login(self.faculty[0])
+
+        self.assertEqual(self.batch(str(self.faculty[1].id)).status_code, 403)
@@ -0,0 +1,80 @@
+from deputy_registrar.models import Department, School
+from leave_management.models import LeaveBalance
+from leave_management.tests.utils import make_application
+from notifications.inbox import create_notifications
+
+from .utils import APITestCase, make_faculty, next_monday
+
+BOOTSTRAP_URL = '/api/auth/bootstrap/'
+
+
+class BootstrapTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.school = School.objects.create(name='School of Engineering')
+        department = Department.objects.create(name='Computer Science', school=self.school)
+        self.hod = make_faculty(emptype='Head of Department', school=self.school, department=department)
+        self.teacher = make_faculty(emptype='faculty', school=self.school, department=department)
+        monday = next_monday()
+        make_application(self.teacher, monday, status='pending', forward_to=str(self.hod.id))
+        make_application(self.teacher, monday, status='approved_by_hod', forward_to=str(self.hod.id))
+        make_application(self.teacher, monday, status='rejected_by_hr')
+        make_application(make_faculty(), monday, status='pending', forward_to=str(self.hod.id))
+        for title in ('Notice', 'Reminder'):
+            create_notifications([self.teacher.id, self.hod.id], title, 'Body')
+
+    def bootstrap(self, user, **headers):
+        self.login(user)
+        return self.client.get(BOOTSTRAP_URL, **headers)
+
+    def test_faculty_bootstrap(self):
+        LeaveBalance.objects.filter(faculty=self.teacher).update(casual_leave_used=2)
+
+        data = self.bootstrap(self.teacher).data
+
+        self.assertEqual(data['role'], 'faculty')
+        self.assertEqual(data['profile']['department'], 'Computer Science')
+        self.assertEqual(data['profile']['school'], {'id': self.school.id, 'name': 'School of Engineering'})
+        self.assertEqual(data['applications'], {'pending': 1, 'approved': 1, 'rejected': 1})
+        self.assertEqual(data['inbox'], {'pending': 0})
+        self.assertEqual(data['notifications'], {'unread': 2})
+        self.assertEqual(data['leave_balance']['casual'], {'total': 15, 'used': 2, 'remaining': 13})
+
+    def test_approver_sees_their_inbox(self):
+        data = self.bootstrap(self.hod).data
+
+        self.assertEqual(data['role'], 'hod')
+        self.assertEqual(data['inbox'], {'pending': 2})
+        self.assertEqual(data['applications'], {'pending': 0, 'approved': 0, 'rejected': 0})
+
+    def test_two_queries_whatever_the_role(self):
+        for user in (self.teacher, self.hod, make_faculty(emptype='vc')):
+            with self.subTest(emptype=user.emptype):
+                self.login(user)
+                with self.assertNumQueries(2):
+                    self.assertEqual(self.client.get(BOOTSTRAP_URL).status_code, 200)
+
+    def test_missing_balance_and_counter(self):
+        newcomer = make_faculty()
+        LeaveBalance.objects.filter(faculty=newcomer).delete()
+
+        data = self.bootstrap(newcomer).data
+
+        self.assertIsNone(data['leave_balance'])
+        self.assertEqual(data['notifications'], {'unread': 0})
+
+    def test_unchanged_data_returns_304(self):
+        first = self.bootstrap(self.teacher)
+        self.assertEqual(first['Cache-Control'], 'private, no-cache')
+
+        again = self.client.get(BOOTSTRAP_URL, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again['ETag'], first['ETag'])
+
+        create_notifications([self.teacher.id], 'Another', 'Body')
+        changed = self.client.get(BOOTSTRAP_URL, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.data['notifications'], {'unread': 3})
+
+    def test_login_required(self):
+        self.assertEqual(self.client.get(BOOTSTRAP_URL).status_code, 401)
@@ -0,0 +1,151 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from authentication.departments import DEFAULT_FUZZY_CUTOFF, DepartmentMatcher
+from authentication.models import Faculty
+from deputy_registrar.models import Department, School
+
+from .utils import PASSWORD, APITestCase, make_faculty
+
+REGISTER_URL = '/api/auth/register/'
+USER_URL = '/api/auth/user/'
+
+
+class DepartmentMatcherTests(SimpleTestCase):
+    def setUp(self):
+        # (id, name, school_id)
+        self.matcher = DepartmentMatcher([
+            (1, 'Computer Science and Engineering', 10),
+            (2, 'Mechanical Engineering', 10),
+            (3, 'Physics', 10),
+            (4, 'Physics', 20),
+            (5, 'Civil Engineering', 20),
+        ])
+
+    def test_names_match_ignoring_case_and_spacing(self):
+        self.assertEqual(self.matcher.match('  computer   science AND engineering '), 1)
+
+    def test_acronyms(self):
+        self.assertEqual(self.matcher.match('CSE'), 1)
+        self.assertEqual(self.matcher.match('me'), 2)
+
+    def test_fuzzy_matches_only_with_a_cutoff(self):
+        self.assertIsNone(self.matcher.match('Mechanical Engg'))
+        self.assertEqual(self.matcher.match('Mechanical Enginering', cutoff=DEFAULT_FUZZY_CUTOFF), 2)
+        self.assertIsNone(self.matcher.match('Chemistry', cutoff=DEFAULT_FUZZY_CUTOFF))
+
+    def test_a_name_shared_by_schools_matches_only_within_the_school(self):
+        self.assertEqual(self.matcher.match('physics', school_id=10), 3)
+        self.assertEqual(self.matcher.match('physics', school_id=20), 4)
+        self.assertIsNone(self.matcher.match('physics'))
+        self.assertIsNone(self.matcher.match('physics', cutoff=DEFAULT_FUZZY_CUTOFF))
+
+    def test_other_schools_are_tried_after_the_own_school(self):
+        self.assertEqual(self.matcher.match('Civil Engineering', school_id=10), 5)
+
+    def test_blank_names_match_nothing(self):
+        self.assertIsNone(self.matcher.match(''))
+        self.assertIsNone(self.matcher.match(None))
+
+
+class DepartmentFieldTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.school = School.objects.create(name='School of Engineering')
+        self.cse = Department.objects.create(name='Computer Science and Engineering', school=self.school)
+
+    def test_registration_links_the_department_by_name(self):
+        response = self.client.post(REGISTER_URL, {
+            'primary_email': 'new@example.edu', 'password': PASSWORD, 'name': 'New Faculty',
+            'registration_no': 'NEW001', 'emptype': 'faculty', 'department': 'cse', 'school': self.school.id,
+        }, format='json')
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['user']['department'], 'Computer Science and Engineering')
+        self.assertEqual(Faculty.objects.get(primary_email='new@example.edu').department, self.cse)
+
+    def test_unknown_department_is_rejected(self):
+        response = self.client.post(REGISTER_URL, {
+            'primary_email': 'new@example.edu', 'password': PASSWORD, 'name': 'New Faculty',
+            'registration_no': 'NEW001', 'emptype': 'faculty', 'department': 'Astrology',
+        }, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('department', response.data['errors'])
+
+    def test_profile_update_changes_and_clears_the_department(self):
+        faculty = self.login(make_faculty(school=self.school))
+
+        response = self.client.patch(USER_URL, {'department': 'computer science and engineering'}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        faculty.refresh_from_db()
+        self.assertEqual(faculty.department, self.cse)
+
+        self.client.patch(USER_URL, {'department': ''}, format='json')
+        faculty.refresh_from_db()
+        self.assertIsNone(faculty.department)
+
+    def test_deleting_a_department_keeps_the_faculty(self):
+        faculty = make_faculty(department=self.cse)
+
+        self.cse.delete()
+
+        faculty.refresh_from_db()
+        self.assertIsNone(faculty.department_id)
+
+
+class BackfillFacultyDepartmentsTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.school = School.objects.create(name='School of Engineering')
+        self.cse = Department.objects.create(name='Computer Science and Engineering', school=self.school)
+        self.exact = make_faculty(school=self.school, legacy_department='computer science and engineering')
+        self.acronym = make_faculty(school=self.school, legacy_department='CSE')
+        self.typo = make_faculty(school=self.school, legacy_department='Computer Science and Enginering')
+        self.unknown = make_faculty(school=self.school, legacy_department='Robotics')
+        self.unknown_again = make_faculty(school=self.school, legacy_department='robotics ')
+
+    def backfill(self, *args):
+        output = StringIO()
+        call_command('backfill_faculty_departments', *args, stdout=output)
+        return output.getvalue()
+
+    def department_ids(self):
+        return dict(Faculty.objects.filter(school=self.school).values_list('id', 'department_id'))
+
+    def test_links_matching_names_and_lists_the_rest(self):
+        output = self.backfill()
+
+        departments = self.department_ids()
+        self.assertEqual([departments[member.id] for member in (self.exact, self.acronym, self.typo)], [self.cse.id] * 3)
+        self.assertIsNone(departments[self.unknown.id])
+        self.assertIn('"CSE" -> "Computer Science and Engineering" (1)', output)
+        self.assertIn('No department for "Robotics" (1)', output)
+        self.assertIn('Linked 3 of 5 faculty, created 0 departments, 2 left unmatched', output)
+
+    def test_cutoff_of_one_disables_fuzzy_matching(self):
+        self.backfill('--cutoff', '1')
+
+        self.assertIsNone(self.department_ids()[self.typo.id])
+
+    def test_dry_run_saves_nothing(self):
+        output = self.backfill('--dry-run', '--create-missing')
+
+        self.assertIn('Dry run: 3 of 5 faculty would be linked', output)
+        self.assertEqual(set(self.department_ids().values()), {None})
+        self.assertFalse(Department.objects.filter(name='Robotics').exists())
+
+    def test_create_missing_adds_one_department_per_name(self):
+        self.backfill('--create-missing')
+
+        robotics = Department.objects.get(school=self.school, name='Robotics')
+        departments = self.department_ids()
+        self.assertEqual(departments[self.unknown.id], robotics.id)
+        self.assertEqual(departments[self.unknown_again.id], robotics.id)
+
+    def test_linked_faculty_are_not_touched_again(self):
+        self.backfill()
+
+        self.assertIn('Linked 0 of 2 faculty', self.backfill())
@@ -0,0 +1,177 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from authentication.models import Faculty
+from authentication.views import FacultyDirectoryPagination
+from deputy_registrar.models import Department, School
+
+from .utils import APITestCase, make_faculty
+
+EMPTYPES_URL = '/api/auth/emptypes/'
+USERS_URL = '/api/auth/users/'
+DEPARTMENTS_URL = '/api/auth/departments/'
+BY_DEPARTMENT_URL = '/api/auth/faculty-by-department/'
+DIRECTORY_URL = '/api/auth/faculty-directory/'
+HR_LIST_URL = '/api/auth/hr/faculty-list/'
+
+
+class DirectoryCacheTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        school = School.objects.create(name='School of Engineering')
+        self.department = Department.objects.create(name='Computer Science', school=school)
+        self.hod = make_faculty(name='Asha Rao', emptype='hod', school=school, department=self.department)
+        self.teacher = make_faculty(name='Vikram Iyer', emptype='faculty', department=self.department)
+        self.login(self.teacher)
+
+    def get(self, url, **params):
+        """GETs url and returns (data, number of queries against the Faculty table)."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data, sum(Faculty._meta.db_table in query['sql'] for query in queries)
+
+    def test_listings_are_served_from_the_cache(self):
+        for url, params in (
+            (EMPTYPES_URL, {}),
+            (USERS_URL, {'emptype': 'hod'}),
+            (DEPARTMENTS_URL, {}),
+            (BY_DEPARTMENT_URL, {'department': 'Computer Science'}),
+        ):
+            with self.subTest(url=url):
+                first, first_queries = self.get(url, **params)
+                second, second_queries = self.get(url, **params)
+                self.assertEqual(first_queries, 1)
+                self.assertEqual(second_queries, 0)
+                self.assertEqual(first, second)
+
+    def test_listings_show_the_cached_rows(self):
+        data, _ = self.get(EMPTYPES_URL)
+        self.assertEqual(sorted(data['emptypes']), ['faculty', 'hod'])
+        self.assertEqual(data['users_by_emptype']['hod'], [{
+            'id': self.hod.id, 'name': 'Asha Rao', 'registration_no': self.hod.registration_no,
+            'department': 'Computer Science',
+        }])
+
+        self.assertEqual(self.get(DEPARTMENTS_URL)[0], {'departments': ['Computer Science']})
+        by_department, _ = self.get(BY_DEPARTMENT_URL, department='Computer Science')
+        self.assertEqual([row['id'] for row in by_department['faculty']], [self.hod.id, self.teacher.id])
+        users, _ = self.get(USERS_URL, emptype='hod')
+        self.assertEqual([user['id'] for user in users], [self.hod.id])
+
+    def test_saving_a_faculty_member_rebuilds_the_listings(self):
+        self.get(EMPTYPES_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.teacher.emptype = 'dean'
+            self.teacher.save()
+
+        data, queries = self.get(EMPTYPES_URL)
+        self.assertEqual(queries, 1)
+        self.assertEqual(sorted(data['emptypes']), ['dean', 'hod'])
+
+    def test_new_and_deleted_faculty_rebuild_the_listings(self):
+        self.get(BY_DEPARTMENT_URL, department='Computer Science')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            newcomer = make_faculty(department=self.department)
+            self.hod.delete()
+
+        data, _ = self.get(BY_DEPARTMENT_URL, department='Computer Science')
+        self.assertEqual([row['id'] for row in data['faculty']], [self.teacher.id, newcomer.id])
+
+    def test_login_bookkeeping_keeps_the_cache(self):
+        self.get(EMPTYPES_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.teacher.last_login = timezone.now()
+            self.teacher.save(update_fields=['last_login'])
+
+        self.assertEqual(self.get(EMPTYPES_URL)[1], 0)
+
+
+class DirectorySearchTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.school = School.objects.create(name='School of Engineering')
+        self.department = Department.objects.create(name='Computer Science', school=self.school)
+        self.asha = make_faculty(
+            'asha@example.edu', name='Asha Rao', registration_no='CS001', emptype='hod',
+            school=self.school, department=self.department, is_staff=True,
+        )
+        self.vikram = make_faculty('vikram@example.edu', name='Vikram Iyer', registration_no='ME001')
+        self.hr = make_faculty('hr@example.edu', name='Zoya Khan', registration_no='HR001', emptype='hr')
+        self.login(self.vikram)
+
+    def ids(self, url=DIRECTORY_URL, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [row['id'] for row in response.data]
+
+    def test_search_matches_prefixes_ignoring_case(self):
+        self.assertEqual(self.ids(q='asha'), [self.asha.id])
+        self.assertEqual(self.ids(q='me0'), [self.vikram.id])
+        self.assertEqual(self.ids(q='HR@EXAMPLE'), [self.hr.id])
+        # Only prefixes match, not text in the middle of a field
+        self.assertEqual(self.ids(q='rao'), [])
+        self.assertEqual(self.ids(q='  '), [self.asha.id, self.vikram.id, self.hr.id])
+
+    def test_filters(self):
+        self.assertEqual(self.ids(department='Computer Science'), [self.asha.id])
+        self.assertEqual(self.ids(department=str(self.department.id)), [self.asha.id])
+        self.assertEqual(self.ids(school=str(self.school.id)), [self.asha.id])
+        self.assertEqual(self.ids(emptype='hr'), [self.hr.id])
+        self.assertEqual(self.ids(is_staff='false'), [self.vikram.id, self.hr.id])
+        self.assertEqual(self.ids(emptype='hod', q='vik'), [])
+
+    def test_school_must_be_an_id(self):
+        self.assertEqual(self.client.get(DIRECTORY_URL, {'school': 'Engineering'}).status_code, 400)
+
+    def test_results_are_paginated_by_name(self):
+        for number in range(5):
+            make_faculty(name=f'Bulk {number}')
+
+        response = self.client.get(DIRECTORY_URL, {'page_size': 3, 'page': 2})
+
+        self.assertEqual(response.data['count'], 8)
+        self.assertEqual([row['full_name'] for row in response.data['results']], ['Bulk 2', 'Bulk 3', 'Bulk 4'])
+        self.assertIsNotNone(response.data['previous'])
+        self.assertIsNotNone(response.data['next'])
+        self.assertEqual(response.data['results'][0].keys(), {'id', 'full_name', 'email', 'department', 'is_staff'})
+
+    def test_without_page_parameters_the_whole_list_is_returned(self):
+        for number in range(FacultyDirectoryPagination.page_size):
+            make_faculty(name=f'Bulk {number}')
+
+        response = self.client.get(DIRECTORY_URL)
+
+        # The staff screens read the response as an array
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), FacultyDirectoryPagination.page_size + 3)
+        self.assertEqual(response.data[0], {
+            'id': self.asha.id, 'full_name': 'Asha Rao', 'email': 'asha@example.edu',
+            'department': 'Computer Science', 'is_staff': True,
+        })
+        self.login(self.hr)
+        self.assertIsInstance(self.client.get(HR_LIST_URL).data, list)
+        self.assertEqual(self.client.get(HR_LIST_URL, {'page': 1}).data['count'], FacultyDirectoryPagination.page_size + 3)
+
+    def test_page_size_is_capped(self):
+        for _ in range(FacultyDirectoryPagination.max_page_size):
+            make_faculty()
+
+        response = self.client.get(DIRECTORY_URL, {'page_size': 1000})
+
+        self.assertEqual(len(response.data['results']), FacultyDirectoryPagination.max_page_size)
+
+    def test_hr_list(self):
+        self.assertEqual(self.client.get(HR_LIST_URL).status_code, 403)
+        self.login(self.hr)
+
+        response = self.client.get(HR_LIST_URL, {'q': 'asha'})
+
+        self.assertEqual(response.data, [{
+            'id': self.asha.id, 'full_name': 'Asha Rao', 'email': 'asha@example.edu', 'employee_type': 'hod',
+            'school': 'School of Engineering', 'department': 'Computer Science', 'is_staff': True,
+        }])
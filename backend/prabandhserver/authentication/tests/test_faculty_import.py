@@ -0,0 +1,87 @@
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+
+from authentication.models import Faculty
+from deputy_registrar.models import Department, School
+from leave_management.models import LeaveBalance
+
+from .utils import APITestCase, make_faculty
+
+IMPORT_URL = '/api/auth/hr/faculty-import/'
+
+
+def csv_file(rows):
+    lines = ['primary_email,password,name,registration_no,emptype,department,school']
+    lines += [','.join(row) for row in rows]
+    return SimpleUploadedFile('faculty.csv', '\n'.join(lines).encode(), content_type='text/csv')
+
+
+def import_rows(count, school='School of Engineering', department='Computer Science'):
+    return [
+        (f'new{number}@example.edu', 'onboard-me-42', f'New {number}', f'IMP{number:04d}', 'faculty', department, school)
+        for number in range(count)
+    ]
+
+
+class FacultyImportTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        school = School.objects.create(name='School of Engineering')
+        Department.objects.create(name='Computer Science', school=school)
+        self.login(make_faculty(emptype='hr'))
+        pool = mock.patch('authentication.hashing.ProcessPoolExecutor')
+        self.pool = pool.start()
+        self.addCleanup(pool.stop)
+        # The pool would be used on a multi-core server
+        cpus = mock.patch('authentication.hashing.os.cpu_count', return_value=8)
+        cpus.start()
+        self.addCleanup(cpus.stop)
+
+    def upload(self, rows, **data):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(IMPORT_URL, {'file': csv_file(rows), **data}, format='multipart')
+
+    def test_import_hashes_in_the_request_process(self):
+        response = self.upload(import_rows(40))
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['created'], 40)
+        self.pool.assert_not_called()
+        imported = Faculty.objects.filter(registration_no__startswith='IMP')
+        self.assertEqual(imported.count(), 40)
+        self.assertEqual(LeaveBalance.objects.filter(faculty__in=imported).count(), 40)
+        self.assertTrue(imported.get(primary_email='new0@example.edu').check_password('onboard-me-42'))
+        self.assertEqual(imported.get(primary_email='new0@example.edu').department.name, 'Computer Science')
+
+    @override_settings(FACULTY_IMPORT_MAX_ROWS=3)
+    def test_files_over_the_limit_are_refused(self):
+        response = self.upload(import_rows(4))
+
+        self.assertEqual(response.status_code, 413)
+        self.assertIn('import_faculty', response.data['error'])
+        self.assertFalse(Faculty.objects.filter(registration_no__startswith='IMP').exists())
+
+    @override_settings(FACULTY_IMPORT_MAX_ROWS=3)
+    def test_dry_run_validates_files_over_the_limit(self):
+        response = self.upload(import_rows(4), dry_run='true')
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual((response.data['rows'], response.data['created']), (4, 0))
+
+    def test_one_bad_row_imports_nothing(self):
+        rows = import_rows(3)
+        rows[1] = rows[1][:5] + ('Astrology', rows[1][6])
+
+        response = self.upload(rows)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['row'] for error in response.data['errors']], [3])
+        self.assertIn('department', response.data['errors'][0]['errors'])
+        self.assertFalse(Faculty.objects.filter(registration_no__startswith='IMP').exists())
+
+    def test_only_hr_imports(self):
+        self.login(make_faculty(emptype='faculty'))
+
+        self.assertEqual(self.upload(import_rows(1)).status_code, 403)
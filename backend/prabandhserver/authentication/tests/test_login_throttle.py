@@ -0,0 +1,150 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from authentication import login_throttle
+from authentication.models import Faculty
+
+from .utils import PASSWORD, APITestCase, make_faculty
+
+LOGIN_URL = '/api/auth/login/'
+
+
+class ClientIPTests(APITestCase):
+    def request(self, forwarded_for=None):
+        headers = {'HTTP_X_FORWARDED_FOR': forwarded_for} if forwarded_for else {}
+        return RequestFactory().post(LOGIN_URL, REMOTE_ADDR='10.0.0.1', **headers)
+
+    @override_settings(LOGIN_TRUSTED_PROXY_COUNT=0)
+    def test_without_a_proxy_the_peer_address_is_used(self):
+        self.assertEqual(login_throttle.client_ip(self.request('203.0.113.9')), '10.0.0.1')
+
+    @override_settings(LOGIN_TRUSTED_PROXY_COUNT=1)
+    def test_behind_one_proxy_the_last_hop_is_used(self):
+        self.assertEqual(login_throttle.client_ip(self.request('203.0.113.9')), '203.0.113.9')
+        # Entries the client wrote itself are ignored
+        self.assertEqual(login_throttle.client_ip(self.request('1.2.3.4, 203.0.113.9')), '203.0.113.9')
+
+    @override_settings(LOGIN_TRUSTED_PROXY_COUNT=2)
+    def test_behind_two_proxies(self):
+        self.assertEqual(login_throttle.client_ip(self.request('1.2.3.4, 203.0.113.9, 10.1.1.1')), '203.0.113.9')
+
+    @override_settings(LOGIN_TRUSTED_PROXY_COUNT=1)
+    def test_missing_header_falls_back_to_the_peer_address(self):
+        self.assertEqual(login_throttle.client_ip(self.request()), '10.0.0.1')
+
+
+@override_settings(
+    LOGIN_TRUSTED_PROXY_COUNT=1,
+    LOGIN_THROTTLE_IP_PER_MINUTE=300,
+    LOGIN_THROTTLE_ACCOUNT_PER_MINUTE=5,
+    LOGIN_LOCKOUT_THRESHOLD=5,
+)
+class LoginThrottleTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.faculty = make_faculty()
+        # Every attempt falls into the same one-minute window
+        clock = mock.patch.object(login_throttle, 'time')
+        clock.start().time.return_value = 1_700_000_010.0
+        self.addCleanup(clock.stop)
+        authenticate_patch = mock.patch('authentication.serializers.authenticate', side_effect=authenticate)
+        self.authenticate = authenticate_patch.start()
+        self.addCleanup(authenticate_patch.stop)
+
+    def attempt(self, password='wrong-password', email=None, ip='203.0.113.9'):
+        return self.client.post(
+            LOGIN_URL, {'primary_email': email or self.faculty.primary_email, 'password': password},
+            format='json', HTTP_X_FORWARDED_FOR=ip,
+        )
+
+    def test_account_limit_stops_before_the_password_is_checked(self):
+        with override_settings(LOGIN_LOCKOUT_THRESHOLD=100):
+            statuses = [self.attempt(ip=f'203.0.113.{number}').status_code for number in range(6)]
+
+        self.assertEqual(statuses, [400] * 5 + [429])
+        self.assertEqual(self.authenticate.call_count, 5)
+
+    def test_ip_limit_stops_before_the_password_is_checked(self):
+        others = [make_faculty() for _ in range(4)]
+
+        with override_settings(LOGIN_THROTTLE_IP_PER_MINUTE=3):
+            statuses = [self.attempt(email=other.primary_email).status_code for other in others]
+            # Another client behind the same proxy has its own allowance
+            other_client = self.attempt(password=PASSWORD, ip='198.51.100.7').status_code
+
+        self.assertEqual(statuses, [400, 400, 400, 429])
+        self.assertEqual(other_client, 200)
+        self.assertEqual(self.authenticate.call_count, 4)
+
+    def test_locked_account_is_refused_even_with_the_right_password(self):
+        for _ in range(5):
+            self.attempt()
+        self.faculty.refresh_from_db()
+        self.assertEqual(self.faculty.failed_login_attempts, 5)
+        self.assertGreater(self.faculty.account_locked_until, timezone.now())
+        self.authenticate.reset_mock()
+
+        with override_settings(LOGIN_THROTTLE_ACCOUNT_PER_MINUTE=100):
+            response = self.attempt(password=PASSWORD)
+
+        self.assertEqual(response.status_code, 429)
+        self.authenticate.assert_not_called()
+
+    def test_each_failure_past_the_threshold_doubles_the_lock(self):
+        Faculty.objects.filter(id=self.faculty.id).update(failed_login_attempts=5, last_failed_login=timezone.now())
+
+        login_throttle.record_failed_login(self.faculty.primary_email)
+
+        locked_for = Faculty.objects.get(id=self.faculty.id).account_locked_until - timezone.now()
+        self.assertAlmostEqual(locked_for.total_seconds(), 120, delta=5)
+
+    def test_old_failures_no_longer_count(self):
+        Faculty.objects.filter(id=self.faculty.id).update(
+            failed_login_attempts=4, last_failed_login=timezone.now() - timedelta(days=2)
+        )
+
+        login_throttle.record_failed_login(self.faculty.primary_email)
+
+        faculty = Faculty.objects.get(id=self.faculty.id)
+        self.assertEqual(faculty.failed_login_attempts, 1)
+        self.assertIsNone(faculty.account_locked_until)
+
+    def test_successful_login_clears_the_failures(self):
+        self.attempt()
+        self.assertEqual(self.attempt(password=PASSWORD).status_code, 200)
+
+        faculty = Faculty.objects.get(id=self.faculty.id)
+        self.assertEqual(faculty.failed_login_attempts, 0)
+        self.assertIsNone(faculty.last_failed_login)
+
+    def test_a_stale_counter_does_not_hand_out_a_slot_twice(self):
+        for _ in range(3):
+            self.assertEqual(login_throttle._count_attempt('account', 'someone', 3), 0)
+        # A racing attempt wrote an older hint back; the claimed slots still count
+        key = login_throttle._window_key('account', 'someone', int(1_700_000_010.0 // 60))
+        login_throttle.cache.set(key, 0)
+
+        self.assertGreater(login_throttle._count_attempt('account', 'someone', 3), 0)
+
+    def test_lockout_matches_the_stored_address_exactly(self):
+        mixed = make_faculty('Asha.Rao@Example.EDU')
+        self.assertEqual(mixed.primary_email, 'Asha.Rao@example.edu')
+
+        with CaptureQueriesContext(connection) as queries:
+            login_throttle.record_failed_login(' Asha.Rao@EXAMPLE.edu ')
+        login_throttle.record_failed_login('asha.rao@example.edu')
+
+        self.assertEqual(Faculty.objects.get(id=mixed.id).failed_login_attempts, 1)
+        self.assertFalse(any('LIKE' in query['sql'] or 'UPPER' in query['sql'] for query in queries))
+
+
+class TrustedProxySettingTests(SimpleTestCase):
+    def test_forwarded_for_is_ignored_by_default(self):
+        self.assertEqual(settings.LOGIN_TRUSTED_PROXY_COUNT, 0)
@@ -0,0 +1,86 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from authentication.models import Faculty
+from authentication.principal_cache import _version_key, clear_local_principals, get_principal
+
+from .utils import APITestCase, make_faculty
+
+CHECK_AUTH_URL = '/api/auth/check-auth/'
+
+
+class PrincipalCacheTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.faculty = make_faculty(emptype='faculty')
+        access = RefreshToken.for_user(self.faculty).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+
+    def request_queries(self):
+        """Requests CHECK_AUTH_URL and returns every query it ran."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(CHECK_AUTH_URL)
+        self.assertEqual(response.status_code, 200)
+        return [query['sql'] for query in queries]
+
+    def test_repeated_requests_run_no_query(self):
+        self.assertTrue(any(Faculty._meta.db_table in sql for sql in self.request_queries()))
+        self.assertEqual(self.request_queries(), [])
+
+    def test_another_process_reads_the_shared_snapshot_with_one_query(self):
+        self.client.get(CHECK_AUTH_URL)
+        # What a process that has not served this user yet does
+        clear_local_principals()
+
+        queries = self.request_queries()
+
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn(Faculty._meta.db_table, queries[0])
+
+    def test_a_change_in_another_process_is_seen_once_the_local_entry_expires(self):
+        self.client.get(CHECK_AUTH_URL)
+        Faculty.objects.filter(id=self.faculty.id).update(emptype='hod')
+        cache.set(_version_key(self.faculty.id), 1, None)
+
+        self.assertEqual(self.client.get(CHECK_AUTH_URL).data['user']['emptype'], 'faculty')
+        clear_local_principals()
+        self.assertEqual(self.client.get(CHECK_AUTH_URL).data['user']['emptype'], 'hod')
+
+    def test_saving_the_user_is_seen_on_the_next_request(self):
+        self.client.get(CHECK_AUTH_URL)
+        self.faculty.emptype = 'hod'
+        self.faculty.save()
+
+        response = self.client.get(CHECK_AUTH_URL)
+
+        self.assertEqual(response.data['user']['emptype'], 'hod')
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get(CHECK_AUTH_URL)
+        self.faculty.is_active = False
+        self.faculty.save()
+
+        self.assertEqual(self.client.get(CHECK_AUTH_URL).status_code, 401)
+
+    def test_snapshot_leaves_out_the_password(self):
+        self.client.get(CHECK_AUTH_URL)
+
+        with CaptureQueriesContext(connection) as queries:
+            user = get_principal(self.faculty.id)
+        self.assertEqual(len(queries), 0)
+        self.assertNotIn('password', user.__dict__)
+
+    def test_legacy_token_key_is_cached(self):
+        token = Token.objects.create(user=self.faculty)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.client.get(CHECK_AUTH_URL)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(CHECK_AUTH_URL).status_code, 200)
+        self.assertFalse(any(Token._meta.db_table in query['sql'] for query in queries))
+
+        token.delete()
+        self.assertEqual(self.client.get(CHECK_AUTH_URL).status_code, 401)
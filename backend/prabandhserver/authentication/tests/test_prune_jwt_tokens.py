@@ -0,0 +1,48 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from authentication.management.commands.prune_jwt_tokens import missing_indexes
+
+from .utils import APITestCase, make_faculty
+
+
+class PruneJWTTokensTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.faculty = make_faculty()
+        now = timezone.now()
+        self.expired = [self.outstanding(f'expired-{number}', now - timedelta(days=1)) for number in range(5)]
+        self.live = self.outstanding('live', now + timedelta(days=1))
+        BlacklistedToken.objects.create(token=self.expired[0])
+        BlacklistedToken.objects.create(token=self.live)
+
+    def outstanding(self, jti, expires_at):
+        return OutstandingToken.objects.create(
+            user=self.faculty, jti=jti, token=jti, created_at=timezone.now(), expires_at=expires_at
+        )
+
+    def prune(self, *args):
+        output = StringIO()
+        call_command('prune_jwt_tokens', *args, stdout=output)
+        return output.getvalue()
+
+    def test_expired_tokens_and_their_blacklist_rows_are_deleted_in_chunks(self):
+        output = self.prune('--chunk-size', '2')
+
+        self.assertIn('Deleted 5 expired outstanding and 1 blacklisted tokens', output)
+        self.assertEqual(list(OutstandingToken.objects.values_list('jti', flat=True)), ['live'])
+        self.assertEqual(list(BlacklistedToken.objects.values_list('token__jti', flat=True)), ['live'])
+
+    def test_check_only_deletes_nothing_and_reports_growth(self):
+        output = self.prune('--check-only')
+
+        self.assertEqual(OutstandingToken.objects.count(), 6)
+        self.assertIn('outstanding tokens: 6 rows, +6 in the last day', output)
+        self.assertNotIn('Deleted', output)
+
+    def test_required_indexes_exist_after_migrate(self):
+        self.assertEqual(missing_indexes(), [])
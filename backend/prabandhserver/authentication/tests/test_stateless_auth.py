@@ -0,0 +1,64 @@
+from django.contrib.sessions.models import Session
+from django.test import override_settings
+from rest_framework.authtoken.models import Token
+
+from .utils import PASSWORD, APITestCase, make_faculty
+
+LOGIN_URL = '/api/auth/login/'
+LOGOUT_URL = '/api/auth/logout/'
+REFRESH_URL = '/api/auth/token/refresh/'
+
+
+class StatelessLoginTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.faculty = make_faculty()
+
+    def log_in(self):
+        credentials = {'primary_email': self.faculty.primary_email, 'password': PASSWORD}
+        response = self.client.post(LOGIN_URL, credentials, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        return response
+
+    @override_settings(AUTH_STATELESS=True)
+    def test_stateless_login_creates_no_session(self):
+        response = self.log_in()
+
+        self.assertIn('access', response.data)
+        self.assertIn('refresh', response.data)
+        self.assertNotIn('sessionid', response.cookies)
+        self.assertFalse(Session.objects.exists())
+        self.faculty.refresh_from_db()
+        self.assertIsNotNone(self.faculty.last_login)
+
+    @override_settings(AUTH_STATELESS=False)
+    def test_session_login_still_creates_a_session(self):
+        response = self.log_in()
+
+        self.assertIn('sessionid', response.cookies)
+        self.assertTrue(Session.objects.exists())
+
+    @override_settings(AUTH_LEGACY_TOKENS=False)
+    def test_legacy_token_is_only_issued_when_enabled(self):
+        response = self.log_in()
+
+        self.assertNotIn('token', response.data)
+        self.assertFalse(Token.objects.exists())
+
+    @override_settings(AUTH_STATELESS=True)
+    def test_logout_blacklists_the_refresh_token(self):
+        tokens = self.log_in().data
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+        response = self.client.post(LOGOUT_URL, {'refresh': tokens['refresh']}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Token.objects.filter(user=self.faculty).exists())
+        self.assertEqual(self.client.post(REFRESH_URL, {'refresh': tokens['refresh']}, format='json').status_code, 401)
+
+    @override_settings(AUTH_STATELESS=True, AUTH_LEGACY_TOKENS=False)
+    def test_logout_without_a_legacy_token(self):
+        tokens = self.log_in().data
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+        self.assertEqual(self.client.post(LOGOUT_URL, {}, format='json').status_code, 200)
@@ -0,0 +1,130 @@
+from unittest import mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from authentication import typeahead
+from authentication.typeahead import CHANGE_SEQUENCE_KEY, FacultyPrefixIndex, record_changes
+from deputy_registrar.models import Department, School
+
+from .utils import APITestCase, make_faculty
+
+SUGGEST_URL = '/api/auth/faculty/suggest/'
+
+
+class FacultySuggestTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        department = Department.objects.create(name='Physics', school=School.objects.create(name='Sciences'))
+        self.asha = make_faculty(
+            'asha.rao@example.edu', name='Asha  Rao', registration_no='PHY001', emptype='hod', department=department,
+        )
+        self.ashok = make_faculty('ashok@example.edu', name='Ashok Menon', registration_no='PHY002')
+        self.login(self.ashok)
+        # A fresh index per test; the module-level one outlives the test database
+        index = mock.patch.object(typeahead, 'faculty_index', FacultyPrefixIndex())
+        self.index = index.start()
+        self.addCleanup(index.stop)
+
+    def suggest(self, q, **params):
+        response = self.client.get(SUGGEST_URL, {'q': q, **params})
+        self.assertEqual(response.status_code, 200, response.data)
+        return [result['id'] for result in response.data['results']]
+
+    def save(self, faculty, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            for field, value in fields.items():
+                setattr(faculty, field, value)
+            faculty.save()
+
+    def test_matches_name_words_full_name_registration_no_and_email(self):
+        self.assertEqual(self.suggest('ash'), [self.asha.id, self.ashok.id])
+        self.assertEqual(self.suggest('RAO'), [self.asha.id])
+        self.assertEqual(self.suggest('asha r'), [self.asha.id])
+        self.assertEqual(self.suggest('phy002'), [self.ashok.id])
+        self.assertEqual(self.suggest('asha.rao@'), [self.asha.id])
+        self.assertEqual(self.suggest('ao'), [])
+        self.assertEqual(self.suggest(' '), [])
+
+    def test_result_fields(self):
+        response = self.client.get(SUGGEST_URL, {'q': 'rao'})
+
+        self.assertEqual(response.data['results'], [{
+            'id': self.asha.id, 'name': 'Asha  Rao', 'registration_no': 'PHY001', 'email': 'asha.rao@example.edu',
+            'emptype': 'hod', 'designation': '', 'department': 'Physics',
+        }])
+
+    def test_emptype_filter_and_limit(self):
+        self.assertEqual(self.suggest('ash', emptype='hod'), [self.asha.id])
+        self.assertEqual(self.suggest('ash', limit=1), [self.asha.id])
+        self.assertEqual(self.client.get(SUGGEST_URL, {'q': 'ash', 'limit': 'ten'}).status_code, 400)
+
+    def test_lookups_after_the_first_do_not_query(self):
+        self.suggest('ash')
+
+        with CaptureQueriesContext(connection) as queries:
+            self.suggest('asha')
+        self.assertEqual([query['sql'] for query in queries if 'authentication_faculty' in query['sql']], [])
+
+    def test_changes_are_applied_incrementally(self):
+        # The first change after the cache is cleared restarts the log, which rebuilds
+        record_changes([self.ashok.id])
+        self.suggest('ash')
+
+        self.save(self.asha, name='Meera Rao')
+        self.save(self.ashok, is_active=False)
+        with self.captureOnCommitCallbacks(execute=True):
+            newcomer = make_faculty(name='Ashwin Das')
+
+        with mock.patch.object(self.index, '_rebuild', wraps=self.index._rebuild) as rebuild:
+            self.assertEqual(self.suggest('ashwin'), [newcomer.id])
+            self.assertEqual(self.suggest('meera'), [self.asha.id])
+            self.assertEqual(self.suggest('asha r'), [])
+            self.assertEqual(self.suggest('ashok'), [])
+        rebuild.assert_not_called()
+
+    def test_missing_log_entries_rebuild_the_index(self):
+        self.suggest('ash')
+        self.save(self.asha, name='Meera Rao')
+        typeahead.cache.delete(typeahead._change_key(typeahead._current_sequence()))
+        self.save(self.ashok, name='Ashok Kumar')
+
+        self.assertEqual(self.suggest('meera'), [self.asha.id])
+        self.assertEqual(self.suggest('kumar'), [self.ashok.id])
+
+
+class ChangeLogTests(APITestCase):
+    def test_numbers_follow_on_from_the_sequence(self):
+        typeahead.cache.set(CHANGE_SEQUENCE_KEY, 10, None)
+
+        record_changes([7, 8])
+
+        self.assertEqual(typeahead._current_sequence(), 12)
+        self.assertEqual(typeahead.cache.get_many([typeahead._change_key(11), typeahead._change_key(12)]), {
+            typeahead._change_key(11): 7, typeahead._change_key(12): 8,
+        })
+
+    def test_a_stale_sequence_does_not_overwrite_logged_changes(self):
+        typeahead.cache.set(CHANGE_SEQUENCE_KEY, 10, None)
+        record_changes([7])
+        # A racing writer read 10 too, and sets the sequence back after this one logged 11
+        typeahead.cache.set(CHANGE_SEQUENCE_KEY, 10, None)
+
+        record_changes([8])
+
+        self.assertEqual(typeahead.cache.get(typeahead._change_key(11)), 7)
+        self.assertEqual(typeahead.cache.get(typeahead._change_key(12)), 8)
+        self.assertEqual(typeahead._current_sequence(), 12)
+
+    def test_a_lost_sequence_restarts_far_ahead(self):
+        record_changes([7])
+
+        self.assertGreater(typeahead._current_sequence(), typeahead.MAX_INCREMENTAL_CHANGES)
+
+    def test_large_batches_jump_the_sequence(self):
+        typeahead.cache.set(CHANGE_SEQUENCE_KEY, 10, None)
+
+        record_changes(range(1, typeahead.MAX_INCREMENTAL_CHANGES + 2))
+
+        self.assertEqual(typeahead._current_sequence(), 10 + typeahead.MAX_INCREMENTAL_CHANGES + 1)
+        self.assertIsNone(typeahead.cache.get(typeahead._change_key(11)))
@@ -0,0 +1,60 @@
+"""
+Shared helpers for the API tests of every app.
+
+APITestCase hashes passwords with MD5 (PBKDF2 would dominate the run time),
+starts from empty shared and per-process caches, pushes through an
+InMemoryBackend instead of Firebase and keeps pushes and emails synchronous.
+"""
+import itertools
+from datetime import date, timedelta
+
+from django.core import mail
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework import test
+
+from authentication.models import Faculty
+from authentication.principal_cache import clear_local_principals
+from notifications.backends import InMemoryBackend
+from notifications.sender import set_push_backend
+
+PASSWORD = 'correct-horse-42'
+
+_sequence = itertools.count(1)
+
+
+def make_faculty(email=None, password=PASSWORD, **fields):
+    number = next(_sequence)
+    fields.setdefault('name', f'Faculty {number}')
+    fields.setdefault('registration_no', f'REG{number:05d}')
+    fields.setdefault('emptype', 'faculty')
+    return Faculty.objects.create_user(email=email or f'faculty{number}@example.edu', password=password, **fields)
+
+
+def next_monday(weeks=1):
+    """A Monday at least `weeks` weeks away, so a Monday-Friday range holds five working days."""
+    today = date.today()
+    return today + timedelta(days=7 * weeks - today.weekday())
+
+
+@override_settings(
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+    PUSH_COALESCE_WINDOW=0,
+    EMAIL_QUEUE_IN_PROCESS=False,
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+)
+class APITestCase(test.APITestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        clear_local_principals()
+        mail.outbox = []
+        InMemoryBackend.outbox = []
+        InMemoryBackend.unregistered_tokens = set()
+        InMemoryBackend.topic_subscriptions.clear()
+        previous = set_push_backend(InMemoryBackend())
+        self.addCleanup(set_push_backend, previous)
+
+    def login(self, user):
+        self.client.force_authenticate(user)
+        return user
@@ -0,0 +1,181 @@
+"""
+In-process prefix index for faculty autocomplete.
+
+Every active faculty member is indexed under the lower-cased words of their
+name, their full name, registration_no and email. The (token, id) pairs are
+kept sorted, so a lookup is a bisect to the first token starting with the query
+followed by a short walk.
+
+Each process builds its own index once and then keeps it current from a change
+log in the shared cache: record_changes() (called by the Faculty signals and by
+bulk writes that skip them) claims a number for every change, and a lookup that
+sees a newer number reloads just the changed faculty. When the log has gaps (evicted entries)
+or is too far ahead, the index is rebuilt.
+"""
+import bisect
+import threading
+import time
+
+from django.core.cache import cache
+
+from .models import Faculty
+
+CHANGE_SEQUENCE_KEY = 'authentication:typeahead:sequence'
+CHANGE_TIMEOUT = 60 * 60 * 24
+# Apply at most this many logged changes incrementally before rebuilding instead
+MAX_INCREMENTAL_CHANGES = 1000
+# Entries walked per lookup at most, so filtered lookups stay bounded
+MAX_SCAN = 5000
+
+FIELDS = ('id', 'name', 'registration_no', 'primary_email', 'emptype', 'designation', 'department__name')
+
+
+def _change_key(sequence):
+    return f'authentication:typeahead:change:{sequence}'
+
+
+def _current_sequence():
+    return cache.get(CHANGE_SEQUENCE_KEY) or 0
+
+
+def _claim_change(number, faculty_id):
+    """
+    Log faculty_id under the first free change number from `number` on and
+    return that number. cache.add() is atomic on every backend (an INSERT on
+    the database cache), so concurrent writers never share a number; incr() is
+    a read-modify-write on the database cache and could hand one out twice.
+    """
+    while not cache.add(_change_key(number), faculty_id, CHANGE_TIMEOUT):
+        number += 1
+    return number
+
+
+def record_changes(faculty_ids):
+    """Log changed (created, updated or deleted) faculty for every process's index."""
+    faculty_ids = list(faculty_ids)
+    if not faculty_ids:
+        return
+    last = cache.get(CHANGE_SEQUENCE_KEY)
+    if last is None:
+        # Start far from any number in use, so every index rebuilds instead of trusting old entries
+        last = time.time_ns()
+    if len(faculty_ids) > MAX_INCREMENTAL_CHANGES:
+        # Not logged one by one; readers see the jump and rebuild
+        last = _claim_change(last + len(faculty_ids), 0)
+    else:
+        for faculty_id in faculty_ids:
+            last = _claim_change(last + 1, faculty_id)
+    # The sequence only says where the log ends. A racing writer may set it back a
+    # little; its claimed entries stay in the log, and an index ahead of it rebuilds.
+    cache.set(CHANGE_SEQUENCE_KEY, last, None)
+
+
+def _tokens(row):
+    name = ' '.join(row['name'].lower().split())
+    tokens = set(name.split())
+    tokens.add(name)
+    tokens.add(row['registration_no'].lower())
+    tokens.add(row['primary_email'].lower())
+    tokens.discard('')
+    return tokens
+
+
+def _record(row):
+    return {
+        'id': row['id'],
+        'name': row['name'],
+        'registration_no': row['registration_no'],
+        'email': row['primary_email'],
+        'emptype': row['emptype'],
+        'designation': row['designation'],
+        'department': row['department__name'] or '',
+    }
+
+
+class FacultyPrefixIndex:
+    def __init__(self):
+        self._entries = []   # sorted (token, faculty_id)
+        self._records = {}   # faculty_id -> record returned by lookups
+        self._tokens = {}    # faculty_id -> tokens it is indexed under
+        self._sequence = None
+        self._lock = threading.Lock()
+
+    def _rows(self, faculty_ids=None):
+        queryset = Faculty.objects.filter(is_active=True)
+        if faculty_ids is not None:
+            queryset = queryset.filter(id__in=faculty_ids)
+        return queryset.values(*FIELDS)
+
+    def _rebuild(self, sequence):
+        entries, records, tokens = [], {}, {}
+        for row in self._rows():
+            records[row['id']] = _record(row)
+            tokens[row['id']] = _tokens(row)
+            entries.extend((token, row['id']) for token in tokens[row['id']])
+        entries.sort()
+        self._entries, self._records, self._tokens = entries, records, tokens
+        self._sequence = sequence
+
+    def _remove(self, faculty_id):
+        for token in self._tokens.pop(faculty_id, ()):
+            position = bisect.bisect_left(self._entries, (token, faculty_id))
+            if position < len(self._entries) and self._entries[position] == (token, faculty_id):
+                del self._entries[position]
+        self._records.pop(faculty_id, None)
+
+    def _apply(self, faculty_ids):
+        rows = {row['id']: row for row in self._rows(faculty_ids)}
+        for faculty_id in faculty_ids:
+            self._remove(faculty_id)
+            row = rows.get(faculty_id)
+            if row is None:
+                continue  # deleted or deactivated
+            self._records[faculty_id] = _record(row)
+            self._tokens[faculty_id] = _tokens(row)
+            for token in self._tokens[faculty_id]:
+                bisect.insort(self._entries, (token, faculty_id))
+
+    def sync(self):
+        """Bring the index up to the latest logged change."""
+        sequence = _current_sequence()
+        if sequence == self._sequence:
+            return
+        with self._lock:
+            if sequence == self._sequence:
+                return
+            if self._sequence is None or not 0 < sequence - self._sequence <= MAX_INCREMENTAL_CHANGES:
+                self._rebuild(sequence)
+                return
+            changes = cache.get_many([_change_key(number) for number in range(self._sequence + 1, sequence + 1)])
+            if len(changes) < sequence - self._sequence:
+                self._rebuild(sequence)
+                return
+            self._apply(set(changes.values()))
+            self._sequence = sequence
+
+    def lookup(self, query, limit=10, emptypes=None):
+        """Records of up to `limit` faculty with a token starting with query, ordered by matching token."""
+        prefix = ' '.join(query.lower().split())
+        if not prefix:
+            return []
+        self.sync()
+        with self._lock:
+            results, seen = [], set()
+            position = bisect.bisect_left(self._entries, (prefix,))
+            end = min(len(self._entries), position + MAX_SCAN)
+            while position < end and len(results) < limit:
+                token, faculty_id = self._entries[position]
+                if not token.startswith(prefix):
+                    break
+                position += 1
+                if faculty_id in seen:
+                    continue
+                seen.add(faculty_id)
+                record = self._records[faculty_id]
+                if emptypes and record['emptype'] not in emptypes:
+                    continue
+                results.append(record)
+            return results
+
+
+faculty_index = FacultyPrefixIndex()
@@ -2,20 +2,39 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.authtoken.models import Token
+from django.conf import settings
 from django.contrib.auth import login, logout
+from django.contrib.auth.models import update_last_login
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.utils.decorators import method_decorator
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework.decorators import api_view, permission_classes
-from django.db.models import Q, Value
+from django.db.models import F, Q, Value
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.generics import ListAPIView
+from rest_framework.pagination import PageNumberPagination
 from deputy_registrar.models import School
 
-from .serializers import FacultySerializer, RegisterSerializer, LoginSerializer, FacultyDocumentSerializer
+from . import directory, typeahead
+from .account_status import set_account_flags
+from .batch import batch_response, parse_ids
+from .bootstrap import bootstrap_etag, build_bootstrap
+from .bulk_import import DEFAULT_WEB_IMPORT_MAX_ROWS, import_faculty, read_rows
+from .serializers import FacultySerializer, FacultyStatusUpdateSerializer, RegisterSerializer, LoginSerializer, FacultyDocumentSerializer
 from .models import Faculty, FacultyDocument
 
+def _issue_tokens(user):
+    """JWT pair for the user, plus the legacy DRF token key while AUTH_LEGACY_TOKENS is on."""
+    refresh = RefreshToken.for_user(user)
+    tokens = {'refresh': str(refresh), 'access': str(refresh.access_token)}
+    if settings.AUTH_LEGACY_TOKENS:
+        token, _ = Token.objects.get_or_create(user=user)
+        tokens['token'] = token.key
+    return tokens
+
+
 class RegisterView(generics.CreateAPIView):
     permission_classes = [permissions.AllowAny]
     serializer_class = RegisterSerializer
@@ -25,12 +44,8 @@ class RegisterView(generics.CreateAPIView):
         if not serializer.is_valid():
             return Response({'errors': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
         user = serializer.save()
-        token, _ = Token.objects.get_or_create(user=user)
-        refresh = RefreshToken.for_user(user)
         return Response({
-            'token': token.key,
-            'refresh': str(refresh),
-            'access': str(refresh.access_token),
+            **_issue_tokens(user),
             'user': FacultySerializer(user).data,
             'message': 'User registered successfully'
         }, status=status.HTTP_201_CREATED)
@@ -45,14 +60,13 @@ class LoginView(generics.GenericAPIView):
         if not serializer.is_valid():
             return Response({'success': False, 'errors': serializer.errors, 'message': 'Login failed'}, status=status.HTTP_400_BAD_REQUEST)
         user = serializer.validated_data['user']
-        login(request, user)
-        token, _ = Token.objects.get_or_create(user=user)
-        refresh = RefreshToken.for_user(user)
+        if settings.AUTH_STATELESS:
+            update_last_login(None, user)
+        else:
+            login(request, user)
         return Response({
             'success': True,
-            'token': token.key,
-            'refresh': str(refresh),
-            'access': str(refresh.access_token),
+            **_issue_tokens(user),
             'user': FacultySerializer(user).data,
             'emptype': user.emptype,
             'message': 'Login successful'
@@ -62,8 +76,16 @@ class LoginView(generics.GenericAPIView):
 class LogoutView(APIView):
     def post(self, request, *args, **kwargs):
         if request.user.is_authenticated:
-            request.user.auth_token.delete()
-            logout(request)
+            Token.objects.filter(user=request.user).delete()
+            if not settings.AUTH_STATELESS:
+                logout(request)
+        # Without a session the refresh token is the login; blacklist it when the client sends it
+        refresh = request.data.get('refresh')
+        if refresh:
+            try:
+                RefreshToken(refresh).blacklist()
+            except TokenError:
+                pass
         return Response({'message': 'Successfully logged out.'}, status=status.HTTP_200_OK)
 
 
@@ -90,48 +112,54 @@ class CSRFTokenView(APIView):
         return Response({'success': 'CSRF cookie set'}, status=status.HTTP_200_OK)
 
 
+class BootstrapView(APIView):
+    """
+    Compact profile, role, leave balance summary, application and inbox counts
+    and unread notifications in one response, for app load. Send the ETag back
+    in If-None-Match to get a 304 when nothing changed.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        data = build_bootstrap(request.user, request)
+        etag = bootstrap_etag(data)
+        headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+        if etag in [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(data, headers=headers)
+
+
 # New class to fetch users by emptype
-class UsersByEmptypeView(generics.ListAPIView):
-    serializer_class = FacultySerializer
+class UsersByEmptypeView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_queryset(self):
+    def get(self, request):
         # Get the emptypes from the query parameters
-        emptypes = self.request.query_params.getlist('emptype')
-        
+        emptypes = request.query_params.getlist('emptype')
         if not emptypes:
-            return Faculty.objects.none()  # Return empty queryset if no emptypes provided
-            
-        # Filter users by the provided emptypes
-        queryset = Faculty.objects.filter(emptype__in=emptypes)
-        
+            return Response([])
+
+        profiles = directory.profiles_by_emptype(
+            FacultySerializer, {'request': request}, request.build_absolute_uri('/')
+        )
+        users = [user for emptype in set(emptypes) for user in profiles.get(emptype, [])]
+
         # Optionally exclude the current user
-        exclude_self = self.request.query_params.get('exclude_self', 'false').lower() == 'true'
+        exclude_self = request.query_params.get('exclude_self', 'false').lower() == 'true'
         if exclude_self:
-            queryset = queryset.exclude(id=self.request.user.id)
-            
-        return queryset.order_by('name')  # Order by name for better UX
+            users = [user for user in users if user['id'] != request.user.id]
+
+        return Response(sorted(users, key=lambda user: user['name']))  # Order by name for better UX
 
 
 # New API view to get all unique emptypes
 class EmptypesView(APIView):
     permission_classes = [permissions.IsAuthenticated]
-    
+
     def get(self, request):
-        # Get all unique emptypes from the database that have at least one user
-        emptypes = Faculty.objects.exclude(emptype='').values_list('emptype', flat=True).distinct()
-        
-        # Convert QuerySet to list
-        emptypes_list = list(emptypes)
-        
-        # Group users by emptype
-        emptype_users = {}
-        for emptype in emptypes_list:
-            users = Faculty.objects.filter(emptype=emptype).values('id', 'name', 'registration_no', 'department')
-            emptype_users[emptype] = list(users)
-        
+        emptype_users = directory.faculty_by_emptype()
         return Response({
-            "emptypes": emptypes_list,
+            "emptypes": list(emptype_users),
             "users_by_emptype": emptype_users
         })
 
@@ -147,8 +175,24 @@ def unique_departments(request):
     """
     Returns a list of unique departments from the Faculty model.
     """
-    departments = Faculty.objects.exclude(department='').values_list('department', flat=True).distinct()
-    return Response({'departments': list(departments)})
+    return Response({'departments': directory.department_names()})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def faculty_suggest(request):
+    """
+    Faculty autocomplete from the in-process prefix index.
+    Query params: q (prefix of a name word, the full name, registration_no or email),
+    limit (default 10, max 50), emptype (repeatable)
+    """
+    query = request.query_params.get('q', '')
+    try:
+        limit = min(int(request.query_params.get('limit', 10)), 50)
+    except ValueError:
+        return Response({'error': 'limit must be a number.'}, status=400)
+    emptypes = set(request.query_params.getlist('emptype'))
+    return Response({'results': typeahead.faculty_index.lookup(query, limit=limit, emptypes=emptypes)})
 
 
 @api_view(['GET'])
@@ -161,8 +205,7 @@ def faculty_by_department(request):
     department = request.query_params.get('department', None)
     if not department:
         return Response({'error': 'Department parameter is required.'}, status=400)
-    faculty = Faculty.objects.filter(department=department).values('id', 'name', 'registration_no', 'designation', 'primary_email')
-    return Response({'faculty': list(faculty)})
+    return Response({'faculty': directory.faculty_by_department().get(department, [])})
 
 
 class ProfileImageUploadView(APIView):
@@ -212,23 +255,88 @@ class FacultyDocumentListView(ListAPIView):
         return FacultyDocument.objects.filter(faculty_id=faculty_id)
 
 
+class FacultyDirectoryPagination(PageNumberPagination):
+    """
+    Pages only when the request asks for one (page or page_size); otherwise the
+    whole list is returned as before, for clients that expect a bare array.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.page_query_param not in request.query_params and self.page_size_query_param not in request.query_params:
+            return None
+        return super().paginate_queryset(queryset, request, view=view)
+
+    def respond(self, rows, page):
+        """A page response when paging, the bare list otherwise."""
+        return self.get_paginated_response(rows) if page is not None else Response(rows)
+
+
 class HRFacultyListView(APIView):
+    """
+    Faculty list for HR, paginated when page or page_size is given.
+    Query params: school, department, emptype, is_staff, q (prefix of name,
+    registration_no or email), page, page_size
+    """
     permission_classes = [IsHRUser]
 
     def get(self, request):
-        faculty_qs = Faculty.objects.all().select_related('school')
-        data = []
-        for faculty in faculty_qs:
-            data.append({
-                "id": faculty.id,
-                "full_name": faculty.name,
-                "email": faculty.primary_email,
-                "employee_type": faculty.emptype,
-                "school": faculty.school.name if faculty.school else "",
-                "department": faculty.department or "",
-                "is_staff": faculty.is_staff,  # Add HR approval status
-            })
-        return Response(data)
+        school = request.query_params.get('school')
+        if school and not school.isdigit():
+            return Response({'error': 'school must be a school id.'}, status=400)
+        faculty_qs = directory.filter_faculty(Faculty.objects.all(), request.query_params).order_by('name', 'id').values(
+            'id', 'emptype', 'department__name', 'is_staff', 'school__name',
+            full_name=F('name'), email=F('primary_email'),
+        )
+        paginator = FacultyDirectoryPagination()
+        page = paginator.paginate_queryset(faculty_qs, request, view=self)
+        data = [{
+            "id": faculty["id"],
+            "full_name": faculty["full_name"],
+            "email": faculty["email"],
+            "employee_type": faculty["emptype"],
+            "school": faculty["school__name"] or "",
+            "department": faculty["department__name"] or "",
+            "is_staff": faculty["is_staff"],  # Add HR approval status
+        } for faculty in (page if page is not None else faculty_qs)]
+        return paginator.respond(data, page)
+
+
+class HRFacultyImportView(APIView):
+    """
+    Bulk onboarding: POST a .csv or .xlsx file as "file". Nothing is imported
+    unless every row is valid; errors are reported per row. Send dry_run=true
+    to only validate. Passwords are hashed in this process, so an import is
+    limited to FACULTY_IMPORT_MAX_ROWS rows; use the import_faculty command
+    for larger files.
+    """
+    permission_classes = [IsHRUser]
+    parser_classes = [MultiPartParser, FormParser]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if not upload:
+            return Response({'error': 'file is required.'}, status=400)
+        try:
+            rows = read_rows(upload, upload.name)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+        if not rows:
+            return Response({'error': 'The file has no rows.'}, status=400)
+
+        dry_run = str(request.data.get('dry_run', '')).lower() in ('1', 'true', 'yes')
+        max_rows = getattr(settings, 'FACULTY_IMPORT_MAX_ROWS', DEFAULT_WEB_IMPORT_MAX_ROWS)
+        if not dry_run and len(rows) > max_rows:
+            return Response({
+                'error': f'At most {max_rows} rows can be imported here; '
+                         f'use the import_faculty management command for this file ({len(rows)} rows).',
+            }, status=413)
+        result = import_faculty(rows, dry_run=dry_run, workers=1)
+        if result['errors']:
+            return Response({**result, 'message': 'No faculty were imported; fix the rows listed in errors.'}, status=400)
+        return Response(result, status=200 if dry_run else 201)
 
 
 class HRFacultyDetailView(APIView):
@@ -253,6 +361,37 @@ class HRFacultyDetailView(APIView):
             faculty.save()
         return Response(FacultySerializer(faculty, context={'request': request}).data)
 
+
+class HRFacultyBatchView(APIView):
+    """HR: full profiles of several faculty in one request, ?ids=1,2,3 (in that order)."""
+    permission_classes = [IsHRUser]
+
+    def get(self, request):
+        ids = parse_ids(request.query_params.get('ids'))
+        return batch_response(
+            Faculty.objects.select_related('department'), ids, FacultySerializer, {'request': request}
+        )
+
+
+class HRFacultyStatusView(APIView):
+    """
+    HR: set is_staff and/or is_active on several faculty at once, e.g.
+    {"ids": [1, 2, 3], "is_staff": true}. Faculty who become staff get a welcome notification.
+    """
+    permission_classes = [IsHRUser]
+
+    def post(self, request):
+        serializer = FacultyStatusUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        result = set_account_flags(
+            data['ids'],
+            {field: data[field] for field in ('is_staff', 'is_active') if field in data},
+            changed_by=request.user,
+        )
+        return Response(result)
+
+
 class HRFacultyDocumentsView(APIView):
     permission_classes = [IsHRUser]
 
@@ -263,17 +402,21 @@ class HRFacultyDocumentsView(APIView):
 
 
 class FacultyDirectoryView(APIView):
+    """
+    Faculty directory, paginated when page or page_size is given.
+    Query params: school, department, emptype, is_staff, q (prefix of name,
+    registration_no or email), page, page_size
+    """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        faculty_qs = Faculty.objects.all().select_related('school')
-        data = []
-        for faculty in faculty_qs:
-            data.append({
-                "id": faculty.id,
-                "full_name": faculty.name,
-                "email": faculty.primary_email,
-                "department": faculty.department or "",
-                "is_staff": faculty.is_staff,
-            })
-        return Response(data)
+        school = request.query_params.get('school')
+        if school and not school.isdigit():
+            return Response({'error': 'school must be a school id.'}, status=400)
+        faculty_qs = directory.filter_faculty(Faculty.objects.all(), request.query_params).order_by('name', 'id').values(
+            'id', 'department__name', 'is_staff', full_name=F('name'), email=F('primary_email'),
+        )
+        paginator = FacultyDirectoryPagination()
+        page = paginator.paginate_queryset(faculty_qs, request, view=self)
+        rows = list(directory.department_rows(page if page is not None else faculty_qs))
+        return paginator.respond(rows, page)
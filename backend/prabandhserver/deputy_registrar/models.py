@@ -49,6 +49,12 @@ class Department(models.Model):
     name = models.CharField(max_length=100)
     school = models.ForeignKey(School, on_delete=models.CASCADE, related_name='departments')
 
+    class Meta:
+        indexes = [
+            # Faculty filtered by department name join on this
+            models.Index(fields=['name'], name='department_name_idx'),
+        ]
+
     def __str__(self):
         return f"{self.name} ({self.school.name})"
 
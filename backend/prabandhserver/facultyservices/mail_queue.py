@@ -0,0 +1,168 @@
+"""
+Background delivery of notification emails.
+
+queue_emails() only inserts QueuedEmail rows, so a request never waits on SMTP.
+send_queued_emails() sends due rows over a single SMTP connection, paced to
+EMAIL_QUEUE_MAX_PER_MINUTE, and reschedules failures with exponential backoff.
+It runs in a background thread of the web process once the queuing transaction
+commits (EMAIL_QUEUE_IN_PROCESS) and from `manage.py send_queued_emails` for a
+dedicated worker.
+"""
+import logging
+import smtplib
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection as db_connection, transaction
+from django.utils import timezone
+
+from .models import QueuedEmail
+
+logger = logging.getLogger('facultyservices')
+
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_MAX_PER_MINUTE = 60
+DEFAULT_MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = timedelta(minutes=1)
+# A claimed row becomes due again if its worker dies before finishing the batch
+CLAIM_LEASE = timedelta(minutes=10)
+
+_worker_lock = threading.Lock()
+_worker_thread = None
+_worker_rerun = False
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def queue_emails(recipients, subject, body):
+    """Queue one email per distinct recipient. Returns the number queued."""
+    rows = [
+        QueuedEmail(to_email=email, subject=subject[:255], body=body)
+        for email in dict.fromkeys(recipients) if email
+    ]
+    if not rows:
+        return 0
+    QueuedEmail.objects.bulk_create(rows)
+    if _setting('EMAIL_QUEUE_IN_PROCESS', True):
+        transaction.on_commit(start_background_worker)
+    return len(rows)
+
+
+def _claim_batch(batch_size):
+    """
+    Lease up to batch_size due rows to this worker. The claim is a conditional
+    UPDATE that only matches rows that are still due, so when two workers pick
+    the same candidates each row is leased to one of them; SQLite ignores
+    select_for_update, so row locks cannot be relied on for this.
+    """
+    token = uuid.uuid4().hex
+    while True:
+        now = timezone.now()
+        due = QueuedEmail.objects.filter(status='pending', next_attempt_at__lte=now)
+        ids = list(due.order_by('next_attempt_at').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return []
+        claimed = due.filter(id__in=ids).update(next_attempt_at=now + CLAIM_LEASE, claimed_by=token)
+        if claimed:
+            return list(QueuedEmail.objects.filter(claimed_by=token, status='pending').order_by('id'))
+        # Another worker leased every candidate first; look for rows that are still due
+
+
+def _reschedule(email, error, max_attempts):
+    email.attempts += 1
+    email.last_error = str(error)[:1000]
+    # A refused recipient will not be accepted on a later attempt either
+    if email.attempts >= max_attempts or isinstance(error, smtplib.SMTPRecipientsRefused):
+        email.status = 'failed'
+    else:
+        email.next_attempt_at = timezone.now() + RETRY_BASE_DELAY * (2 ** (email.attempts - 1))
+    email.save(update_fields=['attempts', 'last_error', 'status', 'next_attempt_at'])
+
+
+def send_queued_emails(batch_size=None, max_per_minute=None, max_attempts=None, connection=None):
+    """
+    Send every due email, reusing one SMTP connection for all of them.
+    Returns a dict with the number of emails sent and failed.
+    """
+    batch_size = batch_size or _setting('EMAIL_QUEUE_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    max_per_minute = max_per_minute or _setting('EMAIL_QUEUE_MAX_PER_MINUTE', DEFAULT_MAX_PER_MINUTE)
+    max_attempts = max_attempts or _setting('EMAIL_QUEUE_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS)
+    interval = 60.0 / max_per_minute
+    connection = connection or get_connection(fail_silently=False)
+    result = {'sent': 0, 'failed': 0}
+    last_sent = None
+
+    try:
+        while True:
+            batch = _claim_batch(batch_size)
+            if not batch:
+                break
+
+            sent_ids = []
+            for email in batch:
+                if last_sent is not None:
+                    time.sleep(max(0.0, interval - (time.monotonic() - last_sent)))
+                last_sent = time.monotonic()
+                try:
+                    # send_messages only opens a connection when none is open yet
+                    connection.open()
+                    message = EmailMessage(
+                        email.subject, email.body, settings.DEFAULT_FROM_EMAIL, [email.to_email],
+                        connection=connection,
+                    )
+                    connection.send_messages([message])
+                except (smtplib.SMTPException, OSError) as e:
+                    logger.warning(f"Email to {email.to_email} failed (attempt {email.attempts + 1}): {e}")
+                    _reschedule(email, e, max_attempts)
+                    result['failed'] += 1
+                    # Start over with a fresh connection for the next message
+                    connection.close()
+                else:
+                    sent_ids.append(email.id)
+
+            if sent_ids:
+                QueuedEmail.objects.filter(id__in=sent_ids).update(
+                    status='sent', sent_at=timezone.now(), last_error=''
+                )
+                result['sent'] += len(sent_ids)
+    finally:
+        connection.close()
+
+    if result['sent'] or result['failed']:
+        logger.info(f"Email queue: sent {result['sent']}, failed {result['failed']}")
+    return result
+
+
+def _run_worker():
+    global _worker_thread, _worker_rerun
+    try:
+        while True:
+            try:
+                send_queued_emails()
+            except Exception:
+                logger.exception("Email queue worker failed")
+            with _worker_lock:
+                if not _worker_rerun:
+                    _worker_thread = None
+                    return
+                _worker_rerun = False
+    finally:
+        db_connection.close()
+
+
+def start_background_worker():
+    """Drain the queue in a background thread; at most one runs per process."""
+    global _worker_thread, _worker_rerun
+    with _worker_lock:
+        if _worker_thread is not None:
+            # Rows queued while the thread is running are picked up by another pass
+            _worker_rerun = True
+            return
+        _worker_thread = threading.Thread(target=_run_worker, name='email-queue-worker', daemon=True)
+        _worker_thread.start()
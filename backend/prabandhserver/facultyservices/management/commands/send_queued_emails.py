@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from facultyservices.mail_queue import send_queued_emails
+
+
+class Command(BaseCommand):
+    help = 'Send queued notification emails over a pooled SMTP connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling the queue instead of exiting once it is empty',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=10,
+            help='Seconds to wait between polls with --loop',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Number of emails claimed per query (default: EMAIL_QUEUE_BATCH_SIZE)',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            result = send_queued_emails(batch_size=options['batch_size'])
+            if result['sent'] or result['failed'] or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Sent {result['sent']} emails, {result['failed']} failed"
+                ))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
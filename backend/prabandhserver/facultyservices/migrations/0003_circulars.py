@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:22
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('facultyservices', '0002_queuedemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Circular',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=255)),
+                ('body', models.TextField()),
+                ('attachment', models.FileField(blank=True, null=True, upload_to='circulars')),
+                ('audience_type', models.CharField(choices=[('all', 'All Faculty'), ('school', 'School'), ('department', 'Department'), ('role', 'Role')], default='all', max_length=20)),
+                ('audience_value', models.CharField(blank=True, max_length=100)),
+                ('topic', models.CharField(blank=True, max_length=200)),
+                ('recipient_count', models.PositiveIntegerField(default=0)),
+                ('message_id', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='circulars', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CircularReadReceipt',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('read_at', models.DateTimeField(auto_now_add=True)),
+                ('circular', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='read_receipts', to='facultyservices.circular')),
+                ('faculty', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='circular_read_receipts', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='circularreadreceipt',
+            constraint=models.UniqueConstraint(fields=('circular', 'faculty'), name='unique_circular_read_receipt'),
+        ),
+        migrations.AddIndex(
+            model_name='circular',
+            index=models.Index(fields=['audience_type', 'audience_value', 'created_at'], name='circular_audience_idx'),
+        ),
+    ]
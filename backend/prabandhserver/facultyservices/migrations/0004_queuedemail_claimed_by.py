@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('facultyservices', '0003_circulars'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='queuedemail',
+            name='claimed_by',
+            field=models.CharField(blank=True, max_length=32),
+        ),
+    ]
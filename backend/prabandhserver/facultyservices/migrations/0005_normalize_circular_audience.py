@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+def normalize_audience_values(apps, schema_editor):
+    # Department and role audiences are compared lowercased and stripped, see notifications.topics
+    Circular = apps.get_model('facultyservices', 'Circular')
+    changed = []
+    for circular in Circular.objects.filter(audience_type__in=['department', 'role']).only('id', 'audience_value'):
+        value = circular.audience_value.strip().lower()
+        if value != circular.audience_value:
+            circular.audience_value = value
+            changed.append(circular)
+    Circular.objects.bulk_update(changed, ['audience_value'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('facultyservices', '0004_queuedemail_claimed_by'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_audience_values, migrations.RunPython.noop),
+    ]
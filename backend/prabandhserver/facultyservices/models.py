@@ -1,5 +1,7 @@
 from django.db import models
-from authentication.models import School
+from django.utils import timezone
+from authentication.models import School, Faculty
+from notifications.topics import normalize_audience_value
 
 # Create your models here.
 class EventsDetails(models.Model):
@@ -58,6 +60,12 @@ class EventsDetails(models.Model):
     other_requirements = models.TextField(blank=True, null=True)
     members = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+
+    # File fields that can be uploaded after the event has been created
+    UPLOADABLE_FILE_FIELDS = [
+        'proposal_file', 'vcapproval_file', 'creatives', 'attendance_file', 'report_file',
+        'geotagpics_file1', 'geotagpics_file2', 'geotagpics_file3', 'news_social_media', 'news_print_media'
+    ]
   
 class EventType(models.Model):
     type = models.CharField(max_length=250)
@@ -68,4 +76,105 @@ class EventSubType(models.Model):
     event_type = models.ForeignKey(EventType, on_delete=models.CASCADE)
     name = models.CharField(max_length=250)
     def __str__(self):
-        return f'{self.name} - {self.event_type}' 
\ No newline at end of file
+        return f'{self.name} - {self.event_type}' 
+
+
+class QueuedEmail(models.Model):
+    """
+    Outgoing notification email. Views only insert rows; facultyservices.mail_queue
+    sends them over a shared SMTP connection and retries failures with backoff.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    # Lease token of the worker sending this row, see mail_queue._claim_batch
+    claimed_by = models.CharField(max_length=32, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='queued_email_due_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.to_email} - {self.subject} ({self.status})'
+
+
+class Circular(models.Model):
+    """
+    Broadcast from the VC office to everyone, a school, a department or a role.
+    Delivered with one send to the audience's FCM topic (see notifications.topics).
+    """
+    AUDIENCE_CHOICES = [
+        ('all', 'All Faculty'),
+        ('school', 'School'),
+        ('department', 'Department'),
+        ('role', 'Role'),
+    ]
+
+    title = models.CharField(max_length=255)
+    body = models.TextField()
+    attachment = models.FileField(upload_to='circulars', blank=True, null=True)
+    audience_type = models.CharField(max_length=20, choices=AUDIENCE_CHOICES, default='all')
+    audience_value = models.CharField(max_length=100, blank=True)
+    topic = models.CharField(max_length=200, blank=True)
+    recipient_count = models.PositiveIntegerField(default=0)
+    message_id = models.CharField(max_length=255, blank=True)
+    created_by = models.ForeignKey(Faculty, on_delete=models.SET_NULL, null=True, blank=True, related_name='circulars')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['audience_type', 'audience_value', 'created_at'], name='circular_audience_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+    def audience_filter(self):
+        """Filter kwargs selecting the faculty this circular is addressed to."""
+        # Department and role values are stored normalized, see notifications.topics
+        if self.audience_type == 'school':
+            return {'school_id': self.audience_value}
+        if self.audience_type == 'department':
+            return {'department__name__iexact': self.audience_value}
+        if self.audience_type == 'role':
+            return {'emptype__iexact': self.audience_value}
+        return {}
+
+    @staticmethod
+    def addressed_to(user):
+        """Q matching every circular that reaches the given faculty member."""
+        query = models.Q(audience_type='all')
+        if user.school_id:
+            query |= models.Q(audience_type='school', audience_value=str(user.school_id))
+        if user.department_id:
+            query |= models.Q(audience_type='department', audience_value=normalize_audience_value(user.department.name))
+        if user.emptype:
+            query |= models.Q(audience_type='role', audience_value=normalize_audience_value(user.emptype))
+        return query
+
+class CircularReadReceipt(models.Model):
+    circular = models.ForeignKey(Circular, on_delete=models.CASCADE, related_name='read_receipts')
+    faculty = models.ForeignKey(Faculty, on_delete=models.CASCADE, related_name='circular_read_receipts')
+    read_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['circular', 'faculty'], name='unique_circular_read_receipt'),
+        ]
+
+    def __str__(self):
+        return f'{self.faculty_id} read {self.circular_id}'
@@ -1,5 +1,7 @@
 from rest_framework import serializers
-from .models import EventType, EventSubType, EventsDetails
+from .models import EventType, EventSubType, EventsDetails, Circular
+from authentication.models import School
+from notifications.topics import normalize_audience_value
 
 class EventTypeSerializer(serializers.ModelSerializer):
     class Meta:
@@ -66,4 +68,33 @@ class EventsDetailsSerializer(serializers.ModelSerializer):
         model = EventsDetails
         fields = '__all__'
         read_only_fields = ['upload_by']
-        extra_fields = ['files_uploaded', 'files_required', 'created_at'] 
\ No newline at end of file
+        extra_fields = ['files_uploaded', 'files_required', 'created_at'] 
+
+class CircularSerializer(serializers.ModelSerializer):
+    created_by_name = serializers.CharField(source='created_by.name', read_only=True, default=None)
+    is_read = serializers.BooleanField(read_only=True, default=False)
+    read_count = serializers.IntegerField(read_only=True, default=None)
+
+    class Meta:
+        model = Circular
+        fields = [
+            'id', 'title', 'body', 'attachment', 'audience_type', 'audience_value',
+            'recipient_count', 'read_count', 'is_read', 'created_by_name', 'created_at',
+        ]
+        read_only_fields = ['id', 'recipient_count', 'created_at']
+
+    def validate(self, data):
+        audience_type = data.get('audience_type', 'all')
+        audience_value = (data.get('audience_value') or '').strip()
+        if audience_type == 'all':
+            audience_value = ''
+        elif not audience_value:
+            raise serializers.ValidationError({'audience_value': f'Required for a {audience_type} circular.'})
+        elif audience_type == 'school':
+            if not audience_value.isdigit() or not School.objects.filter(id=audience_value).exists():
+                raise serializers.ValidationError({'audience_value': 'Unknown school.'})
+        else:
+            # Stored the way Circular.addressed_to and the topic names compare it
+            audience_value = normalize_audience_value(audience_value)
+        data['audience_value'] = audience_value
+        return data
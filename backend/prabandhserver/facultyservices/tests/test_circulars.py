@@ -0,0 +1,79 @@
+from authentication.tests.utils import APITestCase, make_faculty
+from deputy_registrar.models import Department, School
+from facultyservices.models import Circular
+from notifications.backends import InMemoryBackend
+from notifications.topics import topics_for_user
+
+CIRCULARS_URL = '/api/facultyservices/circulars/'
+
+
+class CircularTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.school = School.objects.create(name='School of Engineering')
+        self.department = Department.objects.create(name='Computer Science', school=self.school)
+        self.hod = make_faculty(emptype='HOD', school=self.school, department=self.department)
+        self.teacher = make_faculty(emptype='faculty', school=self.school, department=self.department)
+        self.outsider = make_faculty(emptype='faculty')
+        self.vc = self.login(make_faculty(emptype='vc'))
+
+    def send(self, audience_type, audience_value=''):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(CIRCULARS_URL, {
+                'title': 'Exam schedule', 'body': 'Please review', 'audience_type': audience_type,
+                'audience_value': audience_value,
+            }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return Circular.objects.get(id=response.data['id'])
+
+    def listing(self):
+        return self.client.get(CIRCULARS_URL).data
+
+    def test_role_audience_matches_emptype_case_insensitively(self):
+        circular = self.send('role', ' hod ')
+
+        self.assertEqual(circular.audience_value, 'hod')
+        self.assertEqual(circular.recipient_count, 1)
+        self.assertIn(circular.topic, topics_for_user(self.hod))
+        self.login(self.hod)
+        self.assertEqual([row['id'] for row in self.listing()], [circular.id])
+        self.login(self.teacher)
+        self.assertEqual(self.listing(), [])
+
+    def test_department_audience_matches_the_department_name(self):
+        circular = self.send('department', 'COMPUTER SCIENCE')
+
+        self.assertEqual(circular.recipient_count, 2)
+        self.assertIn(circular.topic, topics_for_user(self.teacher))
+        self.login(self.teacher)
+        self.assertEqual([row['id'] for row in self.listing()], [circular.id])
+        self.login(self.outsider)
+        self.assertEqual(self.listing(), [])
+
+    def test_one_topic_send_per_circular(self):
+        circular = self.send('school', str(self.school.id))
+
+        [message] = InMemoryBackend.outbox
+        self.assertEqual(message['topic'], circular.topic)
+        self.assertEqual(message['data'], {'kind': 'circular', 'circular_id': str(circular.id)})
+        circular.refresh_from_db()
+        self.assertTrue(circular.message_id)
+
+    def test_only_the_vc_office_sends_circulars(self):
+        self.login(self.teacher)
+
+        response = self.client.post(CIRCULARS_URL, {'title': 'Hi', 'body': 'There'}, format='json')
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_read_receipts(self):
+        circular = self.send('all')
+        self.login(self.teacher)
+        self.assertEqual(self.client.post(f'{CIRCULARS_URL}{circular.id}/read/').status_code, 201)
+        self.assertEqual(self.client.post(f'{CIRCULARS_URL}{circular.id}/read/').status_code, 200)
+
+        self.login(self.vc)
+        response = self.client.get(f'{CIRCULARS_URL}{circular.id}/receipts/')
+
+        self.assertEqual(response.data['read_count'], 1)
+        self.assertEqual(response.data['readers'][0]['faculty_id'], self.teacher.id)
@@ -0,0 +1,49 @@
+from datetime import date
+
+from authentication.tests.utils import APITestCase, make_faculty
+from facultyservices.models import EventsDetails
+
+BATCH_URL = '/api/facultyservices/events/batch/'
+
+
+def make_event(upload_by, name='Workshop'):
+    return EventsDetails.objects.create(
+        course='B.Tech', event_name=name, bodies='IEEE', event_type='Technical', event_sub_type='Workshop',
+        audience_type='Students', fromdate=date(2026, 1, 5), todate=date(2026, 1, 5),
+        event_description='Hands-on session', upload_by=upload_by,
+    )
+
+
+class EventsBatchTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.organizer = make_faculty(name='Asha Rao')
+        self.by_name = make_event('Asha Rao')
+        self.by_email = make_event(self.organizer.primary_email)
+        self.other = make_event('Someone Else')
+
+    def batch(self, *events):
+        response = self.client.get(BATCH_URL, {'ids': ','.join(str(event.id) for event in events)})
+        self.assertEqual(response.status_code, 200, response.data)
+        return [row['id'] for row in response.data['results']], response.data['missing']
+
+    def test_uploader_sees_only_their_events(self):
+        self.login(self.organizer)
+
+        self.assertEqual(
+            self.batch(self.other, self.by_email, self.by_name),
+            ([self.by_email.id, self.by_name.id], [self.other.id]),
+        )
+
+    def test_vc_office_sees_every_event(self):
+        self.login(make_faculty(emptype='VC_Office'))
+
+        self.assertEqual(
+            self.batch(self.other, self.by_name, self.by_email),
+            ([self.other.id, self.by_name.id, self.by_email.id], []),
+        )
+
+    def test_login_and_ids_are_required(self):
+        self.assertEqual(self.client.get(BATCH_URL, {'ids': '1'}).status_code, 401)
+        self.login(self.organizer)
+        self.assertEqual(self.client.get(BATCH_URL, {'ids': '1,,x'}).status_code, 400)
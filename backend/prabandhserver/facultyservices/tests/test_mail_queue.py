@@ -0,0 +1,278 @@
+import smtplib
+import socket
+import socketserver
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.db.models import QuerySet
+from django.test import override_settings
+from django.utils import timezone
+
+from authentication.tests.utils import APITestCase
+from facultyservices import mail_queue
+from facultyservices.mail_queue import RETRY_BASE_DELAY, queue_emails, send_queued_emails
+from facultyservices.models import QueuedEmail
+
+
+class FlakyBackend(EmailBackend):
+    """locmem backend that raises the given error for some recipients."""
+
+    def __init__(self, failing, error=smtplib.SMTPServerDisconnected, **kwargs):
+        super().__init__(**kwargs)
+        self.failing = failing
+        self.error = error
+
+    def send_messages(self, messages):
+        for message in messages:
+            recipient = message.to[0]
+            if recipient in self.failing and self.error is smtplib.SMTPRecipientsRefused:
+                raise self.error({recipient: (550, b'No such user')})
+            if recipient in self.failing:
+                raise self.error(recipient)
+        return super().send_messages(messages)
+
+
+@mock.patch.object(mail_queue.time, 'sleep')
+class MailQueueTests(APITestCase):
+    def send(self, **kwargs):
+        kwargs.setdefault('max_per_minute', 6000)
+        return send_queued_emails(**kwargs)
+
+    def test_queueing_only_inserts_rows(self, sleep):
+        queued = queue_emails(['a@example.edu', 'b@example.edu', 'a@example.edu', ''], 'Seminar', 'Room 101')
+
+        self.assertEqual(queued, 2)
+        self.assertEqual(QueuedEmail.objects.filter(status='pending').count(), 2)
+        self.assertEqual(mail.outbox, [])
+
+    @override_settings(EMAIL_QUEUE_IN_PROCESS=True)
+    def test_worker_starts_after_the_queueing_transaction_commits(self, sleep):
+        with mock.patch.object(mail_queue, 'start_background_worker') as start:
+            with self.captureOnCommitCallbacks() as callbacks:
+                queue_emails(['a@example.edu'], 'Seminar', 'Room 101')
+            start.assert_not_called()
+            for callback in callbacks:
+                callback()
+        start.assert_called_once_with()
+
+    def test_due_emails_are_sent_in_batches(self, sleep):
+        queue_emails([f'user{number}@example.edu' for number in range(5)], 'Seminar', 'Room 101')
+
+        result = self.send(batch_size=2)
+
+        self.assertEqual(result, {'sent': 5, 'failed': 0})
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(QueuedEmail.objects.filter(status='sent', sent_at__isnull=False).count(), 5)
+
+    def test_emails_not_yet_due_wait(self, sleep):
+        queue_emails(['a@example.edu'], 'Seminar', 'Room 101')
+        QueuedEmail.objects.update(next_attempt_at=timezone.now() + timedelta(minutes=5))
+
+        self.assertEqual(self.send(), {'sent': 0, 'failed': 0})
+
+    def test_failures_back_off_exponentially(self, sleep):
+        queue_emails(['a@example.edu', 'b@example.edu'], 'Seminar', 'Room 101')
+        connection = FlakyBackend(failing={'b@example.edu'})
+
+        self.assertEqual(self.send(connection=connection), {'sent': 1, 'failed': 1})
+        first = QueuedEmail.objects.get(to_email='b@example.edu')
+        self.assertEqual((first.status, first.attempts), ('pending', 1))
+        self.assertAlmostEqual(
+            (first.next_attempt_at - timezone.now()).total_seconds(), RETRY_BASE_DELAY.total_seconds(), delta=5
+        )
+
+        QueuedEmail.objects.filter(id=first.id).update(next_attempt_at=timezone.now())
+        self.send(connection=connection)
+        second = QueuedEmail.objects.get(id=first.id)
+        self.assertEqual(second.attempts, 2)
+        self.assertAlmostEqual(
+            (second.next_attempt_at - timezone.now()).total_seconds(), 2 * RETRY_BASE_DELAY.total_seconds(), delta=5
+        )
+        self.assertIn('b@example.edu', second.last_error)
+
+    def test_email_fails_after_max_attempts(self, sleep):
+        queue_emails(['b@example.edu'], 'Seminar', 'Room 101')
+        QueuedEmail.objects.update(attempts=2)
+
+        self.send(connection=FlakyBackend(failing={'b@example.edu'}), max_attempts=3)
+
+        email = QueuedEmail.objects.get()
+        self.assertEqual((email.status, email.attempts), ('failed', 3))
+
+    def test_refused_recipient_fails_at_once(self, sleep):
+        queue_emails(['b@example.edu'], 'Seminar', 'Room 101')
+
+        self.send(connection=FlakyBackend(failing={'b@example.edu'}, error=smtplib.SMTPRecipientsRefused))
+
+        self.assertEqual(QueuedEmail.objects.get().status, 'failed')
+
+    def test_sending_is_paced_to_the_rate_limit(self, sleep):
+        queue_emails([f'user{number}@example.edu' for number in range(3)], 'Seminar', 'Room 101')
+
+        send_queued_emails(max_per_minute=120)
+
+        self.assertEqual(sleep.call_count, 2)
+        for call in sleep.call_args_list:
+            self.assertGreater(call.args[0], 0.4)
+            self.assertLessEqual(call.args[0], 0.5)
+
+    def test_claimed_rows_are_not_claimed_again(self, sleep):
+        queue_emails(['a@example.edu', 'b@example.edu', 'c@example.edu'], 'Seminar', 'Room 101')
+
+        first = mail_queue._claim_batch(2)
+        second = mail_queue._claim_batch(2)
+
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 1)
+        self.assertFalse({email.id for email in first} & {email.id for email in second})
+        self.assertEqual(mail_queue._claim_batch(2), [])
+
+    def test_claim_skips_rows_leased_between_read_and_update(self, sleep):
+        queue_emails(['a@example.edu', 'b@example.edu'], 'Seminar', 'Room 101')
+        stolen = QueuedEmail.objects.order_by('id').first()
+        original_update = QuerySet.update
+        raced = []
+
+        def update_after_another_worker(queryset, **kwargs):
+            if not raced:
+                raced.append(stolen.id)
+                # Another worker leases the first row after this one read its candidates
+                QueuedEmail.objects.filter(id=stolen.id).update(
+                    next_attempt_at=timezone.now() + mail_queue.CLAIM_LEASE, claimed_by='other-worker'
+                )
+            return original_update(queryset, **kwargs)
+
+        with mock.patch.object(QuerySet, 'update', update_after_another_worker):
+            claimed = mail_queue._claim_batch(10)
+
+        self.assertEqual([email.to_email for email in claimed], ['b@example.edu'])
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """
+    Just enough SMTP for smtplib: refuses the server's `refused` recipients
+    with 550 and drops the connection on its `disconnect` recipients.
+    """
+
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self):
+        self.reply('220 localhost test SMTP server')
+        recipients = []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip()
+            verb = command[:4].upper()
+            if verb in ('EHLO', 'HELO'):
+                self.reply('250 localhost')
+            elif verb in ('MAIL', 'RSET'):
+                recipients = []
+                self.reply('250 OK')
+            elif verb == 'RCPT':
+                address = command.split(':', 1)[1].strip().strip('<>')
+                if address in self.server.disconnect:
+                    return
+                if address in self.server.refused:
+                    self.reply('550 No such user')
+                else:
+                    recipients.append(address)
+                    self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                data = []
+                for data_line in iter(self.rfile.readline, b''):
+                    if data_line in (b'.\r\n', b'.\n'):
+                        break
+                    data.append(data_line)
+                self.server.messages.append((recipients, b''.join(data)))
+                self.reply('250 OK')
+            elif verb == 'NOOP':
+                self.reply('250 OK')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+
+def unused_port():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+@mock.patch.object(mail_queue.time, 'sleep')
+class SMTPMailQueueTests(APITestCase):
+    """The queue against Django's SMTP backend and a local SMTP server."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), SMTPHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.addClassCleanup(cls.server.server_close)
+        cls.addClassCleanup(cls.server.shutdown)
+
+    def setUp(self):
+        super().setUp()
+        self.server.messages = []
+        self.server.refused = {'nobody@example.edu'}
+        self.server.disconnect = {'flaky@example.edu'}
+        smtp = override_settings(
+            EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+            EMAIL_HOST='127.0.0.1', EMAIL_PORT=self.server.server_address[1],
+            EMAIL_HOST_USER='', EMAIL_HOST_PASSWORD='', EMAIL_USE_TLS=False, EMAIL_USE_SSL=False,
+            EMAIL_TIMEOUT=5,
+        )
+        smtp.enable()
+        self.addCleanup(smtp.disable)
+
+    def send(self):
+        return send_queued_emails(max_per_minute=6000)
+
+    def test_emails_are_delivered(self, sleep):
+        queue_emails(['a@example.edu', 'b@example.edu'], 'Seminar', 'Room 101')
+
+        self.assertEqual(self.send(), {'sent': 2, 'failed': 0})
+        self.assertEqual([recipients for recipients, _ in self.server.messages], [['a@example.edu'], ['b@example.edu']])
+        self.assertIn(b'Subject: Seminar', self.server.messages[0][1])
+
+    def test_dropped_connection_is_retried_with_backoff_on_a_new_connection(self, sleep):
+        queue_emails(['flaky@example.edu', 'a@example.edu'], 'Seminar', 'Room 101')
+
+        self.assertEqual(self.send(), {'sent': 1, 'failed': 1})
+
+        flaky = QueuedEmail.objects.get(to_email='flaky@example.edu')
+        self.assertEqual((flaky.status, flaky.attempts), ('pending', 1))
+        self.assertGreater(flaky.next_attempt_at, timezone.now())
+        self.assertEqual([recipients for recipients, _ in self.server.messages], [['a@example.edu']])
+
+    def test_refused_recipient_fails_at_once(self, sleep):
+        queue_emails(['nobody@example.edu'], 'Seminar', 'Room 101')
+
+        self.send()
+
+        email = QueuedEmail.objects.get()
+        self.assertEqual(email.status, 'failed')
+        self.assertIn('No such user', email.last_error)
+
+    def test_refused_connection_is_retried(self, sleep):
+        queue_emails(['a@example.edu'], 'Seminar', 'Room 101')
+
+        with override_settings(EMAIL_PORT=unused_port()):
+            # Errors are raised, not swallowed by fail_silently, so nothing is marked sent
+            self.assertEqual(self.send(), {'sent': 0, 'failed': 1})
+
+        email = QueuedEmail.objects.get()
+        self.assertEqual((email.status, email.attempts), ('pending', 1))
+        self.assertTrue(email.last_error)
+
+        QueuedEmail.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(self.send(), {'sent': 1, 'failed': 0})
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import EventTypeListView, EventSubTypeListView, EventTypeSubtypeListView, delete_event_type, delete_event_subtype, EventsDetailsCreateView, EventsDetailsListView, VCEventsListView, VCEventApprovalView, VCOfficeDashboardView, VCEventDetailView, EventFileUploadView, test_send_email
+from .views import EventTypeListView, EventSubTypeListView, EventTypeSubtypeListView, delete_event_type, delete_event_subtype, EventsDetailsCreateView, EventsDetailsListView, EventsDetailsBatchView, VCEventsListView, VCEventApprovalView, VCOfficeDashboardView, VCEventDetailView, EventFileUploadView, test_send_email, CircularListCreateView, mark_circular_read, CircularReceiptsView
 
 urlpatterns = [
     path('event-types/', EventTypeListView.as_view(), name='event-type-list'),
@@ -9,10 +9,14 @@ urlpatterns = [
     path('event-subtypes/<int:event_subtype_id>/delete/', delete_event_subtype, name='delete-event-subtype'),
     path('events/', EventsDetailsCreateView.as_view(), name='events-details-create'),
     path('events/list/', EventsDetailsListView.as_view(), name='events-details-list'),
+    path('events/batch/', EventsDetailsBatchView.as_view(), name='events-details-batch'),
     path('vc/events/', VCEventsListView.as_view(), name='vc-events-list'),
     path('vc/events/<int:pk>/approve/', VCEventApprovalView.as_view(), name='vc-event-approve'),
     path('vc-office/dashboard/', VCOfficeDashboardView.as_view(), name='vc-office-dashboard'),
     path('vc/events/<int:pk>/', VCEventDetailView.as_view(), name='vc-event-detail'),
     path('events/<int:event_id>/upload-file/', EventFileUploadView.as_view(), name='event-upload-file'),
     path('test-send-email/', test_send_email, name='test-send-email'),
+    path('circulars/', CircularListCreateView.as_view(), name='circular-list-create'),
+    path('circulars/<int:circular_id>/read/', mark_circular_read, name='circular-mark-read'),
+    path('circulars/<int:circular_id>/receipts/', CircularReceiptsView.as_view(), name='circular-receipts'),
 ] 
\ No newline at end of file
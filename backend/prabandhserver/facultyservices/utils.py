@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.core.mail import send_mail
+from .mail_queue import queue_emails
 
 def send_event_notification_email(to_email, subject, message):
     try:
@@ -13,3 +14,10 @@ def send_event_notification_email(to_email, subject, message):
         print(f"✅ Email sent to {to_email}")
     except Exception as e:
         print(f"🚨 Email send failed: {e}")
+
+
+def queue_event_notification_emails(to_emails, subject, message):
+    """Queue the email for the background sender instead of sending inside the request."""
+    queued = queue_emails(to_emails, subject, message)
+    print(f"📨 Queued {queued} email(s): {subject}")
+    return queued
@@ -1,22 +1,27 @@
 from django.shortcuts import render
 from rest_framework import generics
-from .models import EventType, EventSubType, EventsDetails
-from .serializers import EventTypeSerializer, EventSubTypeSerializer, EventsDetailsSerializer
+from .models import EventType, EventSubType, EventsDetails, Circular, CircularReadReceipt
+from .serializers import EventTypeSerializer, EventSubTypeSerializer, EventsDetailsSerializer, CircularSerializer
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, Exists, OuterRef
+from django.shortcuts import get_object_or_404
 from rest_framework.generics import ListAPIView, UpdateAPIView, RetrieveAPIView
 from rest_framework.decorators import action
 from rest_framework_simplejwt.authentication import JWTAuthentication
-from rest_framework.parsers import MultiPartParser, FormParser
-from .utils import send_event_notification_email
+from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from .utils import send_event_notification_email, queue_event_notification_emails
+from authentication.batch import batch_response, parse_ids
 from authentication.models import Faculty
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from authentication.views import HRFacultyListView
+from notifications.sender import get_push_backend
+from notifications.topics import topic_for
 
 # Create your views here.
 
@@ -122,13 +127,12 @@ class EventsDetailsCreateView(generics.CreateAPIView):
             faculty_name = str(user)
         event = serializer.save(upload_by=faculty_name)
         # Notify VC and VC Office by email
-        vc_users = Faculty.objects.filter(emptype__in=['vc', 'vc_office'])
-        for vc in vc_users:
-            send_event_notification_email(
-                vc.primary_email,
-                f"New Event Submission: {event.event_name}",
-                f"A new event '{event.event_name}' has been submitted by {faculty_name}."
-            )
+        vc_emails = Faculty.objects.filter(emptype__in=['vc', 'vc_office']).values_list('primary_email', flat=True)
+        queue_event_notification_emails(
+            list(vc_emails),
+            f"New Event Submission: {event.event_name}",
+            f"A new event '{event.event_name}' has been submitted by {faculty_name}."
+        )
 
 class EventsDetailsListView(generics.ListAPIView):
     serializer_class = EventsDetailsSerializer
@@ -149,6 +153,25 @@ class EventsDetailsListView(generics.ListAPIView):
             models.Q(upload_by=email)
         ).order_by('-id')
 
+class EventsDetailsBatchView(APIView):
+    """
+    Several events in one request, ?ids=1,2,3, returned in that order. VC and
+    VC Office users see every event, others only the events they uploaded.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        ids = parse_ids(request.query_params.get('ids'))
+        user = request.user
+        queryset = EventsDetails.objects.all()
+        if getattr(user, 'emptype', '').lower() not in ['vc', 'vc_office', 'vcoffice']:
+            faculty_name = getattr(user, 'name', None) or str(user)
+            queryset = queryset.filter(
+                models.Q(upload_by=faculty_name) |
+                models.Q(upload_by=getattr(user, 'primary_email', None))
+            )
+        return batch_response(queryset, ids, EventsDetailsSerializer, {'request': request})
+
 class VCEventsListView(ListAPIView):
     serializer_class = EventsDetailsSerializer
     permission_classes = [IsAuthenticated]
@@ -174,8 +197,8 @@ class VCEventApprovalView(UpdateAPIView):
         if status_value == 'Approved':
             faculty = Faculty.objects.filter(name=event.upload_by).first()
             if faculty:
-                send_event_notification_email(
-                    faculty.primary_email,
+                queue_event_notification_emails(
+                    [faculty.primary_email],
                     f"Your event '{event.event_name}' has been approved by the Vice Chancellor.",
                     f"Congratulations! Your event '{event.event_name}' has been approved."
                 )
@@ -189,19 +212,22 @@ class VCOfficeDashboardView(APIView):
         user = request.user
         if getattr(user, 'emptype', '').lower() not in ["vc_office", "vcoffice"]:
             return Response({"detail": "Forbidden"}, status=403)
+        circulars = Circular.objects.filter(created_by=user).aggregate(
+            uploaded=Count('id'), notices_sent=models.Sum('recipient_count')
+        )
         return Response({
             "profile": {
                 "name": getattr(user, "name", "VC Office User"),
                 "id": getattr(user, "registration_no", "N/A"),
                 "position": "VC Office",
-                "department": getattr(user, "department", "N/A"),
+                "department": user.department.name if user.department_id else "N/A",
                 "since": "2022-01-01"
             },
             "stats": {
-                "notices_sent": 12,
+                "notices_sent": circulars['notices_sent'] or 0,
                 "pending_files": 4,
                 "faculty_reviewed": 8,
-                "circulars_uploaded": 5,
+                "circulars_uploaded": circulars['uploaded'],
                 "leave_requests": 2
             }
         })
@@ -227,16 +253,97 @@ class EventFileUploadView(APIView):
         if not file_type or not file:
             return Response({'detail': 'file_type and file are required.'}, status=status.HTTP_400_BAD_REQUEST)
         event = EventsDetails.objects.get(id=event_id)
-        allowed_fields = [
-            'proposal_file', 'vcapproval_file', 'creatives', 'attendance_file', 'report_file',
-            'geotagpics_file1', 'geotagpics_file2', 'geotagpics_file3', 'news_social_media', 'news_print_media'
-        ]
-        if file_type not in allowed_fields:
+        if file_type not in EventsDetails.UPLOADABLE_FILE_FIELDS:
             return Response({'detail': 'Invalid file_type.'}, status=status.HTTP_400_BAD_REQUEST)
         setattr(event, file_type, file)
         event.save()
         return Response({'detail': f'{file_type} uploaded successfully.'}, status=status.HTTP_200_OK)
 
+CIRCULAR_SENDER_TYPES = ['vc', 'vc_office', 'vcoffice']
+
+def _can_send_circulars(user):
+    return getattr(user, 'emptype', '').lower() in CIRCULAR_SENDER_TYPES
+
+class CircularListCreateView(generics.ListCreateAPIView):
+    """
+    GET lists the circulars addressed to the current user with is_read;
+    ?sent=true lists the circulars the user sent with read_count.
+    POST (VC / VC office) sends a circular with a single push to the audience's topic.
+    """
+    serializer_class = CircularSerializer
+    permission_classes = [IsAuthenticated]
+    parser_classes = (MultiPartParser, FormParser, JSONParser)
+
+    def get_queryset(self):
+        user = self.request.user
+        circulars = Circular.objects.select_related('created_by')
+        if self.request.query_params.get('sent', '').lower() in ['true', '1'] and _can_send_circulars(user):
+            return circulars.filter(created_by=user).annotate(read_count=Count('read_receipts'))
+        return circulars.filter(Circular.addressed_to(user)).annotate(
+            is_read=Exists(CircularReadReceipt.objects.filter(circular=OuterRef('pk'), faculty=user))
+        )
+
+    def create(self, request, *args, **kwargs):
+        if not _can_send_circulars(request.user):
+            return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+        return super().create(request, *args, **kwargs)
+
+    def perform_create(self, serializer):
+        audience_type = serializer.validated_data.get('audience_type', 'all')
+        audience_value = serializer.validated_data['audience_value']
+        circular = serializer.save(
+            created_by=self.request.user,
+            topic=topic_for(audience_type, audience_value or None),
+        )
+        circular.recipient_count = Faculty.objects.filter(is_active=True, **circular.audience_filter()).count()
+        circular.save(update_fields=['recipient_count'])
+        transaction.on_commit(lambda: _send_circular(circular))
+
+def _send_circular(circular):
+    # One request to FCM per circular, regardless of how many devices follow the topic
+    try:
+        message_id = get_push_backend().send_to_topic(
+            circular.topic,
+            circular.title,
+            circular.body[:200],
+            data={'kind': 'circular', 'circular_id': str(circular.id)},
+        )
+    except Exception as e:
+        print(f"Circular push failed: {e}")
+        return
+    Circular.objects.filter(id=circular.id).update(message_id=message_id or '')
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def mark_circular_read(request, circular_id):
+    circular = get_object_or_404(Circular.objects.filter(Circular.addressed_to(request.user)), id=circular_id)
+    receipt, created = CircularReadReceipt.objects.get_or_create(circular=circular, faculty=request.user)
+    return Response({"circular": circular.id, "read_at": receipt.read_at}, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+class CircularReceiptsView(APIView):
+    """Read receipts of a circular, for the VC office user who sent it."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, circular_id):
+        circular = get_object_or_404(Circular, id=circular_id)
+        if circular.created_by_id != request.user.id and not _can_send_circulars(request.user):
+            return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+        receipts = circular.read_receipts.select_related('faculty__department').order_by('-read_at')
+        return Response({
+            "circular": circular.id,
+            "recipient_count": circular.recipient_count,
+            "read_count": receipts.count(),
+            "readers": [
+                {
+                    "faculty_id": receipt.faculty_id,
+                    "name": receipt.faculty.name,
+                    "department": receipt.faculty.department.name if receipt.faculty.department_id else "",
+                    "read_at": receipt.read_at,
+                }
+                for receipt in receipts[:200]
+            ],
+        })
+
 @csrf_exempt
 def test_send_email(request):
     if request.method == 'POST':
@@ -0,0 +1,135 @@
+"""
+Department / school absence calendar.
+
+Approved leave ranges for the requested window are fetched with one query and
+turned into per-day absence counts with a sweep over start/end events. Each month is cached
+per scope (department or school) and dropped when an application of a faculty
+member in that scope is saved or deleted.
+"""
+import calendar
+from datetime import timedelta
+from urllib.parse import quote
+
+from django.core.cache import cache
+from django.utils.dateparse import parse_date
+
+from .models import LeaveApplication
+
+APPROVED_STATUSES = [
+    'approved',
+    'approved_by_hr',
+    'approved_by_hod',
+    'approved_by_dean',
+    'approved_by_vc',
+]
+
+ABSENCE_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def _cache_key(scope, value, year, month):
+    return f'leave_management:absence:{scope}:{quote(str(value))}:{year}-{month:02d}'
+
+
+def _month_starts(from_date, to_date):
+    current = from_date.replace(day=1)
+    while current <= to_date:
+        yield current
+        current = (current + timedelta(days=32)).replace(day=1)
+
+
+def _month_end(month_start):
+    return month_start.replace(day=calendar.monthrange(month_start.year, month_start.month)[1])
+
+
+def _fetch_ranges(scope, value, from_date, to_date):
+    applications = LeaveApplication.objects.filter(
+        status__in=APPROVED_STATUSES,
+        from_date__lte=to_date,
+        to_date__gte=from_date,
+    )
+    if scope == 'department':
+        applications = applications.filter(faculty__department_id=value)
+    else:
+        applications = applications.filter(faculty__school_id=value)
+
+    return list(applications.values(
+        'id', 'faculty_id', 'faculty__name', 'leave_type', 'from_date', 'to_date'
+    ))
+
+
+def _sweep_month(rows, month_start):
+    month_end = _month_end(month_start)
+
+    # Sweep: +1 event on the first absent day, -1 on the day after the last one
+    events = []
+    for row in rows:
+        if row['from_date'] > month_end or row['to_date'] < month_start:
+            continue
+        start = max(row['from_date'], month_start)
+        end = min(row['to_date'], month_end)
+        events.append(((start - month_start).days, 1, row))
+        events.append(((end - month_start).days + 1, -1, row))
+    events.sort(key=lambda event: (event[0], event[1]))
+
+    days = []
+    active = {}
+    event_index = 0
+    for offset in range((month_end - month_start).days + 1):
+        while event_index < len(events) and events[event_index][0] == offset:
+            _, delta, row = events[event_index]
+            if delta > 0:
+                active[row['id']] = row
+            else:
+                active.pop(row['id'], None)
+            event_index += 1
+        days.append({
+            'date': (month_start + timedelta(days=offset)).isoformat(),
+            'count': len({row['faculty_id'] for row in active.values()}),
+            'absent': [
+                {
+                    'faculty_id': row['faculty_id'],
+                    'name': row['faculty__name'],
+                    'leave_type': row['leave_type'],
+                    'application_id': row['id'],
+                }
+                for row in active.values()
+            ],
+        })
+    return days
+
+
+def get_absence_calendar(scope, value, from_date, to_date):
+    """Per-day absence counts and names for a department or school between two dates."""
+    month_starts = list(_month_starts(from_date, to_date))
+    keys = {month_start: _cache_key(scope, value, month_start.year, month_start.month) for month_start in month_starts}
+    cached = cache.get_many(list(keys.values()))
+
+    # Every month missing from the cache is rebuilt from a single range query
+    missing = [month_start for month_start in month_starts if keys[month_start] not in cached]
+    if missing:
+        rows = _fetch_ranges(scope, value, missing[0], _month_end(missing[-1]))
+        built = {keys[month_start]: _sweep_month(rows, month_start) for month_start in missing}
+        cache.set_many(built, ABSENCE_CACHE_TIMEOUT)
+        cached.update(built)
+
+    first, last = from_date.isoformat(), to_date.isoformat()
+    days = []
+    for month_start in month_starts:
+        days.extend(day for day in cached[keys[month_start]] if first <= day['date'] <= last)
+    return days
+
+
+def invalidate_absence_calendar(faculty, from_date, to_date):
+    """Drop the cached months an application touches for its faculty's department and school."""
+    if isinstance(from_date, str):
+        from_date = parse_date(from_date)
+    if isinstance(to_date, str):
+        to_date = parse_date(to_date)
+    keys = []
+    for month_start in _month_starts(from_date, to_date):
+        if faculty.department_id:
+            keys.append(_cache_key('department', faculty.department_id, month_start.year, month_start.month))
+        if faculty.school_id:
+            keys.append(_cache_key('school', faculty.school_id, month_start.year, month_start.month))
+    if keys:
+        cache.delete_many(keys)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import LeaveApplication, ClassAdjustment, LeaveBalance, FCMToken
+from .models import LeaveApplication, ClassAdjustment, LeaveBalance, FCMToken, Holiday, Notification
 
 class ClassAdjustmentInline(admin.TabularInline):
     model = ClassAdjustment
@@ -63,7 +63,21 @@ class LeaveBalanceAdmin(admin.ModelAdmin):
         return f"{obj.vacation_leave - obj.vacation_leave_used} / {obj.vacation_leave}"
     get_maternity_balance.short_description = 'Maternity Leave (Remaining/Total)'
 
+class HolidayAdmin(admin.ModelAdmin):
+    list_display = ('date', 'name', 'school')
+    list_filter = ('school',)
+    search_fields = ('name',)
+    date_hierarchy = 'date'
+
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ('recipient', 'kind', 'title', 'read_at', 'created_at')
+    list_filter = ('kind',)
+    search_fields = ('recipient__name', 'title')
+    raw_id_fields = ('recipient',)
+
 admin.site.register(LeaveApplication, LeaveApplicationAdmin)
 admin.site.register(ClassAdjustment)
 admin.site.register(LeaveBalance, LeaveBalanceAdmin)
-admin.site.register(FCMToken)
\ No newline at end of file
+admin.site.register(FCMToken)
+admin.site.register(Holiday, HolidayAdmin)
+admin.site.register(Notification, NotificationAdmin)
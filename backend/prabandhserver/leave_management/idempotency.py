@@ -0,0 +1,135 @@
+"""
+Idempotency-Key support for POST endpoints that deduct or restore leave balance.
+
+A client that retries a request with the same Idempotency-Key header gets the
+original response back instead of running the view (and the LeaveBalance
+update) a second time.
+"""
+import functools
+import hashlib
+import json
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+DEFAULT_IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+DEFAULT_IDEMPOTENCY_PROCESSING_LEASE = timedelta(seconds=60)
+
+
+def _request_fingerprint(request):
+    """Hash of the method, path and payload. Uploaded files contribute their name and size."""
+    data = request.data
+    if hasattr(data, 'lists'):
+        payload = {key: values for key, values in data.lists()}
+    else:
+        payload = data
+    for name, uploaded in getattr(request, 'FILES', {}).items():
+        payload = dict(payload)
+        payload[name] = [uploaded.name, uploaded.size]
+    raw = json.dumps([request.method, request.path, payload], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def _replay(record):
+    response = Response(json.loads(record.response_body) if record.response_body else None, status=record.response_status)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(view_method):
+    """
+    Decorator for view / viewset methods. Without an Idempotency-Key header the
+    view runs as usual. With one, the first completed response is stored for
+    IDEMPOTENCY_KEY_TTL and replayed for every retry with the same payload.
+    A key whose request never completed (the worker died mid-request) is
+    taken over by the next retry once IDEMPOTENCY_PROCESSING_LEASE has passed.
+    """
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key or not request.user.is_authenticated:
+            return view_method(self, request, *args, **kwargs)
+
+        logger = logging.getLogger('leave_management')
+        key = key[:255]
+        request_hash = _request_fingerprint(request)
+        now = timezone.now()
+
+        record = IdempotencyKey.objects.filter(user=request.user, key=key).first()
+        if record is not None and record.expires_at <= now:
+            record.delete()
+            record = None
+
+        ttl = getattr(settings, 'IDEMPOTENCY_KEY_TTL', DEFAULT_IDEMPOTENCY_KEY_TTL)
+        if record is None:
+            try:
+                with transaction.atomic():
+                    record = IdempotencyKey.objects.create(
+                        user=request.user,
+                        key=key,
+                        endpoint=request.path[:255],
+                        request_hash=request_hash,
+                        expires_at=now + ttl,
+                    )
+            except IntegrityError:
+                # A concurrent retry claimed the key first
+                record = IdempotencyKey.objects.filter(user=request.user, key=key).first()
+            else:
+                return _run_and_store(view_method, self, request, record, args, kwargs)
+
+        if record is None:
+            return view_method(self, request, *args, **kwargs)
+        if record.request_hash != request_hash:
+            return Response(
+                {'error': f'{IDEMPOTENCY_HEADER} has already been used for a different request.'},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+        if record.response_status is None:
+            lease = getattr(settings, 'IDEMPOTENCY_PROCESSING_LEASE', DEFAULT_IDEMPOTENCY_PROCESSING_LEASE)
+            if record.created_at <= now - lease:
+                # Take over the abandoned key; the conditional update lets only one retry win
+                reclaimed = IdempotencyKey.objects.filter(
+                    pk=record.pk, response_status__isnull=True, created_at=record.created_at
+                ).update(created_at=now, expires_at=now + ttl)
+                if reclaimed:
+                    logger.warning(f"Reclaimed unfinished idempotency key {key} of user {request.user.id}")
+                    record.created_at, record.expires_at = now, now + ttl
+                    return _run_and_store(view_method, self, request, record, args, kwargs)
+            return Response(
+                {'error': 'A request with this idempotency key is still being processed.'},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        logger.info(f"Replaying stored response for idempotency key {key} of user {request.user.id}")
+        return _replay(record)
+
+    return wrapper
+
+
+def _run_and_store(view_method, view, request, record, args, kwargs):
+    try:
+        response = view_method(view, request, *args, **kwargs)
+    except Exception:
+        record.delete()
+        raise
+
+    if response.status_code >= 500:
+        # Let the client retry server errors for real
+        record.delete()
+        return response
+
+    body = JSONRenderer().render(response.data).decode('utf-8') if response.data is not None else ''
+    record.response_status = response.status_code
+    record.response_body = body
+    record.response_hash = hashlib.sha256(body.encode('utf-8')).hexdigest()
+    record.save(update_fields=['response_status', 'response_body', 'response_hash'])
+    return response
@@ -0,0 +1,74 @@
+import heapq
+
+from django.core.management.base import BaseCommand
+from leave_management.models import LeaveApplication
+
+
+class Command(BaseCommand):
+    help = 'Find leave applications of the same faculty member whose date ranges overlap'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--faculty-id',
+            type=int,
+            help='Only audit the applications of this faculty member',
+        )
+        parser.add_argument(
+            '--include-inactive',
+            action='store_true',
+            help='Also consider rejected and cancelled applications',
+        )
+
+    def handle(self, *args, **options):
+        applications = LeaveApplication.objects.all()
+        if options['faculty_id']:
+            applications = applications.filter(faculty_id=options['faculty_id'])
+        if not options['include_inactive']:
+            applications = applications.exclude(status__in=LeaveApplication.INACTIVE_STATUSES)
+
+        rows = applications.order_by('faculty_id', 'from_date', 'to_date').values(
+            'id', 'faculty_id', 'faculty__name', 'leave_type', 'from_date', 'to_date', 'status'
+        )
+
+        overlaps = self.find_overlaps(rows)
+
+        if not overlaps:
+            self.stdout.write(self.style.SUCCESS('No overlapping leave applications found'))
+            return
+
+        self.stdout.write(f"\n=== Overlapping Leave Applications ({len(overlaps)} pairs) ===")
+        for first, second in overlaps:
+            self.stdout.write(
+                f"{first['faculty__name']} (ID: {first['faculty_id']}): "
+                f"#{first['id']} {first['leave_type']} {first['from_date']} to {first['to_date']} [{first['status']}] "
+                f"overlaps #{second['id']} {second['leave_type']} {second['from_date']} to {second['to_date']} [{second['status']}]"
+            )
+        self.stdout.write(self.style.WARNING(f'{len(overlaps)} overlapping pairs found'))
+
+    @staticmethod
+    def find_overlaps(rows):
+        """
+        Sort-and-sweep over rows ordered by (faculty_id, from_date).
+        Ranges that are still open when a new one starts are kept in a min-heap
+        keyed on to_date, so each row is pushed and popped once and only real
+        overlaps are compared.
+        """
+        overlaps = []
+        current_faculty = None
+        open_ranges = []
+
+        for row in rows:
+            if row['faculty_id'] != current_faculty:
+                current_faculty = row['faculty_id']
+                open_ranges = []
+
+            # Drop ranges that ended before this one starts
+            while open_ranges and open_ranges[0][0] < row['from_date']:
+                heapq.heappop(open_ranges)
+
+            for _, _, other in open_ranges:
+                overlaps.append((other, row))
+
+            heapq.heappush(open_ranges, (row['to_date'], row['id'], row))
+
+        return overlaps
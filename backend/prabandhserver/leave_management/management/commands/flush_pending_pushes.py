@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from notifications.coalesce import flush_pending_pushes, seconds_until_next_flush
+
+
+class Command(BaseCommand):
+    help = 'Send coalesced push notifications whose window has closed'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and flush each window as it closes',
+        )
+        parser.add_argument(
+            '--idle-interval',
+            type=int,
+            default=5,
+            help='Seconds to wait with --loop while nothing is pending',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            result = flush_pending_pushes()
+            if result['pushes'] or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Sent {result['messages']} messages for {result['pushes']} pending pushes"
+                ))
+            if not options['loop']:
+                break
+            wait = seconds_until_next_flush()
+            time.sleep(options['idle_interval'] if wait is None else min(wait, options['idle_interval']))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from notifications.topics import sync_all_topics
+
+
+class Command(BaseCommand):
+    help = 'Subscribe device tokens to the FCM topics of their school, department and role'
+
+    def handle(self, *args, **options):
+        changed = sync_all_topics()
+        self.stdout.write(self.style.SUCCESS(f'Updated topic subscriptions of {changed} tokens'))
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leave_management', '0002_fcmtoken'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='leaveapplication',
+            index=models.Index(fields=['faculty', 'from_date', 'to_date'], name='leave_faculty_dates_idx'),
+        ),
+    ]
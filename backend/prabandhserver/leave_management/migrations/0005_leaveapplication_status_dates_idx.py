@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leave_management', '0004_holiday'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='leaveapplication',
+            index=models.Index(fields=['status', 'from_date', 'to_date'], name='leave_status_dates_idx'),
+        ),
+    ]
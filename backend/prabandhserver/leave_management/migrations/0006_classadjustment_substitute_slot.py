@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:09
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('leave_management', '0005_leaveapplication_status_dates_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='classadjustment',
+            name='class_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='classadjustment',
+            name='concerned_faculty',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='class_substitutions', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='classadjustment',
+            name='slot',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='classadjustment',
+            name='concerned_teacher',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name='classadjustment',
+            index=models.Index(fields=['concerned_faculty', 'class_date', 'slot'], name='adjustment_teacher_slot_idx'),
+        ),
+    ]
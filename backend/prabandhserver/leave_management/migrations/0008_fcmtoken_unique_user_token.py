@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:14
+
+from django.db import migrations, models
+
+
+def remove_duplicate_tokens(apps, schema_editor):
+    FCMToken = apps.get_model('leave_management', 'FCMToken')
+    seen = set()
+    duplicates = []
+    for token in FCMToken.objects.order_by('-created_at', '-id').values('id', 'user_id', 'token'):
+        key = (token['user_id'], token['token'])
+        if key in seen:
+            duplicates.append(token['id'])
+        else:
+            seen.add(key)
+    FCMToken.objects.filter(id__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leave_management', '0007_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_tokens, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='fcmtoken',
+            constraint=models.UniqueConstraint(fields=('user', 'token'), name='unique_user_fcm_token'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:18
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0004_faculty_aadhar_number_faculty_blood_group_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('leave_management', '0008_fcmtoken_unique_user_token'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationUnreadCount',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='notification_unread_count', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('unread', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('general', 'General'), ('leave_submitted', 'Leave Submitted'), ('leave_forwarded', 'Leave Forwarded'), ('leave_recommended', 'Leave Recommended'), ('leave_approved', 'Leave Approved'), ('leave_rejected', 'Leave Rejected')], default='general', max_length=30)),
+                ('title', models.CharField(max_length=255)),
+                ('body', models.TextField(blank=True)),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('read_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('recipient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['recipient', 'read_at', 'created_at'], name='notification_inbox_idx')],
+            },
+        ),
+    ]
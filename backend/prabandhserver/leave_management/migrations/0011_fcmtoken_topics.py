@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leave_management', '0010_pendingpush'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fcmtoken',
+            name='topics',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
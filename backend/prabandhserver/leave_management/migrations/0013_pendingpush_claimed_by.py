@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leave_management', '0012_cache_table'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pendingpush',
+            name='claimed_by',
+            field=models.CharField(blank=True, max_length=32),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 16:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leave_management', '0013_pendingpush_claimed_by'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='kind',
+            field=models.CharField(choices=[('general', 'General'), ('leave_submitted', 'Leave Submitted'), ('leave_forwarded', 'Leave Forwarded'), ('leave_recommended', 'Leave Recommended'), ('leave_approved', 'Leave Approved'), ('leave_rejected', 'Leave Rejected'), ('account_approved', 'Account Approved')], default='general', max_length=30),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-19 16:18
+
+from django.db import migrations, models
+
+
+def remove_duplicate_holidays(apps, schema_editor):
+    Holiday = apps.get_model('leave_management', 'Holiday')
+    seen = set()
+    duplicates = []
+    for holiday in Holiday.objects.filter(school__isnull=True).order_by('id').values('id', 'date'):
+        if holiday['date'] in seen:
+            duplicates.append(holiday['id'])
+        else:
+            seen.add(holiday['date'])
+    Holiday.objects.filter(id__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leave_management', '0014_notification_kind_account_approved'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_holidays, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='holiday',
+            constraint=models.UniqueConstraint(condition=models.Q(('school__isnull', True)), fields=('date',), name='unique_holiday_date_without_school'),
+        ),
+    ]
@@ -1,6 +1,7 @@
-from django.db import models
+from django.db import models, transaction
 from authentication.models import Faculty
-from django.db.models.signals import post_save
+from deputy_registrar.models import School
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
 class LeaveApplication(models.Model):
@@ -52,8 +53,39 @@ class LeaveApplication(models.Model):
     updated_on = models.DateTimeField(auto_now=True)
     remarks = models.TextField(blank=True, null=True)
     
+    # Statuses that no longer hold the leave dates (or the deducted balance)
+    INACTIVE_STATUSES = [
+        'rejected',
+        'rejected_by_hr',
+        'rejected_by_hod',
+        'rejected_by_dean',
+        'rejected_by_vc',
+        'cancelled',
+    ]
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['faculty', 'from_date', 'to_date'], name='leave_faculty_dates_idx'),
+            models.Index(fields=['status', 'from_date', 'to_date'], name='leave_status_dates_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.faculty.name} - {self.leave_type} - {self.from_date} to {self.to_date}"
+    
+    @classmethod
+    def overlapping(cls, faculty, from_date, to_date, exclude_id=None):
+        """
+        Active applications of a faculty member whose date range intersects
+        from_date..to_date. Served by the (faculty, from_date, to_date) index.
+        """
+        queryset = cls.objects.filter(
+            faculty=faculty,
+            from_date__lte=to_date,
+            to_date__gte=from_date,
+        ).exclude(status__in=cls.INACTIVE_STATUSES)
+        if exclude_id is not None:
+            queryset = queryset.exclude(id=exclude_id)
+        return queryset
 
 class ClassAdjustment(models.Model):
     leave_application = models.ForeignKey(LeaveApplication, on_delete=models.CASCADE, related_name='class_adjustments')
@@ -62,7 +94,16 @@ class ClassAdjustment(models.Model):
     semester = models.CharField(max_length=50)
     subject = models.CharField(max_length=100)
     class_timing = models.CharField(max_length=50)
-    concerned_teacher = models.CharField(max_length=100)
+    concerned_teacher = models.CharField(max_length=100, blank=True)
+    # Structured substitute assignment, used to detect double-booked teachers
+    concerned_faculty = models.ForeignKey(Faculty, on_delete=models.SET_NULL, null=True, blank=True, related_name='class_substitutions')
+    class_date = models.DateField(null=True, blank=True)
+    slot = models.PositiveSmallIntegerField(null=True, blank=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['concerned_faculty', 'class_date', 'slot'], name='adjustment_teacher_slot_idx'),
+        ]
     
     def __str__(self):
         return f"{self.course} - {self.subject} - {self.class_timing}"
@@ -229,7 +270,152 @@ def create_faculty_leave_balance(sender, instance, created, **kwargs):
 
 # Note: The update_leave_balance_on_approval signal handler has been moved to views.py
 
+class IdempotencyKey(models.Model):
+    """
+    Stored response for a POST sent with an Idempotency-Key header, so that a
+    retried request is answered from here instead of running the view again.
+    A row without response_status is still being processed, since created_at;
+    after IDEMPOTENCY_PROCESSING_LEASE a retry may take it over.
+    """
+    user = models.ForeignKey(Faculty, on_delete=models.CASCADE, related_name='idempotency_keys')
+    key = models.CharField(max_length=255)
+    endpoint = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    response_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.TextField(blank=True)
+    response_hash = models.CharField(max_length=64, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='unique_idempotency_key_per_user'),
+        ]
+        indexes = [
+            models.Index(fields=['expires_at'], name='idempotency_expires_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.key} - {self.endpoint}"
+
 class FCMToken(models.Model):
+    """One row per device; a faculty member can be signed in on several devices."""
     user = models.ForeignKey(Faculty, on_delete=models.CASCADE)
     token = models.TextField(max_length=512)
-    created_at = models.DateTimeField(auto_now_add=True)
\ No newline at end of file
+    # FCM topics this token is subscribed to, see notifications.topics
+    topics = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'token'], name='unique_user_fcm_token'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.token[:20]}"
+
+class Notification(models.Model):
+    """
+    In-app copy of every push notification, so nothing is lost when FCM delivery fails.
+    Unread totals are kept in NotificationUnreadCount.
+    """
+    KIND_CHOICES = [
+        ('general', 'General'),
+        ('leave_submitted', 'Leave Submitted'),
+        ('leave_forwarded', 'Leave Forwarded'),
+        ('leave_recommended', 'Leave Recommended'),
+        ('leave_approved', 'Leave Approved'),
+        ('leave_rejected', 'Leave Rejected'),
+        ('account_approved', 'Account Approved'),
+    ]
+
+    recipient = models.ForeignKey(Faculty, on_delete=models.CASCADE, related_name='notifications')
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES, default='general')
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+    payload = models.JSONField(default=dict, blank=True)
+    read_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['recipient', 'read_at', 'created_at'], name='notification_inbox_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.recipient_id} - {self.title}"
+
+class PendingPush(models.Model):
+    """
+    Push waiting out the coalescing window of its recipient (PUSH_COALESCE_WINDOW).
+    notifications.coalesce merges all pending pushes of a recipient into one message.
+    """
+    recipient = models.ForeignKey(Faculty, on_delete=models.CASCADE, related_name='pending_pushes')
+    kind = models.CharField(max_length=30, default='general')
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+    data = models.JSONField(default=dict, blank=True)
+    # Token of the flusher sending this row, see notifications.coalesce._claim_due
+    claimed_by = models.CharField(max_length=32, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at'], name='pending_push_created_idx'),
+            models.Index(fields=['recipient', 'created_at'], name='pending_push_recipient_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.recipient_id} - {self.title}"
+
+class NotificationUnreadCount(models.Model):
+    """Unread notification total per user, updated together with the Notification rows."""
+    user = models.OneToOneField(Faculty, on_delete=models.CASCADE, primary_key=True, related_name='notification_unread_count')
+    unread = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id} - {self.unread}"
+
+class Holiday(models.Model):
+    """
+    Institutional holiday. A holiday without a school applies to every school.
+    Used by leave_management.working_days to count working days server-side.
+    """
+    date = models.DateField()
+    name = models.CharField(max_length=100)
+    school = models.ForeignKey(School, on_delete=models.CASCADE, null=True, blank=True, related_name='holidays')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['date']
+        unique_together = ('date', 'school')
+        constraints = [
+            # NULLs are distinct in unique_together, so university-wide holidays need their own constraint
+            models.UniqueConstraint(
+                fields=['date'], condition=models.Q(school__isnull=True), name='unique_holiday_date_without_school',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['date'], name='holiday_date_idx'),
+        ]
+
+    def __str__(self):
+        school_name = self.school.name if self.school else 'All Schools'
+        return f"{self.name} - {self.date} ({school_name})"
+
+# Drop the cached working-day arrays whenever the holiday calendar changes
+@receiver(post_save, sender=Holiday)
+@receiver(post_delete, sender=Holiday)
+def invalidate_working_day_cache(sender, instance, **kwargs):
+    from .working_days import bump_calendar_version
+    # After commit, so other processes rebuild from the committed calendar
+    transaction.on_commit(bump_calendar_version)
+
+# Keep the unread counter in step when an unread notification is deleted (e.g. from the admin)
+@receiver(post_delete, sender=Notification)
+def decrement_unread_count(sender, instance, **kwargs):
+    if instance.read_at is None:
+        NotificationUnreadCount.objects.filter(user_id=instance.recipient_id, unread__gt=0).update(
+            unread=models.F('unread') - 1
+        )
@@ -1,32 +1,217 @@
 from rest_framework import serializers
-from .models import LeaveApplication, ClassAdjustment, LeaveBalance
+from .models import LeaveApplication, ClassAdjustment, LeaveBalance, Notification
+from .working_days import count_working_days
+from authentication.models import Faculty
 from authentication.serializers import FacultySerializer
 
+class ClassAdjustmentListSerializer(serializers.ListSerializer):
+    """
+    Validates a whole list of class adjustments in one pass and writes it
+    with a constant number of queries, however many class slots there are.
+    """
+
+    def validate(self, attrs):
+        """
+        Reject substitute assignments that double-book a teacher, either within
+        the submitted list or against active applications, with one indexed lookup.
+        """
+        assignments = {}
+        errors = []
+        for index, item in enumerate(attrs):
+            teacher, class_date, slot = item.get('concerned_faculty'), item.get('class_date'), item.get('slot')
+            if teacher is None or class_date is None or slot is None:
+                continue
+            key = (teacher.id, class_date, slot)
+            if key in assignments:
+                errors.append(f'Row {index + 1}: {teacher.name} is already assigned to slot {slot} on {class_date} in this application.')
+            assignments[key] = index
+
+        if assignments:
+            teacher_ids = {key[0] for key in assignments}
+            dates = {key[1] for key in assignments}
+            slots = {key[2] for key in assignments}
+            booked = ClassAdjustment.objects.filter(
+                concerned_faculty_id__in=teacher_ids,
+                class_date__in=dates,
+                slot__in=slots,
+            ).exclude(leave_application__status__in=LeaveApplication.INACTIVE_STATUSES)
+
+            leave_application = getattr(self.parent, 'instance', None)
+            if leave_application is not None:
+                booked = booked.exclude(leave_application=leave_application)
+
+            for row in booked.values('concerned_faculty__name', 'concerned_faculty_id', 'class_date', 'slot', 'leave_application_id'):
+                index = assignments.get((row['concerned_faculty_id'], row['class_date'], row['slot']))
+                if index is not None:
+                    errors.append(
+                        f"Row {index + 1}: {row['concerned_faculty__name']} is already substituting slot {row['slot']} "
+                        f"on {row['class_date']} for leave application #{row['leave_application_id']}."
+                    )
+
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
+    def to_internal_value(self, data):
+        # Resolve every concerned_faculty id with one query instead of one per row
+        faculty_ids = set()
+        if isinstance(data, list):
+            for item in data:
+                if isinstance(item, dict) and str(item.get('concerned_faculty') or '').isdigit():
+                    faculty_ids.add(int(item['concerned_faculty']))
+        self._faculty_lookup = Faculty.objects.in_bulk(faculty_ids) if faculty_ids else {}
+        return super().to_internal_value(data)
+
+    def create(self, validated_data):
+        adjustments = []
+        for item in validated_data:
+            item = dict(item)
+            item.pop('id', None)
+            adjustments.append(ClassAdjustment(**item))
+        return ClassAdjustment.objects.bulk_create(adjustments)
+
+    def update(self, instance, validated_data):
+        """
+        Diff the submitted list against the existing rows of one leave application.
+        Rows matched by id are updated in place, unmatched ids are deleted and
+        rows without an id are inserted.
+        """
+        existing = {adjustment.id: adjustment for adjustment in instance}
+        to_create = []
+        to_update = []
+        update_fields = set()
+
+        for item in validated_data:
+            item = dict(item)
+            adjustment = existing.pop(item.pop('id', None), None)
+            if adjustment is None:
+                to_create.append(ClassAdjustment(**item))
+                continue
+            changed = False
+            for attr, value in item.items():
+                if attr != 'leave_application' and getattr(adjustment, attr) != value:
+                    setattr(adjustment, attr, value)
+                    update_fields.add(attr)
+                    changed = True
+            if changed:
+                to_update.append(adjustment)
+
+        if existing:
+            ClassAdjustment.objects.filter(id__in=list(existing)).delete()
+        if to_update:
+            ClassAdjustment.objects.bulk_update(to_update, sorted(update_fields))
+        created = ClassAdjustment.objects.bulk_create(to_create) if to_create else []
+        return to_update + created
+
+
+class SubstituteFacultyField(serializers.PrimaryKeyRelatedField):
+    """Primary key field that reuses the faculty prefetched by ClassAdjustmentListSerializer."""
+
+    def to_internal_value(self, data):
+        lookup = getattr(getattr(self.parent, 'parent', None), '_faculty_lookup', None)
+        if lookup is not None and str(data).isdigit() and int(data) in lookup:
+            return lookup[int(data)]
+        return super().to_internal_value(data)
+
+
 class ClassAdjustmentSerializer(serializers.ModelSerializer):
+    # Writable so that updates can match submitted rows against existing ones
+    id = serializers.IntegerField(required=False)
+    concerned_faculty = SubstituteFacultyField(queryset=Faculty.objects.all(), required=False, allow_null=True)
+
     class Meta:
         model = ClassAdjustment
-        fields = ['id', 'course', 'branch', 'semester', 'subject', 'class_timing', 'concerned_teacher']
+        fields = [
+            'id', 'course', 'branch', 'semester', 'subject', 'class_timing', 'concerned_teacher',
+            'concerned_faculty', 'class_date', 'slot'
+        ]
+        list_serializer_class = ClassAdjustmentListSerializer
+        extra_kwargs = {
+            'concerned_teacher': {'required': False, 'allow_blank': True},
+            'class_date': {'required': False, 'allow_null': True},
+            'slot': {'required': False, 'allow_null': True},
+        }
+
+    def validate(self, attrs):
+        teacher = attrs.get('concerned_faculty')
+        if teacher is not None and not attrs.get('concerned_teacher'):
+            attrs['concerned_teacher'] = teacher.name
+        if teacher is None and not attrs.get('concerned_teacher'):
+            raise serializers.ValidationError({'concerned_teacher': 'Either concerned_teacher or concerned_faculty is required.'})
+        return attrs
 
 class LeaveApplicationSerializer(serializers.ModelSerializer):
     faculty_details = FacultySerializer(source='faculty', read_only=True)
     class_adjustments = ClassAdjustmentSerializer(many=True, required=False)
+    is_half_day = serializers.BooleanField(write_only=True, required=False, default=False)
     
     class Meta:
         model = LeaveApplication
         fields = [
             'id', 'faculty', 'faculty_details', 'leave_type', 'from_date', 'to_date', 
-            'no_of_days', 'reason', 'contact_during_leave', 'address_during_leave', 
+            'no_of_days', 'is_half_day', 'reason', 'contact_during_leave', 'address_during_leave', 
             'forward_to', 'supporting_document', 'status', 'applied_on', 
             'updated_on', 'remarks', 'class_adjustments'
         ]
         read_only_fields = ['id', 'faculty_details', 'applied_on', 'updated_on', 'status']
+        extra_kwargs = {
+            # Computed server-side from the holiday calendar, see validate()
+            'no_of_days': {'required': False},
+        }
+    
+    def validate(self, attrs):
+        is_half_day = attrs.pop('is_half_day', False)
+        from_date = attrs.get('from_date', getattr(self.instance, 'from_date', None))
+        to_date = attrs.get('to_date', getattr(self.instance, 'to_date', None))
+        if from_date and to_date:
+            if to_date < from_date:
+                raise serializers.ValidationError({'to_date': 'To date cannot be before from date.'})
+            
+            # Applications are always filed for the requesting user (see LeaveApplicationViewSet.create)
+            if self.instance is not None:
+                faculty = self.instance.faculty
+            else:
+                request = self.context.get('request')
+                faculty = request.user if request is not None else attrs.get('faculty')
+            
+            # Never trust the client's day count: weekends and holidays are excluded here
+            if self.instance is None or 'from_date' in attrs or 'to_date' in attrs or 'no_of_days' in attrs:
+                no_of_days = count_working_days(
+                    from_date, to_date,
+                    school_id=getattr(faculty, 'school_id', None),
+                    half_day=is_half_day
+                )
+                if no_of_days <= 0:
+                    raise serializers.ValidationError(
+                        {'to_date': 'The selected dates do not include any working day.'}
+                    )
+                attrs['no_of_days'] = no_of_days
+            
+            overlapping = list(
+                LeaveApplication.overlapping(
+                    faculty, from_date, to_date,
+                    exclude_id=getattr(self.instance, 'id', None)
+                ).values('id', 'from_date', 'to_date', 'status')[:5]
+            )
+            if overlapping:
+                conflicts = ', '.join(
+                    f"#{row['id']} ({row['from_date']} to {row['to_date']}, {row['status']})"
+                    for row in overlapping
+                )
+                raise serializers.ValidationError(
+                    {'non_field_errors': [f'Leave dates overlap with existing application(s): {conflicts}']}
+                )
+        return attrs
     
     def create(self, validated_data):
         class_adjustments_data = validated_data.pop('class_adjustments', [])
         leave_application = LeaveApplication.objects.create(**validated_data)
         
-        for adjustment_data in class_adjustments_data:
-            ClassAdjustment.objects.create(leave_application=leave_application, **adjustment_data)
+        if class_adjustments_data:
+            self.fields['class_adjustments'].create([
+                {**adjustment_data, 'leave_application': leave_application}
+                for adjustment_data in class_adjustments_data
+            ])
         
         return leave_application
     
@@ -38,14 +223,15 @@ class LeaveApplicationSerializer(serializers.ModelSerializer):
             setattr(instance, attr, value)
         instance.save()
         
-        # Handle class adjustments
+        # Handle class adjustments: diff against existing rows instead of delete and reinsert
         if class_adjustments_data:
-            # Delete existing adjustments
-            instance.class_adjustments.all().delete()
-            
-            # Create new adjustments
-            for adjustment_data in class_adjustments_data:
-                ClassAdjustment.objects.create(leave_application=instance, **adjustment_data)
+            self.fields['class_adjustments'].update(
+                list(instance.class_adjustments.all()),
+                [
+                    {**adjustment_data, 'leave_application': instance}
+                    for adjustment_data in class_adjustments_data
+                ]
+            )
         
         return instance
 
@@ -87,4 +273,15 @@ class LeaveBalanceSerializer(serializers.ModelSerializer):
         return obj.hpl - obj.hpl_used
     
     def get_maternity_remaining(self, obj):
-        return obj.vacation_leave - obj.vacation_leave_used
\ No newline at end of file
+        return obj.vacation_leave - obj.vacation_leave_used
+
+class NotificationSerializer(serializers.ModelSerializer):
+    is_read = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Notification
+        fields = ['id', 'kind', 'title', 'body', 'payload', 'is_read', 'read_at', 'created_at']
+        read_only_fields = fields
+
+    def get_is_read(self, obj):
+        return obj.read_at is not None
@@ -0,0 +1,66 @@
+from datetime import timedelta
+
+from authentication.tests.utils import APITestCase, make_faculty, next_monday
+from deputy_registrar.models import Department, School
+
+from .utils import APPLICATIONS_URL, make_application
+
+ABSENCE_URL = f'{APPLICATIONS_URL}absence_calendar/'
+
+
+class AbsenceCalendarTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        school = School.objects.create(name='School of Engineering')
+        self.department = Department.objects.create(name='CSE', school=school)
+        self.faculty = make_faculty(department=self.department, school=school)
+        self.login(make_faculty(emptype='hr'))
+        self.monday = next_monday(weeks=2)
+
+    def calendar(self, from_date, to_date):
+        response = self.client.get(ABSENCE_URL, {
+            'department': self.department.id, 'from': str(from_date), 'to': str(to_date),
+        })
+        self.assertEqual(response.status_code, 200, response.data)
+        return {day['date']: day['count'] for day in response.data['days']}
+
+    def save(self, application, **fields):
+        for field, value in fields.items():
+            setattr(application, field, value)
+        with self.captureOnCommitCallbacks(execute=True):
+            application.save()
+
+    def test_counts_approved_leave_per_day(self):
+        make_application(self.faculty, self.monday, self.monday + timedelta(days=1), status='approved')
+        make_application(make_faculty(department=self.department), self.monday, status='approved')
+        make_application(make_faculty(department=self.department), self.monday, status='pending')
+
+        days = self.calendar(self.monday, self.monday + timedelta(days=2))
+        self.assertEqual(list(days.values()), [2, 1, 0])
+
+    def test_approval_invalidates_the_cached_month(self):
+        application = make_application(self.faculty, self.monday)
+        self.assertEqual(self.calendar(self.monday, self.monday)[str(self.monday)], 0)
+
+        self.save(application, status='approved')
+        self.assertEqual(self.calendar(self.monday, self.monday)[str(self.monday)], 1)
+
+    def test_moving_an_application_invalidates_the_old_months_too(self):
+        old_day = self.monday
+        new_day = self.monday + timedelta(days=63)
+        application = make_application(self.faculty, old_day, status='approved')
+        self.assertEqual(self.calendar(old_day, old_day)[str(old_day)], 1)
+        self.assertEqual(self.calendar(new_day, new_day)[str(new_day)], 0)
+
+        self.save(application, from_date=new_day, to_date=new_day)
+
+        self.assertEqual(self.calendar(old_day, old_day)[str(old_day)], 0)
+        self.assertEqual(self.calendar(new_day, new_day)[str(new_day)], 1)
+
+    def test_deleting_an_application_invalidates_its_months(self):
+        application = make_application(self.faculty, self.monday, status='approved')
+        self.assertEqual(self.calendar(self.monday, self.monday)[str(self.monday)], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            application.delete()
+        self.assertEqual(self.calendar(self.monday, self.monday)[str(self.monday)], 0)
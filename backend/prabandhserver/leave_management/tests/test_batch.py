@@ -0,0 +1,48 @@
+from authentication.tests.utils import APITestCase, make_faculty, next_monday
+
+from .utils import APPLICATIONS_URL, make_application
+
+BATCH_URL = f'{APPLICATIONS_URL}batch/'
+
+
+class LeaveApplicationBatchTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.hod = make_faculty(emptype='hod')
+        self.teacher = make_faculty()
+        monday = next_monday()
+        self.own = make_application(self.teacher, monday)
+        self.for_hod = make_application(make_faculty(), monday, status='pending', forward_to=str(self.hod.id))
+        self.elsewhere = make_application(make_faculty(), monday, status='pending')
+
+    def batch(self, user, *applications):
+        self.login(user)
+        response = self.client.get(BATCH_URL, {'ids': ','.join(str(application.id) for application in applications)})
+        self.assertEqual(response.status_code, 200, response.data)
+        return [row['id'] for row in response.data['results']], response.data['missing']
+
+    def test_faculty_see_only_their_own_applications(self):
+        self.assertEqual(
+            self.batch(self.teacher, self.for_hod, self.own, self.elsewhere),
+            ([self.own.id], [self.for_hod.id, self.elsewhere.id]),
+        )
+
+    def test_hod_sees_what_is_forwarded_to_them(self):
+        self.assertEqual(
+            self.batch(self.hod, self.elsewhere, self.for_hod, self.own),
+            ([self.for_hod.id], [self.elsewhere.id, self.own.id]),
+        )
+
+    def test_hr_sees_every_application_in_request_order(self):
+        hr = make_faculty(emptype='hr')
+
+        self.assertEqual(
+            self.batch(hr, self.elsewhere, self.own, self.for_hod),
+            ([self.elsewhere.id, self.own.id, self.for_hod.id], []),
+        )
+
+    def test_invalid_ids(self):
+        self.login(self.teacher)
+
+        self.assertEqual(self.client.get(BATCH_URL, {'ids': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get(BATCH_URL).status_code, 400)
@@ -0,0 +1,102 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from authentication.tests.utils import APITestCase, make_faculty, next_monday
+from leave_management.models import ClassAdjustment, LeaveApplication, LeaveBalance
+
+from .utils import APPLICATIONS_URL
+
+
+def adjustment(number, **fields):
+    return {
+        'course': 'B.Tech', 'branch': 'CSE', 'semester': '3', 'subject': f'Subject {number}',
+        'class_timing': f'{9 + number % 8}:00', 'concerned_teacher': f'Teacher {number}', **fields,
+    }
+
+
+class ClassAdjustmentCreateTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.faculty = self.login(make_faculty())
+        self.monday = next_monday()
+
+    def application(self, adjustments, weeks=0):
+        from_date = self.monday + timedelta(weeks=weeks)
+        return {
+            'faculty': self.faculty.id, 'leave_type': 'casual',
+            'from_date': str(from_date), 'to_date': str(from_date),
+            'reason': 'Conference', 'contact_during_leave': '9999999999', 'forward_to': 'hr',
+            'class_adjustments': adjustments,
+        }
+
+    def test_creates_every_adjustment(self):
+        response = self.client.post(APPLICATIONS_URL, self.application([adjustment(n) for n in range(3)]), format='json')
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(len(response.data['class_adjustments']), 3)
+        self.assertEqual(
+            sorted(ClassAdjustment.objects.values_list('subject', flat=True)),
+            ['Subject 0', 'Subject 1', 'Subject 2'],
+        )
+
+    def test_query_count_does_not_grow_with_adjustments(self):
+        # Warm the working-day calendar, so both measured requests take the same cache path
+        self.client.post(APPLICATIONS_URL, self.application([], weeks=2), format='json')
+        with CaptureQueriesContext(connection) as few:
+            self.client.post(APPLICATIONS_URL, self.application([adjustment(n) for n in range(2)]), format='json')
+        with CaptureQueriesContext(connection) as many:
+            self.client.post(APPLICATIONS_URL, self.application([adjustment(n) for n in range(20)], weeks=1), format='json')
+
+        self.assertEqual(ClassAdjustment.objects.count(), 22)
+        self.assertEqual(len(few), len(many))
+
+    def test_invalid_row_rejects_the_whole_application(self):
+        rows = [adjustment(0), adjustment(1, concerned_teacher='', subject='')]
+        response = self.client.post(APPLICATIONS_URL, self.application(rows), format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('class_adjustments', response.data)
+        self.assertFalse(LeaveApplication.objects.exists())
+        self.assertFalse(ClassAdjustment.objects.exists())
+        self.assertEqual(LeaveBalance.objects.get(faculty=self.faculty).casual_leave_used, 0)
+
+    def test_multipart_json_string(self):
+        data = self.application([])
+        data['class_adjustments'] = '[{"course": "MBA", "branch": "HR", "semester": "1", "subject": "Ethics",' \
+                                    ' "class_timing": "10:00", "concerned_teacher": "Teacher"}]'
+        response = self.client.post(APPLICATIONS_URL, data, format='multipart')
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(ClassAdjustment.objects.get().subject, 'Ethics')
+
+
+class ClassAdjustmentUpdateTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.faculty = self.login(make_faculty())
+        monday = next_monday()
+        self.application = LeaveApplication.objects.create(
+            faculty=self.faculty, leave_type='casual', from_date=monday, to_date=monday, no_of_days=1,
+            reason='Conference', contact_during_leave='9999999999', forward_to='hr',
+        )
+        self.kept, self.changed, self.dropped = ClassAdjustment.objects.bulk_create([
+            ClassAdjustment(leave_application=self.application, **adjustment(n)) for n in range(3)
+        ])
+
+    def test_update_diffs_against_existing_rows(self):
+        response = self.client.patch(f'{APPLICATIONS_URL}{self.application.id}/', {
+            'class_adjustments': [
+                {'id': self.kept.id, **adjustment(0)},
+                {'id': self.changed.id, **adjustment(1, subject='Renamed')},
+                adjustment(7),
+            ],
+        }, format='json')
+
+        self.assertEqual(response.status_code, 200, response.data)
+        rows = dict(ClassAdjustment.objects.filter(leave_application=self.application).values_list('id', 'subject'))
+        self.assertEqual(rows.pop(self.kept.id), 'Subject 0')
+        self.assertEqual(rows.pop(self.changed.id), 'Renamed')
+        self.assertNotIn(self.dropped.id, rows)
+        self.assertEqual(list(rows.values()), ['Subject 7'])
@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+from django.test import override_settings
+from django.utils import timezone
+
+from authentication.tests.utils import APITestCase, make_faculty
+from leave_management.models import FCMToken, Notification, PendingPush
+from notifications.backends import InMemoryBackend
+from notifications.coalesce import MAX_DIGEST_LINES, flush_pending_pushes
+from notifications.sender import send_push_to_users
+
+
+@override_settings(PUSH_COALESCE_WINDOW=15)
+class PushCoalescingTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.faculty = make_faculty()
+        self.colleague = make_faculty()
+        FCMToken.objects.create(user=self.faculty, token='phone')
+        FCMToken.objects.create(user=self.colleague, token='laptop')
+
+    def close_windows(self):
+        PendingPush.objects.update(created_at=timezone.now() - timedelta(seconds=30))
+
+    def test_pushes_are_held_but_the_inbox_is_written(self):
+        result = send_push_to_users([self.faculty, self.colleague], 'Leave approved', 'Enjoy')
+
+        self.assertEqual(result, {'queued': 2})
+        self.assertEqual(PendingPush.objects.count(), 2)
+        self.assertEqual(Notification.objects.count(), 2)
+        self.assertEqual(InMemoryBackend.outbox, [])
+
+    def test_open_windows_are_not_flushed(self):
+        send_push_to_users([self.faculty], 'Leave approved', 'Enjoy')
+
+        self.assertEqual(flush_pending_pushes(), {'pushes': 0, 'messages': 0})
+        self.assertEqual(PendingPush.objects.count(), 1)
+
+    def test_a_burst_becomes_one_digest_per_recipient(self):
+        for number in range(3):
+            send_push_to_users([self.faculty], f'Update {number}', 'Body', data={'leave_id': str(number)})
+        self.close_windows()
+
+        self.assertEqual(flush_pending_pushes(), {'pushes': 3, 'messages': 1})
+        [message] = InMemoryBackend.outbox
+        self.assertEqual(message['title'], 'You have 3 new notifications')
+        self.assertEqual(message['body'], 'Update 0\nUpdate 1\nUpdate 2')
+        self.assertEqual(message['data']['leave_id'], '2')
+        self.assertEqual(message['data']['count'], '3')
+        self.assertFalse(PendingPush.objects.exists())
+
+    def test_long_digests_keep_the_newest_lines(self):
+        for number in range(MAX_DIGEST_LINES + 2):
+            send_push_to_users([self.faculty], f'Update {number}', 'Body')
+        self.close_windows()
+
+        flush_pending_pushes()
+
+        lines = InMemoryBackend.outbox[0]['body'].split('\n')
+        self.assertEqual(lines[0], '...and 2 earlier updates')
+        self.assertEqual(lines[-1], f'Update {MAX_DIGEST_LINES + 1}')
+
+    def test_identical_messages_share_one_multicast(self):
+        send_push_to_users([self.faculty, self.colleague], 'Circular', 'Read it')
+        self.close_windows()
+
+        self.assertEqual(flush_pending_pushes(), {'pushes': 2, 'messages': 1})
+        self.assertCountEqual(InMemoryBackend.outbox[0]['tokens'], ['phone', 'laptop'])
+        self.assertEqual(InMemoryBackend.outbox[0]['title'], 'Circular')
+
+    def test_pushes_claimed_by_another_flusher_are_left_alone(self):
+        send_push_to_users([self.faculty], 'Leave approved', 'Enjoy')
+        self.close_windows()
+        PendingPush.objects.update(claimed_by='other-flusher')
+
+        self.assertEqual(flush_pending_pushes(), {'pushes': 0, 'messages': 0})
+        self.assertEqual(InMemoryBackend.outbox, [])
+        self.assertEqual(PendingPush.objects.count(), 1)
+
+    def test_coalesce_false_sends_at_once(self):
+        result = send_push_to_users([self.faculty], 'Urgent', 'Now', coalesce=False)
+
+        self.assertEqual(result['sent'], 1)
+        self.assertFalse(PendingPush.objects.exists())
@@ -0,0 +1,53 @@
+from authentication.tests.utils import APITestCase, make_faculty
+from leave_management.models import FCMToken
+from notifications.backends import InMemoryBackend
+from notifications.topics import topics_for_user
+
+SAVE_TOKEN_URL = '/api/save-fcm-token/'
+
+
+class SaveFCMTokenTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.faculty = make_faculty()
+
+    def save_token(self, body):
+        return self.client.post(SAVE_TOKEN_URL, body, format='json')
+
+    def test_token_is_registered_for_the_signed_in_user(self):
+        other = make_faculty()
+        self.login(self.faculty)
+
+        # An id in the body is ignored; the token always belongs to the caller
+        response = self.save_token({'token': 'phone', 'id': other.id})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(FCMToken.objects.values_list('user_id', 'token')), [(self.faculty.id, 'phone')])
+        for topic in topics_for_user(self.faculty):
+            self.assertIn('phone', InMemoryBackend.topic_subscriptions[topic])
+
+    def test_anonymous_callers_cannot_register_devices(self):
+        response = self.save_token({'token': 'phone', 'id': self.faculty.id})
+
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(FCMToken.objects.exists())
+
+    def test_token_is_required(self):
+        self.login(self.faculty)
+
+        for body in ({}, {'token': ''}, {'token': ['phone']}):
+            with self.subTest(body=body):
+                self.assertEqual(self.save_token(body).status_code, 400)
+        self.assertFalse(FCMToken.objects.exists())
+
+    def test_a_device_moves_to_whoever_signed_in_last(self):
+        FCMToken.objects.create(user=make_faculty(), token='shared-laptop')
+        FCMToken.objects.create(user=self.faculty, token='phone')
+        self.login(self.faculty)
+
+        self.save_token({'token': 'shared-laptop'})
+
+        self.assertEqual(
+            set(FCMToken.objects.values_list('user_id', 'token')),
+            {(self.faculty.id, 'phone'), (self.faculty.id, 'shared-laptop')},
+        )
@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from authentication.tests.utils import APITestCase, make_faculty, next_monday
+from leave_management.models import IdempotencyKey, LeaveApplication, LeaveBalance
+
+from .utils import APPLICATIONS_URL, application_payload
+
+
+class IdempotencyKeyTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.faculty = self.login(make_faculty())
+        self.payload = application_payload(self.faculty, next_monday())
+
+    def post(self, payload=None, key='retry-1'):
+        return self.client.post(APPLICATIONS_URL, payload or self.payload, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def casual_leave_used(self):
+        return LeaveBalance.objects.get(faculty=self.faculty).casual_leave_used
+
+    def test_retry_replays_the_stored_response(self):
+        first = self.post()
+        second = self.post()
+
+        self.assertEqual(first.status_code, 201, first.data)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(second.data['id'], first.data['id'])
+        self.assertEqual(LeaveApplication.objects.count(), 1)
+        self.assertEqual(self.casual_leave_used(), 1)
+
+    def test_key_reused_for_another_payload_is_rejected(self):
+        self.post()
+        response = self.post(application_payload(self.faculty, next_monday(weeks=2)))
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(LeaveApplication.objects.count(), 1)
+
+    def test_requests_without_a_key_are_not_deduplicated(self):
+        self.client.post(APPLICATIONS_URL, self.payload, format='json')
+        self.client.post(APPLICATIONS_URL, application_payload(self.faculty, next_monday(weeks=2)), format='json')
+
+        self.assertEqual(LeaveApplication.objects.count(), 2)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_request_in_progress_answers_conflict(self):
+        self.post()
+        IdempotencyKey.objects.update(response_status=None, created_at=timezone.now())
+
+        response = self.post()
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(LeaveApplication.objects.count(), 1)
+
+    def test_abandoned_request_is_reclaimed_after_the_lease(self):
+        # A worker that died mid-request: its transaction rolled back, the key stayed in progress
+        self.post()
+        LeaveApplication.objects.all().delete()
+        IdempotencyKey.objects.update(response_status=None, created_at=timezone.now() - timedelta(minutes=5))
+
+        response = self.post()
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(IdempotencyKey.objects.get().response_status, 201)
+        self.assertEqual(self.post()['Idempotent-Replayed'], 'true')
+        self.assertEqual(LeaveApplication.objects.count(), 1)
+
+    def test_expired_key_runs_the_view_again(self):
+        self.post()
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        response = self.post(application_payload(self.faculty, next_monday(weeks=2)))
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(LeaveApplication.objects.count(), 2)
@@ -0,0 +1,73 @@
+from authentication.tests.utils import APITestCase, make_faculty
+from leave_management.models import Notification, NotificationUnreadCount
+from notifications.inbox import create_notifications
+
+NOTIFICATIONS_URL = '/api/notifications/'
+
+
+class NotificationInboxTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.faculty = self.login(make_faculty())
+        self.notifications = [
+            create_notifications([self.faculty.id], f'Notice {number}', 'Body')[0] for number in range(5)
+        ]
+
+    def unread(self):
+        return self.client.get(f'{NOTIFICATIONS_URL}unread-count/').data['unread_count']
+
+    def test_list_pages_newest_first_with_a_cursor(self):
+        first = self.client.get(NOTIFICATIONS_URL, {'limit': 3})
+
+        self.assertEqual([row['title'] for row in first.data['results']], ['Notice 4', 'Notice 3', 'Notice 2'])
+        self.assertEqual(first.data['unread_count'], 5)
+
+        second = self.client.get(NOTIFICATIONS_URL, {'limit': 3, 'before': first.data['next_before']})
+
+        self.assertEqual([row['title'] for row in second.data['results']], ['Notice 1', 'Notice 0'])
+        self.assertIsNone(second.data['next_before'])
+
+    def test_cursor_must_be_one_of_the_users_notifications(self):
+        other = create_notifications([make_faculty().id], 'Private', 'Body')[0]
+
+        self.assertEqual(self.client.get(NOTIFICATIONS_URL, {'before': other.id}).status_code, 400)
+        self.assertEqual(self.client.get(NOTIFICATIONS_URL, {'before': 'abc'}).status_code, 400)
+
+    def test_marking_read_updates_the_counter_once(self):
+        ids = [self.notifications[0].id, self.notifications[1].id]
+
+        first = self.client.post(f'{NOTIFICATIONS_URL}mark-read/', {'ids': ids}, format='json')
+        again = self.client.post(f'{NOTIFICATIONS_URL}mark-read/', {'ids': ids}, format='json')
+
+        self.assertEqual((first.data['marked'], first.data['unread_count']), (2, 3))
+        self.assertEqual((again.data['marked'], again.data['unread_count']), (0, 3))
+        unread = self.client.get(NOTIFICATIONS_URL, {'unread': 'true'}).data['results']
+        self.assertEqual(len(unread), 3)
+
+    def test_mark_all_read(self):
+        response = self.client.post(f'{NOTIFICATIONS_URL}mark-read/', {'all': True}, format='json')
+
+        self.assertEqual(response.data, {'marked': 5, 'unread_count': 0})
+
+    def test_mark_read_needs_ids_or_all(self):
+        response = self.client.post(f'{NOTIFICATIONS_URL}mark-read/', {'ids': 'x'}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_other_users_notifications_cannot_be_marked(self):
+        other = create_notifications([make_faculty().id], 'Private', 'Body')[0]
+
+        response = self.client.post(f'{NOTIFICATIONS_URL}mark-read/', {'ids': [other.id]}, format='json')
+
+        self.assertEqual(response.data['marked'], 0)
+        self.assertIsNone(Notification.objects.get(id=other.id).read_at)
+
+    def test_deleting_an_unread_notification_decrements_the_counter(self):
+        self.notifications[0].delete()
+
+        self.assertEqual(self.unread(), 4)
+        self.assertEqual(NotificationUnreadCount.objects.get(user=self.faculty).unread, 4)
+
+    def test_unread_count_is_one_query(self):
+        with self.assertNumQueries(1):
+            self.client.get(f'{NOTIFICATIONS_URL}unread-count/')
@@ -0,0 +1,85 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+
+from authentication.tests.utils import APITestCase, make_faculty, next_monday
+from leave_management.models import LeaveApplication
+
+from .utils import APPLICATIONS_URL, application_payload, make_application
+
+
+class OverlappingLeaveTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.faculty = self.login(make_faculty())
+        self.monday = next_monday()
+        self.existing = make_application(self.faculty, self.monday, self.monday + timedelta(days=2))
+
+    def post(self, from_date, to_date):
+        return self.client.post(APPLICATIONS_URL, application_payload(self.faculty, from_date, to_date), format='json')
+
+    def test_overlapping_range_is_rejected(self):
+        response = self.post(self.monday + timedelta(days=2), self.monday + timedelta(days=4))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(f'#{self.existing.id}', str(response.data['non_field_errors']))
+        self.assertEqual(LeaveApplication.objects.count(), 1)
+
+    def test_enclosing_range_is_rejected(self):
+        response = self.post(self.monday - timedelta(days=7), self.monday + timedelta(days=4))
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_adjacent_range_is_accepted(self):
+        response = self.post(self.monday + timedelta(days=3), self.monday + timedelta(days=4))
+
+        self.assertEqual(response.status_code, 201, response.data)
+
+    def test_inactive_applications_do_not_block(self):
+        for status in LeaveApplication.INACTIVE_STATUSES:
+            LeaveApplication.objects.filter(id=self.existing.id).update(status=status)
+            self.assertFalse(LeaveApplication.overlapping(self.faculty, self.monday, self.monday).exists(), status)
+
+        response = self.post(self.monday, self.monday)
+
+        self.assertEqual(response.status_code, 201, response.data)
+
+    def test_other_faculty_do_not_block(self):
+        colleague = self.login(make_faculty())
+        response = self.client.post(APPLICATIONS_URL, application_payload(colleague, self.monday), format='json')
+
+        self.assertEqual(response.status_code, 201, response.data)
+
+    def test_update_ignores_the_application_itself(self):
+        self.assertFalse(
+            LeaveApplication.overlapping(self.faculty, self.monday, self.monday, exclude_id=self.existing.id).exists()
+        )
+
+
+class AuditLeaveOverlapsCommandTests(APITestCase):
+    def test_reports_each_overlapping_pair(self):
+        faculty = make_faculty(name='Asha Rao')
+        monday = next_monday()
+        first = make_application(faculty, monday, monday + timedelta(days=3))
+        second = make_application(faculty, monday + timedelta(days=1), monday + timedelta(days=1))
+        make_application(faculty, monday + timedelta(days=7))
+        make_application(faculty, monday, status='rejected')
+
+        out = StringIO()
+        call_command('audit_leave_overlaps', stdout=out)
+
+        self.assertIn('1 overlapping pairs found', out.getvalue())
+        self.assertIn(f'#{first.id}', out.getvalue())
+        self.assertIn(f'overlaps #{second.id}', out.getvalue())
+
+    def test_no_overlaps(self):
+        faculty = make_faculty()
+        monday = next_monday()
+        make_application(faculty, monday)
+        make_application(faculty, monday + timedelta(days=1))
+
+        out = StringIO()
+        call_command('audit_leave_overlaps', stdout=out)
+
+        self.assertIn('No overlapping leave applications found', out.getvalue())
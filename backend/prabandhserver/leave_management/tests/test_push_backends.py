@@ -0,0 +1,70 @@
+import json
+import os
+import shutil
+import tempfile
+
+from django.test import override_settings
+
+from authentication.tests.utils import APITestCase, make_faculty
+from leave_management.models import FCMToken
+from notifications import sender
+from notifications.backends import FileSpoolBackend, FirebaseBackend, InMemoryBackend
+from notifications.fake_messaging import FakeMessaging
+
+
+class PushBackendSettingTests(APITestCase):
+    def test_backend_is_created_from_the_setting_on_first_use(self):
+        sender.set_push_backend(None)
+
+        with override_settings(PUSH_NOTIFICATION_BACKEND='notifications.backends.ConsoleBackend'):
+            backend = sender.get_push_backend()
+
+        self.assertEqual(type(backend).__name__, 'ConsoleBackend')
+        self.assertIs(sender.get_push_backend(), backend)
+
+    def test_set_push_backend_returns_the_previous_one(self):
+        current = sender.get_push_backend()
+        replacement = InMemoryBackend()
+
+        self.assertIs(sender.set_push_backend(replacement), current)
+        self.assertIs(sender.get_push_backend(), replacement)
+
+
+class FirebaseBackendTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.messaging = FakeMessaging(unregistered_tokens={'uninstalled'}, invalid_tokens={'garbled'})
+        sender.set_push_backend(FirebaseBackend(messaging=self.messaging))
+        faculty = make_faculty()
+        FCMToken.objects.bulk_create([
+            FCMToken(user=faculty, token=token) for token in ['phone', 'uninstalled', 'garbled']
+        ])
+        self.faculty = faculty
+
+    def test_multicast_reports_and_prunes_stale_tokens(self):
+        result = sender.deliver_push([self.faculty.id], 'Leave approved', 'Enjoy', data={'kind': 'general'})
+
+        self.assertEqual(result, {'sent': 1, 'failed': 2, 'pruned': 2})
+        self.assertCountEqual(self.messaging.delivered_tokens, ['phone', 'uninstalled', 'garbled'])
+        self.assertEqual(list(FCMToken.objects.values_list('token', flat=True)), ['phone'])
+
+    def test_message_carries_title_body_and_data(self):
+        sender.deliver_push([self.faculty.id], 'Leave approved', 'Enjoy', data={'kind': 'leave_approved'})
+
+        message = self.messaging.sent[0]
+        self.assertEqual((message.notification.title, message.notification.body), ('Leave approved', 'Enjoy'))
+        self.assertEqual(message.data, {'kind': 'leave_approved'})
+
+
+class FileSpoolBackendTests(APITestCase):
+    def test_each_message_is_spooled_as_json(self):
+        spool_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, spool_dir, ignore_errors=True)
+        backend = FileSpoolBackend(spool_dir=spool_dir)
+
+        results = backend.send_multicast(['phone', 'tablet'], 'Circular', 'Read it', data={'kind': 'general'})
+
+        self.assertTrue(all(result.success for result in results))
+        [filename] = os.listdir(spool_dir)
+        with open(os.path.join(spool_dir, filename)) as spool_file:
+            self.assertEqual(json.load(spool_file)['tokens'], ['phone', 'tablet'])
@@ -0,0 +1,74 @@
+from authentication.tests.utils import APITestCase, make_faculty
+from leave_management.models import FCMToken, Notification, NotificationUnreadCount
+from notifications.backends import InMemoryBackend
+from notifications.sender import MAX_MULTICAST_TOKENS, deliver_push, send_push_to_users, set_push_backend
+
+
+class BrokenBackend(InMemoryBackend):
+    def send_multicast(self, tokens, title, body, data=None):
+        raise ConnectionError('FCM unreachable')
+
+
+class PushDeliveryTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.faculty = make_faculty()
+        FCMToken.objects.bulk_create([
+            FCMToken(user=self.faculty, token='phone'),
+            FCMToken(user=self.faculty, token='tablet'),
+        ])
+
+    def test_every_device_is_pushed_and_the_inbox_written(self):
+        colleague = make_faculty()
+        FCMToken.objects.create(user=colleague, token='laptop')
+
+        result = send_push_to_users([self.faculty, colleague.id], 'Leave approved', 'Enjoy', kind='leave_approved')
+
+        self.assertEqual(result, {'sent': 3, 'failed': 0, 'pruned': 0})
+        self.assertEqual(len(InMemoryBackend.outbox), 1)
+        message = InMemoryBackend.outbox[0]
+        self.assertCountEqual(message['tokens'], ['phone', 'tablet', 'laptop'])
+        self.assertEqual(message['data'], {'kind': 'leave_approved'})
+        self.assertEqual(Notification.objects.filter(kind='leave_approved').count(), 2)
+        self.assertEqual(NotificationUnreadCount.objects.get(user=self.faculty).unread, 1)
+
+    def test_payload_values_are_sent_as_strings(self):
+        send_push_to_users([self.faculty], 'Event', 'Tomorrow', payload={'event_id': 7})
+
+        self.assertEqual(InMemoryBackend.outbox[0]['data'], {'event_id': '7', 'kind': 'general'})
+        self.assertEqual(Notification.objects.get().payload, {'event_id': 7})
+
+    def test_tokens_go_out_in_batches_of_the_multicast_limit(self):
+        FCMToken.objects.bulk_create([
+            FCMToken(user=self.faculty, token=f'device-{number}') for number in range(MAX_MULTICAST_TOKENS)
+        ])
+
+        result = deliver_push([self.faculty.id], 'Circular', 'Read it')
+
+        self.assertEqual(result['sent'], MAX_MULTICAST_TOKENS + 2)
+        self.assertEqual([len(message['tokens']) for message in InMemoryBackend.outbox], [MAX_MULTICAST_TOKENS, 2])
+
+    def test_unregistered_tokens_are_pruned(self):
+        InMemoryBackend.unregistered_tokens = {'tablet'}
+
+        result = deliver_push([self.faculty.id], 'Circular', 'Read it')
+
+        self.assertEqual(result, {'sent': 1, 'failed': 1, 'pruned': 1})
+        self.assertEqual(list(FCMToken.objects.values_list('token', flat=True)), ['phone'])
+
+    def test_backend_errors_count_as_failures_and_keep_tokens(self):
+        set_push_backend(BrokenBackend())
+
+        result = deliver_push([self.faculty.id], 'Circular', 'Read it')
+
+        self.assertEqual(result, {'sent': 0, 'failed': 2, 'pruned': 0})
+        self.assertEqual(FCMToken.objects.count(), 2)
+
+    def test_users_without_devices_still_get_the_inbox_entry(self):
+        lonely = make_faculty()
+
+        result = send_push_to_users([lonely], 'Hello', 'World')
+
+        self.assertEqual(result, {'sent': 0, 'failed': 0, 'pruned': 0})
+        self.assertEqual(InMemoryBackend.outbox, [])
+        self.assertTrue(Notification.objects.filter(recipient=lonely).exists())
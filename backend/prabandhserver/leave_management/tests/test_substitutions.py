@@ -0,0 +1,84 @@
+from authentication.tests.utils import APITestCase, make_faculty, next_monday
+from leave_management.models import ClassAdjustment, LeaveApplication
+
+from .utils import APPLICATIONS_URL, application_payload, make_application
+
+
+def assignment(teacher, class_date, slot, **fields):
+    return {
+        'course': 'B.Tech', 'branch': 'CSE', 'semester': '3', 'subject': 'Algorithms',
+        'class_timing': f'Slot {slot}', 'concerned_faculty': teacher.id,
+        'class_date': str(class_date), 'slot': slot, **fields,
+    }
+
+
+class DoubleBookingTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.faculty = self.login(make_faculty())
+        self.teacher = make_faculty(name='Substitute')
+        self.monday = next_monday()
+
+    def apply(self, adjustments):
+        return self.client.post(
+            APPLICATIONS_URL, application_payload(self.faculty, self.monday, class_adjustments=adjustments), format='json'
+        )
+
+    def book(self, slot, status='pending'):
+        application = make_application(make_faculty(), self.monday, status=status)
+        return ClassAdjustment.objects.create(
+            leave_application=application, concerned_faculty=self.teacher, class_date=self.monday, slot=slot,
+            course='B.Tech', branch='CSE', semester='3', subject='Compilers', class_timing=f'Slot {slot}',
+        )
+
+    def test_teacher_name_is_filled_from_the_linked_faculty(self):
+        response = self.apply([assignment(self.teacher, self.monday, 1)])
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(ClassAdjustment.objects.get().concerned_teacher, 'Substitute')
+
+    def test_same_slot_twice_in_one_application_is_rejected(self):
+        response = self.apply([assignment(self.teacher, self.monday, 1), assignment(self.teacher, self.monday, 1)])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(LeaveApplication.objects.exists())
+
+    def test_slot_covered_for_another_application_is_rejected(self):
+        self.book(slot=2)
+
+        response = self.apply([assignment(self.teacher, self.monday, 2)])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('already substituting slot 2', str(response.data))
+
+    def test_other_slots_and_inactive_applications_do_not_conflict(self):
+        self.book(slot=2)
+        self.book(slot=3, status='rejected_by_hr')
+
+        response = self.apply([assignment(self.teacher, self.monday, 1), assignment(self.teacher, self.monday, 3)])
+
+        self.assertEqual(response.status_code, 201, response.data)
+
+    def test_update_does_not_conflict_with_its_own_rows(self):
+        response = self.apply([assignment(self.teacher, self.monday, 1)])
+        application_id = response.data['id']
+        row = ClassAdjustment.objects.get(leave_application_id=application_id)
+
+        response = self.client.patch(f'{APPLICATIONS_URL}{application_id}/', {
+            'class_adjustments': [{'id': row.id, **assignment(self.teacher, self.monday, 1, subject='Networks')}],
+        }, format='json')
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(ClassAdjustment.objects.get(id=row.id).subject, 'Networks')
+
+    def test_teacher_lists_their_upcoming_substitutions(self):
+        self.book(slot=4)
+        self.book(slot=2)
+        self.book(slot=5, status='cancelled')
+
+        self.login(self.teacher)
+        response = self.client.get(f'{APPLICATIONS_URL}substitutions/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual([row['slot'] for row in response.data['substitutions']], [2, 4])
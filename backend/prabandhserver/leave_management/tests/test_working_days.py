@@ -0,0 +1,105 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.test import override_settings
+
+from authentication.tests.utils import APITestCase, make_faculty, next_monday
+from deputy_registrar.models import School
+from leave_management.models import Holiday, LeaveApplication, LeaveBalance
+from leave_management.working_days import count_working_days, is_working_day
+
+from .utils import APPLICATIONS_URL, application_payload
+
+
+@override_settings(LEAVE_WEEKEND_DAYS=[6])
+class CountWorkingDaysTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.monday = next_monday()
+        self.school = School.objects.create(name='School of Engineering')
+
+    def test_sundays_are_skipped(self):
+        self.assertEqual(count_working_days(self.monday, self.monday + timedelta(days=6)), Decimal('6'))
+        self.assertEqual(count_working_days(self.monday, self.monday + timedelta(days=13)), Decimal('12'))
+
+    def test_range_ending_before_it_starts_is_empty(self):
+        self.assertEqual(count_working_days(self.monday, self.monday - timedelta(days=1)), Decimal('0'))
+
+    def test_global_holidays_apply_to_every_school(self):
+        self.capture_holiday(date=self.monday + timedelta(days=1), name='Founders Day')
+
+        self.assertEqual(count_working_days(self.monday, self.monday + timedelta(days=2)), Decimal('2'))
+        self.assertEqual(
+            count_working_days(self.monday, self.monday + timedelta(days=2), school_id=self.school.id), Decimal('2')
+        )
+
+    def test_school_holidays_only_apply_to_that_school(self):
+        self.capture_holiday(date=self.monday, name='School Day', school=self.school)
+
+        self.assertEqual(count_working_days(self.monday, self.monday), Decimal('1'))
+        self.assertEqual(count_working_days(self.monday, self.monday, school_id=self.school.id), Decimal('0'))
+
+    def test_half_day_counts_the_first_day_as_half(self):
+        self.assertEqual(count_working_days(self.monday, self.monday + timedelta(days=1), half_day=True), Decimal('1.5'))
+        sunday = self.monday - timedelta(days=1)
+        self.assertEqual(count_working_days(sunday, self.monday, half_day=True), Decimal('1'))
+
+    def test_range_across_new_year(self):
+        year = date.today().year + 1
+        # Dec 28 .. Jan 3: seven days minus the Sunday among them
+        self.assertEqual(count_working_days(date(year, 12, 28), date(year + 1, 1, 3)), Decimal('6'))
+
+    def test_holiday_changes_invalidate_cached_arrays(self):
+        self.assertTrue(is_working_day(self.monday))
+
+        holiday = self.capture_holiday(date=self.monday, name='Strike')
+        self.assertFalse(is_working_day(self.monday))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            holiday.delete()
+        self.assertTrue(is_working_day(self.monday))
+
+    def test_one_university_wide_holiday_per_date(self):
+        self.capture_holiday(date=self.monday, name='Founders Day')
+        self.capture_holiday(date=self.monday, name='School Day', school=self.school)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Holiday.objects.create(date=self.monday, name='Founders Day again')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Holiday.objects.create(date=self.monday, name='School Day again', school=self.school)
+
+    def capture_holiday(self, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Holiday.objects.create(**fields)
+
+
+class ServerSideDayCountTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.faculty = self.login(make_faculty())
+        self.monday = next_monday()
+
+    def test_client_day_count_is_ignored(self):
+        payload = application_payload(self.faculty, self.monday, self.monday + timedelta(days=7), no_of_days=1)
+        response = self.client.post(APPLICATIONS_URL, payload, format='json')
+
+        self.assertEqual(response.status_code, 201, response.data)
+        # Monday to the next Monday, less the Sunday
+        self.assertEqual(Decimal(response.data['no_of_days']), Decimal('7'))
+        self.assertEqual(LeaveBalance.objects.get(faculty=self.faculty).casual_leave_used, Decimal('7'))
+
+    def test_half_day(self):
+        payload = application_payload(self.faculty, self.monday, is_half_day=True)
+        response = self.client.post(APPLICATIONS_URL, payload, format='json')
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(Decimal(response.data['no_of_days']), Decimal('0.5'))
+
+    def test_range_without_working_days_is_rejected(self):
+        sunday = self.monday - timedelta(days=1)
+        response = self.client.post(APPLICATIONS_URL, application_payload(self.faculty, sunday), format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('to_date', response.data)
+        self.assertFalse(LeaveApplication.objects.exists())
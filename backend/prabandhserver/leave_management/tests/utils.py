@@ -0,0 +1,24 @@
+from leave_management.models import LeaveApplication
+
+APPLICATIONS_URL = '/api/faculty/leave/applications/'
+
+
+def make_application(faculty, from_date, to_date=None, **fields):
+    """A leave application inserted directly, without the balance deduction of the create endpoint."""
+    to_date = to_date or from_date
+    fields.setdefault('leave_type', 'casual')
+    fields.setdefault('no_of_days', (to_date - from_date).days + 1)
+    fields.setdefault('reason', 'Personal work')
+    fields.setdefault('contact_during_leave', '9999999999')
+    fields.setdefault('forward_to', 'hr')
+    return LeaveApplication.objects.create(faculty=faculty, from_date=from_date, to_date=to_date, **fields)
+
+
+def application_payload(faculty, from_date, to_date=None, **fields):
+    """Request body for the applications endpoint."""
+    return {
+        'faculty': faculty.id, 'leave_type': 'casual',
+        'from_date': str(from_date), 'to_date': str(to_date or from_date),
+        'reason': 'Personal work', 'contact_during_leave': '9999999999', 'forward_to': 'hr',
+        **fields,
+    }
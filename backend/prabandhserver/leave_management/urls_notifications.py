@@ -1,6 +1,9 @@
 from django.urls import path
-from .views_notifications import save_fcm_token
+from .views_notifications import save_fcm_token, notification_list, notification_mark_read, notification_unread_count
 
 urlpatterns = [
-    path('save-fcm-token/', save_fcm_token)
+    path('save-fcm-token/', save_fcm_token),
+    path('notifications/', notification_list, name='notification-list'),
+    path('notifications/mark-read/', notification_mark_read, name='notification-mark-read'),
+    path('notifications/unread-count/', notification_unread_count, name='notification-unread-count'),
 ]
@@ -6,13 +6,20 @@ from django.db.models import Q
 from django.shortcuts import get_object_or_404
 import json
 import logging
-from django.db.models.signals import post_save
+from datetime import date, timedelta
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
+from django.utils.dateparse import parse_date
 from rest_framework.permissions import IsAuthenticated  # Fix import for IsAuthenticated
 
 from .models import LeaveApplication, ClassAdjustment, LeaveBalance
 from .serializers import LeaveApplicationSerializer, ClassAdjustmentSerializer, LeaveBalanceSerializer
+from .absence import get_absence_calendar, invalidate_absence_calendar
+from .idempotency import idempotent
+from authentication.batch import batch_response, parse_ids
+from authentication.departments import DepartmentMatcher
 from authentication.models import Faculty
+from deputy_registrar.models import Department
 from notifications.sender import send_push_notifications
 
 # Create a custom permission class for HR users
@@ -71,10 +78,24 @@ class IsVCUser(permissions.BasePermission):
         # Check if user has VC role (emptype)
         return request.user.is_authenticated and getattr(request.user, 'emptype', '').lower() in ['vc', 'vice chancellor']
 
+# Create a custom permission class for anyone who approves leave (HOD, Dean, VC, HR)
+class IsLeaveApproverUser(permissions.BasePermission):
+    """
+    Custom permission to only allow approvers to access department-wide leave data.
+    """
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and getattr(request.user, 'emptype', '').lower() in [
+            'hr', 'hod', 'head of department', 'dean', 'vc', 'vice chancellor'
+        ]
+
 class LeaveApplicationViewSet(viewsets.ModelViewSet):
     serializer_class = LeaveApplicationSerializer
     permission_classes = [permissions.IsAuthenticated]
     
+    def filter_queryset(self, queryset):
+        # faculty_details serializes the applicant, department name included
+        return super().filter_queryset(queryset).select_related('faculty__department')
+
     def get_permissions(self):
         """
         Override to use different permission classes for different actions.
@@ -99,6 +120,8 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
             logger = logging.getLogger('leave_management')
             logger.debug(f"Using VC permissions for action: {self.action}")
             return [permissions.IsAuthenticated(), IsVCUser()]
+        elif self.action == 'absence_calendar':
+            return [permissions.IsAuthenticated(), IsLeaveApproverUser()]
         return super().get_permissions()
     
     def get_queryset(self):
@@ -320,12 +343,17 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
         logger = logging.getLogger('leave_management')
         logger.info(f"Leave application created by {self.request.user.name} with status: {initial_status}, forwarded to: {forward_to}")
     
+    @idempotent
     @transaction.atomic
     def create(self, request, *args, **kwargs):
         # Extract class adjustments from request data if present
         data = request.data.copy()
         class_adjustments_data = data.pop('class_adjustments', [])
         
+        # Multipart payloads carry class_adjustments as a single JSON string
+        if isinstance(class_adjustments_data, list) and len(class_adjustments_data) == 1 and isinstance(class_adjustments_data[0], str):
+            class_adjustments_data = class_adjustments_data[0]
+        
         # Convert class_adjustments to a list if it's not already
         if isinstance(class_adjustments_data, str):
             try:
@@ -337,10 +365,15 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(data=data)
         serializer.is_valid(raise_exception=True)
         
+        # Validate every class adjustment in a single pass before touching the balance
+        adjustment_serializer = ClassAdjustmentSerializer(data=class_adjustments_data or [], many=True)
+        if not adjustment_serializer.is_valid():
+            return Response({'class_adjustments': adjustment_serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        
         # Get leave type and number of days for balance checking
-        leave_type = data.get('leave_type')
-        from decimal import Decimal
-        no_of_days = Decimal(str(data.get('no_of_days', 0)))  # Convert to Decimal to match database field type
+        # no_of_days is computed by the serializer from the working-day calendar
+        leave_type = serializer.validated_data['leave_type']
+        no_of_days = serializer.validated_data['no_of_days']
         
         # Check and deduct leave balance immediately upon application
         try:
@@ -393,16 +426,14 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
         send_push_notifications(
             leave_application.faculty,
             "Leave Application Submitted",
-            "Submitted"
+            "Submitted",
+            kind='leave_submitted',
+            payload={'leave_application_id': leave_application.id, 'status': leave_application.status},
         )
         
-        # Process the class adjustments if any
-        if class_adjustments_data:
-            for adjustment_data in class_adjustments_data:
-                adjustment_data['leave_application'] = leave_application.id
-                adjustment_serializer = ClassAdjustmentSerializer(data=adjustment_data)
-                adjustment_serializer.is_valid(raise_exception=True)
-                adjustment_serializer.save()
+        # Insert all class adjustments with one bulk query
+        if adjustment_serializer.validated_data:
+            adjustment_serializer.save(leave_application=leave_application)
         
         # Ensure we return the updated serializer
         updated_serializer = self.get_serializer(leave_application)
@@ -503,7 +534,126 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
         
+    @action(detail=False, methods=['get'])
+    def absence_calendar(self, request):
+        """
+        Per-day absence counts and names for a department or school.
+        Query params: department=<id or name> or school=<id>, from=YYYY-MM-DD, to=YYYY-MM-DD
+        (defaults to the current month). HODs are limited to their own department.
+        """
+        today = date.today()
+        from_date = parse_date(request.query_params.get('from', '') or '') or today.replace(day=1)
+        to_date = parse_date(request.query_params.get('to', '') or '')
+        if to_date is None:
+            to_date = (from_date.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+        if to_date < from_date:
+            return Response({'error': 'to must not be before from'}, status=status.HTTP_400_BAD_REQUEST)
+        if (to_date - from_date).days > 366:
+            return Response({'error': 'The window cannot exceed one year'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        department = request.query_params.get('department')
+        school = request.query_params.get('school')
+        is_hod = request.user.emptype.lower() in ['hod', 'head of department']
+        
+        if department:
+            # A name is matched within the user's school first; names repeat across schools
+            department_id = int(department) if department.isdigit() else DepartmentMatcher().match(
+                department, request.user.school_id
+            )
+            if department_id is None:
+                return Response({'error': 'Unknown department'}, status=status.HTTP_400_BAD_REQUEST)
+            department = department_id
+        
+        if is_hod:
+            if not request.user.department_id:
+                return Response({'error': 'Your profile has no department'}, status=status.HTTP_403_FORBIDDEN)
+            if department and department != request.user.department_id:
+                return Response({'error': 'HODs can only view their own department'}, status=status.HTTP_403_FORBIDDEN)
+            department, school = request.user.department_id, None
+        
+        if department:
+            scope, value = 'department', department
+        elif school:
+            if not str(school).isdigit():
+                return Response({'error': 'school must be a school id'}, status=status.HTTP_400_BAD_REQUEST)
+            scope, value = 'school', int(school)
+        else:
+            return Response({'error': 'department or school parameter is required'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            scope: Department.objects.filter(id=value).values_list('name', flat=True).first() if scope == 'department' else value,
+            'from': from_date,
+            'to': to_date,
+            'days': get_absence_calendar(scope, value, from_date, to_date),
+        })
+    
+    @action(detail=False, methods=['get'])
+    def substitutions(self, request):
+        """
+        Upcoming classes the current user has been assigned to cover for colleagues on leave.
+        """
+        adjustments = ClassAdjustment.objects.filter(
+            concerned_faculty=request.user,
+            class_date__gte=date.today(),
+        ).exclude(
+            leave_application__status__in=LeaveApplication.INACTIVE_STATUSES
+        ).order_by('class_date', 'slot').values(
+            'id', 'class_date', 'slot', 'class_timing', 'course', 'branch', 'semester', 'subject',
+            'leave_application_id', 'leave_application__status', 'leave_application__faculty__name'
+        )
+        
+        data = [
+            {
+                'id': adjustment['id'],
+                'class_date': adjustment['class_date'],
+                'slot': adjustment['slot'],
+                'class_timing': adjustment['class_timing'],
+                'course': adjustment['course'],
+                'branch': adjustment['branch'],
+                'semester': adjustment['semester'],
+                'subject': adjustment['subject'],
+                'leave_application': adjustment['leave_application_id'],
+                'leave_status': adjustment['leave_application__status'],
+                'covering_for': adjustment['leave_application__faculty__name'],
+            }
+            for adjustment in adjustments
+        ]
+        return Response({'count': len(data), 'substitutions': data})
+
+    def _visible_applications(self):
+        """
+        Q for every application this user can open through the list views:
+        their own, plus what their *_approvals list shows (all of them for HR).
+        """
+        user = self.request.user
+        role = (getattr(user, 'emptype', '') or '').lower()
+        if role == 'hr':
+            return Q()
+        visible = Q(faculty_id=user.id)
+        if role in ['hod', 'head of department']:
+            visible |= Q(forward_to=str(user.id), status='pending')
+        elif role == 'dean':
+            visible |= Q(status='forwarded_to_dean') | Q(forward_to=str(user.id))
+        elif role in ['vc', 'vice chancellor']:
+            visible |= Q(status='forwarded_to_vc') | Q(forward_to=str(user.id))
+        return visible
+
+    @action(detail=False, methods=['get'])
+    def batch(self, request):
+        """
+        Several applications in one request, ?ids=1,2,3, returned in that order.
+        Ids that do not exist or are not visible to the user are listed in 'missing'.
+        """
+        ids = parse_ids(request.query_params.get('ids'))
+        queryset = (
+            LeaveApplication.objects.filter(self._visible_applications())
+            .select_related('faculty__department')
+            .prefetch_related('class_adjustments')
+        )
+        return batch_response(queryset, ids, self.get_serializer_class(), self.get_serializer_context())
+
     @action(detail=True, methods=['post'])
+    @idempotent
     def forward_to_hr(self, request, pk=None):
         try:
             leave_application = self.get_object()
@@ -516,7 +666,9 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
                 send_push_notifications(
                     leave_application.faculty,
                     "Your Leave Application is Forwarded to HR",
-                    ""
+                    "",
+                    kind='leave_forwarded',
+                    payload={'leave_application_id': leave_application.id, 'status': leave_application.status},
                 )
             except Exception as e:
                 # Log the error but still return success
@@ -535,6 +687,7 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
     # Old duplicate methods removed - using the newer implementations below
             
     @action(detail=True, methods=['post'])
+    @idempotent
     def hr_approve(self, request, pk=None):
         logger = logging.getLogger('leave_management')
         
@@ -573,7 +726,9 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
             send_push_notifications(
                 leave_application.faculty,
                 "Leave Application Approved",
-                "Your leave application has been approved by HR."
+                "Your leave application has been approved by HR.",
+                kind='leave_approved',
+                payload={'leave_application_id': leave_application.id, 'status': leave_application.status},
             )
 
             # Return updated application data
@@ -592,6 +747,7 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_400_BAD_REQUEST)
             
     @action(detail=True, methods=['post'])
+    @idempotent
     def hr_reject(self, request, pk=None):
         logger = logging.getLogger('leave_management')
         
@@ -631,7 +787,9 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
             send_push_notifications(
                 leave_application.faculty,
                 "Leave Application Rejected",
-                "Your leave application has been rejected by HR."
+                "Your leave application has been rejected by HR.",
+                kind='leave_rejected',
+                payload={'leave_application_id': leave_application.id, 'status': leave_application.status},
             )
             logger.info(f"Successfully rejected leave application {pk}")
             
@@ -651,6 +809,7 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_400_BAD_REQUEST)
             
     @action(detail=True, methods=['post'])
+    @idempotent
     def hod_approve(self, request, pk=None):
         logger = logging.getLogger('leave_management')
         
@@ -704,7 +863,9 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
             send_push_notifications(
                 leave_application.faculty,
                 "Leave Application Approved",
-                "Your leave application has been rejected by HOD."
+                "Your leave application has been approved by HOD.",
+                kind='leave_approved',
+                payload={'leave_application_id': leave_application.id, 'status': leave_application.status},
             )
             logger.info(f"Successfully approved leave application {pk} by HOD")
             
@@ -724,6 +885,7 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_400_BAD_REQUEST)
             
     @action(detail=True, methods=['post'])
+    @idempotent
     def hod_reject(self, request, pk=None):
         logger = logging.getLogger('leave_management')
         
@@ -763,7 +925,9 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
             send_push_notifications(
                 leave_application.faculty,
                 "Leave Application Rejected",
-                "Your leave application has been rejected by HOD."
+                "Your leave application has been rejected by HOD.",
+                kind='leave_rejected',
+                payload={'leave_application_id': leave_application.id, 'status': leave_application.status},
             )
             logger.info(f"Successfully rejected leave application {pk} by HOD")
             
@@ -783,6 +947,7 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_400_BAD_REQUEST)
             
     @action(detail=True, methods=['post'])
+    @idempotent
     def dean_approve(self, request, pk=None):
         logger = logging.getLogger('leave_management')
         
@@ -832,7 +997,9 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
             send_push_notifications(
                 leave_application.faculty,
                 "Leave Application Approved",
-                "Your leave application has been approved by DEAN."
+                "Your leave application has been approved by DEAN.",
+                kind='leave_approved',
+                payload={'leave_application_id': leave_application.id, 'status': leave_application.status},
             )
             logger.info(f"Dean approved leave application {pk}, new status: {leave_application.status}")
             
@@ -852,6 +1019,7 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_400_BAD_REQUEST)
             
     @action(detail=True, methods=['post'])
+    @idempotent
     def dean_reject(self, request, pk=None):
         logger = logging.getLogger('leave_management')
         
@@ -891,7 +1059,9 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
             send_push_notifications(
                 leave_application.faculty,
                 "Leave Application Rejected",
-                "Your leave application has been rejected by Dean."
+                "Your leave application has been rejected by Dean.",
+                kind='leave_rejected',
+                payload={'leave_application_id': leave_application.id, 'status': leave_application.status},
             )
             logger.info(f"Successfully rejected leave application {pk} by Dean")
             
@@ -911,6 +1081,7 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_400_BAD_REQUEST)
             
     @action(detail=True, methods=['post'])
+    @idempotent
     def vc_approve(self, request, pk=None):
         logger = logging.getLogger('leave_management')
         
@@ -947,7 +1118,9 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
             send_push_notifications(
                 leave_application.faculty,
                 "Leave Application Approved",
-                "Your leave application has been approved by Vice-Chancellor."
+                "Your leave application has been approved by Vice-Chancellor.",
+                kind='leave_approved',
+                payload={'leave_application_id': leave_application.id, 'status': leave_application.status},
             )
             logger.info(f"VC approved leave application {pk}, final approval granted")
             
@@ -967,6 +1140,7 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_400_BAD_REQUEST)
             
     @action(detail=True, methods=['post'])
+    @idempotent
     def vc_reject(self, request, pk=None):
         logger = logging.getLogger('leave_management')
         
@@ -1006,7 +1180,9 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
             send_push_notifications(
                 leave_application.faculty,
                 "Leave Application Rejected",
-                "Your leave application has been rejected by Vice-Chancellor."
+                "Your leave application has been rejected by Vice-Chancellor.",
+                kind='leave_rejected',
+                payload={'leave_application_id': leave_application.id, 'status': leave_application.status},
             )
             logger.info(f"Successfully rejected leave application {pk} by VC")
             
@@ -1027,6 +1203,7 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
 
     # Recommendation endpoints
     @action(detail=True, methods=['post'])
+    @idempotent
     def hod_recommend_to_dean(self, request, pk=None):
         logger = logging.getLogger('leave_management')
         
@@ -1062,7 +1239,9 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
             send_push_notifications(
                 leave_application.faculty,
                 "Leave Application Recommended!",
-                "Your leave application has been recommended by HOD to DEAN"
+                "Your leave application has been recommended by HOD to DEAN",
+                kind='leave_recommended',
+                payload={'leave_application_id': leave_application.id, 'status': leave_application.status},
             )
             logger.info(f"Successfully recommended leave application {pk} to Dean by HOD")
             
@@ -1082,6 +1261,7 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_400_BAD_REQUEST)
     
     @action(detail=True, methods=['post'])
+    @idempotent
     def hod_recommend_to_vc(self, request, pk=None):
         logger = logging.getLogger('leave_management')
         
@@ -1117,7 +1297,9 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
             send_push_notifications(
                 leave_application.faculty,
                 "Leave Application Recommended!",
-                "Your leave application has been recommended by HOD to VC"
+                "Your leave application has been recommended by HOD to VC",
+                kind='leave_recommended',
+                payload={'leave_application_id': leave_application.id, 'status': leave_application.status},
             )
             logger.info(f"Successfully recommended leave application {pk} to VC by HOD")
             
@@ -1137,6 +1319,7 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_400_BAD_REQUEST)
     
     @action(detail=True, methods=['post'])
+    @idempotent
     def dean_recommend_to_vc(self, request, pk=None):
         logger = logging.getLogger('leave_management')
         
@@ -1172,7 +1355,9 @@ class LeaveApplicationViewSet(viewsets.ModelViewSet):
             send_push_notifications(
                 leave_application.faculty,
                 "Leave Application Recommended!",
-                "Your leave application has been recommended by DEAN to VC"
+                "Your leave application has been recommended by DEAN to VC",
+                kind='leave_recommended',
+                payload={'leave_application_id': leave_application.id, 'status': leave_application.status},
             )
             logger.info(f"Successfully recommended leave application {pk} to VC by Dean")
             
@@ -1438,6 +1623,35 @@ def handle_leave_balance_on_status_change(sender, instance, created, **kwargs):
     except Exception as e:
         logger.error(f"Error handling leave balance for application {instance.id}: {str(e)}", exc_info=True)
 
+@receiver(pre_save, sender=LeaveApplication)
+def remember_absence_range(sender, instance, **kwargs):
+    """Keep the stored dates of an edited application so the months it leaves are invalidated too"""
+    instance._previous_absence_range = None
+    if instance.pk:
+        instance._previous_absence_range = LeaveApplication.objects.filter(pk=instance.pk).values_list(
+            'from_date', 'to_date'
+        ).first()
+
+@receiver(post_save, sender=LeaveApplication)
+@receiver(post_delete, sender=LeaveApplication)
+def invalidate_absence_calendar_on_change(sender, instance, **kwargs):
+    """Drop cached absence calendar months touched by an application whose status or dates may have changed"""
+    ranges = [(instance.from_date, instance.to_date)]
+    previous = getattr(instance, '_previous_absence_range', None)
+    if previous and previous != ranges[0]:
+        ranges.append(previous)
+    faculty = instance.faculty
+
+    def invalidate():
+        try:
+            for from_date, to_date in ranges:
+                invalidate_absence_calendar(faculty, from_date, to_date)
+        except Exception as e:
+            logging.getLogger('leave_management').error(f"Error invalidating absence calendar for application {instance.id}: {str(e)}")
+
+    # After commit, so no worker rebuilds a month from the old rows in between
+    transaction.on_commit(invalidate)
+
 def _restore_leave_balance(self, leave_application):
         """
         Helper method to restore leave balance when an application is rejected
@@ -1,13 +1,92 @@
-from django.views.decorators.csrf import csrf_exempt
-from django.http import JsonResponse
-from authentication.models import Faculty
-from .models import FCMToken
-import json
+from django.db.models import Q
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from notifications.inbox import mark_read, unread_count
+from notifications.topics import sync_token_topics
+from .models import FCMToken, Notification
+from .serializers import NotificationSerializer
 
-@csrf_exempt 
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
 def save_fcm_token(request):
-    data = json.loads(request.body)
-    token = data.get("token")
-    user = Faculty.objects.get(id=data.get("id"))
-    FCMToken.objects.update_or_create(user=user, defaults={"token": token})
-    return JsonResponse({"message": "Token saved"})
\ No newline at end of file
+    """Register this device's FCM token for the signed-in user. Body: {"token": "..."}"""
+    token = request.data.get('token')
+    if not token or not isinstance(token, str):
+        return Response({'error': 'token is required'}, status=status.HTTP_400_BAD_REQUEST)
+    user = request.user
+    # A device token belongs to whoever signed in on that device last
+    previous_owners = FCMToken.objects.filter(token=token).exclude(user=user)
+    # The device stays subscribed to the previous owner's topics until the sync below
+    previous_topics = sorted({topic for topics in previous_owners.values_list('topics', flat=True) for topic in topics})
+    previous_owners.delete()
+    # Keep the user's other devices registered
+    fcm_token, _ = FCMToken.objects.get_or_create(user=user, token=token, defaults={'topics': previous_topics})
+    try:
+        sync_token_topics(fcm_token)
+    except Exception as e:
+        # The token is saved; topics are synced again on the next save or by sync_fcm_topics
+        print(f"Topic sync failed: {e}")
+    return Response({'message': 'Token saved'})
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def notification_list(request):
+    """
+    Newest notifications first.
+    Query params: unread=true, limit (max 100), before=<id of the last notification already shown>
+    """
+    notifications = Notification.objects.filter(recipient=request.user)
+    if request.query_params.get('unread', '').lower() in ['true', '1']:
+        notifications = notifications.filter(read_at__isnull=True)
+
+    before = request.query_params.get('before')
+    if before:
+        cursor = None
+        if before.isdigit():
+            cursor = Notification.objects.filter(recipient=request.user, id=before).values('id', 'created_at').first()
+        if cursor is None:
+            return Response({'error': 'Invalid before cursor'}, status=status.HTTP_400_BAD_REQUEST)
+        notifications = notifications.filter(
+            Q(created_at__lt=cursor['created_at']) | Q(created_at=cursor['created_at'], id__lt=cursor['id'])
+        )
+
+    try:
+        limit = min(int(request.query_params.get('limit', DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+    except ValueError:
+        return Response({'error': 'limit must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+
+    page = list(notifications.order_by('-created_at', '-id')[:limit + 1])
+    has_more = len(page) > limit
+    page = page[:limit]
+    return Response({
+        'results': NotificationSerializer(page, many=True).data,
+        'next_before': page[-1].id if has_more else None,
+        'unread_count': unread_count(request.user),
+    })
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def notification_mark_read(request):
+    """Body: {"ids": [..]} to mark specific notifications, or {"all": true}."""
+    if request.data.get('all'):
+        ids = None
+    else:
+        ids = request.data.get('ids')
+        try:
+            ids = [int(notification_id) for notification_id in ids]
+        except (TypeError, ValueError):
+            ids = None
+        if not ids:
+            return Response({'error': 'Provide a list of ids or all=true'}, status=status.HTTP_400_BAD_REQUEST)
+    marked = mark_read(request.user, ids)
+    return Response({'marked': marked, 'unread_count': unread_count(request.user)})
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def notification_unread_count(request):
+    return Response({'unread_count': unread_count(request.user)})
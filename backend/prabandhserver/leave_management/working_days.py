@@ -0,0 +1,109 @@
+"""
+Server-side working-day counter for leave applications.
+
+For every (year, school) a prefix-sum array over the days of the year is built
+once from the holiday calendar: prefix[i] is the number of working days before
+day-of-year i. Counting the working days in any from_date..to_date range is then
+two array lookups. Arrays are kept in process memory and rebuilt lazily after
+the calendar version (bumped by the Holiday signals) changes.
+"""
+import threading
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+CALENDAR_VERSION_KEY = 'leave_management:holiday_calendar_version'
+
+# Python weekday numbers (Monday=0 ... Sunday=6) that are never working days
+DEFAULT_WEEKEND_DAYS = (6,)
+
+_prefix_cache = {}
+_prefix_lock = threading.Lock()
+
+
+def get_calendar_version():
+    version = cache.get(CALENDAR_VERSION_KEY)
+    if version is None:
+        # A fresh, never-used value, so arrays built before an eviction are not picked up again
+        cache.add(CALENDAR_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(CALENDAR_VERSION_KEY)
+    return version
+
+
+def bump_calendar_version():
+    # A new timestamp rather than incr(), which is a read-modify-write on some cache backends
+    cache.set(CALENDAR_VERSION_KEY, time.time_ns(), None)
+
+
+def _weekend_days():
+    return set(getattr(settings, 'LEAVE_WEEKEND_DAYS', DEFAULT_WEEKEND_DAYS))
+
+
+def _build_year_prefix(year, school_id):
+    from .models import Holiday
+
+    holidays = Holiday.objects.filter(date__year=year)
+    if school_id:
+        holidays = holidays.filter(Q(school__isnull=True) | Q(school_id=school_id))
+    else:
+        holidays = holidays.filter(school__isnull=True)
+    holiday_dates = set(holidays.values_list('date', flat=True))
+
+    weekend_days = _weekend_days()
+    first_day = date(year, 1, 1)
+    days_in_year = (date(year + 1, 1, 1) - first_day).days
+
+    prefix = [0] * (days_in_year + 1)
+    for offset in range(days_in_year):
+        day = first_day + timedelta(days=offset)
+        is_working = day.weekday() not in weekend_days and day not in holiday_dates
+        prefix[offset + 1] = prefix[offset] + (1 if is_working else 0)
+    return prefix
+
+
+def get_year_prefix(year, school_id=None):
+    """Return the cached prefix-sum array for a year, rebuilding it if the calendar changed."""
+    version = get_calendar_version()
+    key = (year, school_id)
+    cached = _prefix_cache.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _prefix_lock:
+        cached = _prefix_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        prefix = _build_year_prefix(year, school_id)
+        _prefix_cache[key] = (version, prefix)
+        return prefix
+
+
+def is_working_day(day, school_id=None):
+    prefix = get_year_prefix(day.year, school_id)
+    index = day.timetuple().tm_yday
+    return prefix[index] - prefix[index - 1] == 1
+
+
+def count_working_days(from_date, to_date, school_id=None, half_day=False):
+    """
+    Number of working days in from_date..to_date (both inclusive) as a Decimal.
+    With half_day the first day only counts as half a day.
+    """
+    if to_date < from_date:
+        return Decimal('0')
+
+    total = 0
+    for year in range(from_date.year, to_date.year + 1):
+        prefix = get_year_prefix(year, school_id)
+        start = from_date.timetuple().tm_yday if year == from_date.year else 1
+        end = to_date.timetuple().tm_yday if year == to_date.year else len(prefix) - 1
+        total += prefix[end] - prefix[start - 1]
+
+    days = Decimal(total)
+    if half_day and is_working_day(from_date, school_id):
+        days -= Decimal('0.5')
+    return days
@@ -0,0 +1,195 @@
+"""
+Push notification backends, selected with the PUSH_NOTIFICATION_BACKEND setting.
+
+    FirebaseBackend  - Firebase Cloud Messaging (production)
+    ConsoleBackend   - prints each notification
+    InMemoryBackend  - keeps notifications in InMemoryBackend.outbox (tests)
+    FileSpoolBackend - writes one JSON file per notification to PUSH_NOTIFICATION_SPOOL_DIR
+
+A backend sends one notification to a batch of device tokens and returns a
+SendResult per token, sends to an FCM topic, and manages topic subscriptions.
+firebase_admin is only imported, and the service account only loaded, when
+FirebaseBackend sends its first message.
+"""
+import json
+import os
+import threading
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.utils import timezone
+
+
+@dataclass
+class SendResult:
+    token: str
+    success: bool
+    error: str = ''
+    # The token is unregistered or invalid and should be deleted
+    stale: bool = False
+
+
+class BasePushBackend:
+    def send_multicast(self, tokens, title, body, data=None):
+        raise NotImplementedError
+
+    def send_to_topic(self, topic, title, body, data=None):
+        """Send one message to every device subscribed to the topic. Returns a message id."""
+        raise NotImplementedError
+
+    def subscribe_to_topic(self, tokens, topic):
+        """Returns the number of tokens subscribed."""
+        raise NotImplementedError
+
+    def unsubscribe_from_topic(self, tokens, topic):
+        """Returns the number of tokens unsubscribed."""
+        raise NotImplementedError
+
+
+class FirebaseBackend(BasePushBackend):
+    """
+    Sends through firebase_admin.messaging.send_each_for_multicast.
+    Pass messaging=notifications.fake_messaging.FakeMessaging() to exercise this
+    backend without network access.
+    """
+
+    def __init__(self, messaging=None):
+        self._messaging = messaging
+        self._lock = threading.Lock()
+
+    def _get_messaging(self):
+        if self._messaging is None:
+            with self._lock:
+                if self._messaging is None:
+                    from notifications.firebase_config import initialize_firebase
+                    initialize_firebase()
+                    from firebase_admin import messaging
+                    self._messaging = messaging
+        return self._messaging
+
+    @staticmethod
+    def _is_stale_token_error(exception):
+        from firebase_admin import messaging
+        from firebase_admin.exceptions import InvalidArgumentError
+
+        if isinstance(exception, (messaging.UnregisteredError, messaging.SenderIdMismatchError)):
+            return True
+        # INVALID_ARGUMENT is also used for bad payloads, only prune on token errors
+        return isinstance(exception, InvalidArgumentError) and 'registration token' in str(exception).lower()
+
+    def send_multicast(self, tokens, title, body, data=None):
+        messaging = self._get_messaging()
+        message = messaging.MulticastMessage(
+            notification=messaging.Notification(
+                title=title,
+                body=body,
+            ),
+            data=data,
+            tokens=tokens,
+        )
+        response = messaging.send_each_for_multicast(message)
+        return [
+            SendResult(token=token, success=True) if send_response.success else SendResult(
+                token=token,
+                success=False,
+                error=str(send_response.exception),
+                stale=self._is_stale_token_error(send_response.exception),
+            )
+            for token, send_response in zip(tokens, response.responses)
+        ]
+
+    def send_to_topic(self, topic, title, body, data=None):
+        messaging = self._get_messaging()
+        return messaging.send(messaging.Message(
+            notification=messaging.Notification(
+                title=title,
+                body=body,
+            ),
+            data=data,
+            topic=topic,
+        ))
+
+    def subscribe_to_topic(self, tokens, topic):
+        return self._get_messaging().subscribe_to_topic(tokens, topic).success_count
+
+    def unsubscribe_from_topic(self, tokens, topic):
+        return self._get_messaging().unsubscribe_from_topic(tokens, topic).success_count
+
+
+class ConsoleBackend(BasePushBackend):
+    def send_multicast(self, tokens, title, body, data=None):
+        print(f"Push notification to {len(tokens)} device(s): {title} - {body} {data or ''}")
+        return [SendResult(token=token, success=True) for token in tokens]
+
+    def send_to_topic(self, topic, title, body, data=None):
+        print(f"Push notification to topic {topic}: {title} - {body} {data or ''}")
+        return f'console/{topic}'
+
+    def subscribe_to_topic(self, tokens, topic):
+        print(f"Subscribed {len(tokens)} device(s) to {topic}")
+        return len(tokens)
+
+    def unsubscribe_from_topic(self, tokens, topic):
+        print(f"Unsubscribed {len(tokens)} device(s) from {topic}")
+        return len(tokens)
+
+
+class InMemoryBackend(BasePushBackend):
+    """
+    Appends every notification to the class-level outbox, like Django's locmem
+    email backend. Tokens in unregistered_tokens are reported as stale.
+    """
+    outbox = []
+    unregistered_tokens = set()
+    topic_subscriptions = defaultdict(set)
+
+    def send_multicast(self, tokens, title, body, data=None):
+        InMemoryBackend.outbox.append({'tokens': list(tokens), 'title': title, 'body': body, 'data': data})
+        return [
+            SendResult(token=token, success=False, error='Unregistered token', stale=True)
+            if token in self.unregistered_tokens else SendResult(token=token, success=True)
+            for token in tokens
+        ]
+
+    def send_to_topic(self, topic, title, body, data=None):
+        InMemoryBackend.outbox.append({'topic': topic, 'title': title, 'body': body, 'data': data})
+        return f'memory/{len(InMemoryBackend.outbox)}'
+
+    def subscribe_to_topic(self, tokens, topic):
+        InMemoryBackend.topic_subscriptions[topic].update(tokens)
+        return len(tokens)
+
+    def unsubscribe_from_topic(self, tokens, topic):
+        InMemoryBackend.topic_subscriptions[topic].difference_update(tokens)
+        return len(tokens)
+
+
+class FileSpoolBackend(BasePushBackend):
+    def __init__(self, spool_dir=None):
+        self.spool_dir = spool_dir or getattr(
+            settings, 'PUSH_NOTIFICATION_SPOOL_DIR', os.path.join(settings.BASE_DIR, 'tmp', 'push_spool')
+        )
+
+    def _spool(self, record):
+        os.makedirs(self.spool_dir, exist_ok=True)
+        filename = f"{timezone.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}.json"
+        with open(os.path.join(self.spool_dir, filename), 'w') as spool_file:
+            json.dump(record, spool_file)
+        return filename
+
+    def send_multicast(self, tokens, title, body, data=None):
+        self._spool({'tokens': list(tokens), 'title': title, 'body': body, 'data': data})
+        return [SendResult(token=token, success=True) for token in tokens]
+
+    def send_to_topic(self, topic, title, body, data=None):
+        return self._spool({'topic': topic, 'title': title, 'body': body, 'data': data})
+
+    def subscribe_to_topic(self, tokens, topic):
+        self._spool({'subscribe': list(tokens), 'topic': topic})
+        return len(tokens)
+
+    def unsubscribe_from_topic(self, tokens, topic):
+        self._spool({'unsubscribe': list(tokens), 'topic': topic})
+        return len(tokens)
@@ -0,0 +1,165 @@
+"""
+Per-recipient coalescing of push notifications.
+
+With PUSH_COALESCE_WINDOW (seconds) set, pushes are stored as PendingPush rows
+instead of being sent. The first pending push of a recipient opens a window;
+when it closes, everything that arrived for that recipient in the meantime goes
+out as one message, a digest if there is more than one. Recipients whose
+messages end up identical share one multicast call.
+
+Windows are flushed by a background thread of the web process and by
+`manage.py flush_pending_pushes` for a dedicated worker. Inbox rows are
+written immediately either way, only the device push is delayed.
+"""
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection as db_connection, transaction
+from django.utils import timezone
+
+from leave_management.models import PendingPush
+
+logger = logging.getLogger('leave_management')
+
+DEFAULT_COALESCE_WINDOW = 0
+MAX_DIGEST_LINES = 5
+# Windows closing within this fraction of a window are flushed together, so a
+# burst that opened many windows at once is sent in a few calls, not one per recipient
+FLUSH_GRACE = 0.25
+
+_flusher_lock = threading.Lock()
+_flusher_thread = None
+_flusher_rerun = False
+
+
+def get_coalesce_window():
+    return getattr(settings, 'PUSH_COALESCE_WINDOW', DEFAULT_COALESCE_WINDOW)
+
+
+def queue_pushes(user_ids, title, body, kind='general', data=None):
+    """Hold a push for each recipient until their window closes. Returns the number queued."""
+    PendingPush.objects.bulk_create([
+        PendingPush(recipient_id=user_id, kind=kind, title=title[:255], body=body, data=data or {})
+        for user_id in user_ids
+    ])
+    transaction.on_commit(start_background_flusher)
+    return len(user_ids)
+
+
+def build_digest(pushes):
+    """Merge one recipient's pending pushes, oldest first, into (title, body, data)."""
+    if len(pushes) == 1:
+        return pushes[0].title, pushes[0].body, pushes[0].data
+
+    lines = [push.title for push in pushes[-MAX_DIGEST_LINES:]]
+    if len(pushes) > MAX_DIGEST_LINES:
+        lines.insert(0, f"...and {len(pushes) - MAX_DIGEST_LINES} earlier updates")
+    # The newest push decides where tapping the notification leads
+    data = {**pushes[-1].data, 'kind': 'digest', 'count': str(len(pushes))}
+    return f"You have {len(pushes)} new notifications", "\n".join(lines), data
+
+
+def _claim_due(window):
+    """
+    Take every pending push of the recipients whose window has closed. Rows are
+    claimed by a conditional UPDATE that only matches unclaimed rows, and only
+    the rows carrying this flusher's token are deleted and sent, so when two
+    flushers race over the same recipients each push goes out once. SQLite
+    ignores select_for_update, so row locks cannot be relied on for this.
+    """
+    cutoff = timezone.now() - timedelta(seconds=window * (1 - FLUSH_GRACE))
+    token = uuid.uuid4().hex
+    with transaction.atomic():
+        due_recipients = list(
+            PendingPush.objects.filter(created_at__lte=cutoff, claimed_by='')
+            .values_list('recipient_id', flat=True)
+            .distinct()
+        )
+        if not due_recipients:
+            return []
+        claimed = PendingPush.objects.filter(recipient_id__in=due_recipients, claimed_by='').update(claimed_by=token)
+        if not claimed:
+            return []
+        mine = PendingPush.objects.filter(claimed_by=token)
+        pushes = list(mine.order_by('recipient_id', 'created_at', 'id'))
+        mine.delete()
+    return pushes
+
+
+def flush_pending_pushes(window=None):
+    """
+    Send the pushes of every recipient whose window has closed.
+    Returns the number of pending pushes merged and messages handed to the backend.
+    """
+    from notifications.sender import deliver_push
+
+    window = get_coalesce_window() if window is None else window
+    pushes = _claim_due(window)
+    if not pushes:
+        return {'pushes': 0, 'messages': 0}
+
+    by_recipient = defaultdict(list)
+    for push in pushes:
+        by_recipient[push.recipient_id].append(push)
+
+    # Recipients with identical messages are sent together
+    by_message = defaultdict(list)
+    for recipient_id, recipient_pushes in by_recipient.items():
+        title, body, data = build_digest(recipient_pushes)
+        by_message[(title, body, tuple(sorted(data.items())))].append(recipient_id)
+
+    for (title, body, data), recipient_ids in by_message.items():
+        try:
+            deliver_push(recipient_ids, title, body, data=dict(data))
+        except Exception as e:
+            logger.error(f"Failed to deliver coalesced push to {recipient_ids}: {e}")
+
+    logger.info(f"Coalesced {len(pushes)} pushes for {len(by_recipient)} recipients into {len(by_message)} messages")
+    return {'pushes': len(pushes), 'messages': len(by_message)}
+
+
+def seconds_until_next_flush(window=None):
+    """None when nothing is pending, otherwise how long until the oldest window closes."""
+    window = get_coalesce_window() if window is None else window
+    oldest = PendingPush.objects.order_by('created_at').values_list('created_at', flat=True).first()
+    if oldest is None:
+        return None
+    return max(0.0, (oldest + timedelta(seconds=window) - timezone.now()).total_seconds())
+
+
+def _run_flusher():
+    global _flusher_thread, _flusher_rerun
+    try:
+        while True:
+            try:
+                wait = seconds_until_next_flush()
+                while wait is not None:
+                    # Small floor so rows locked by another worker do not make this spin
+                    time.sleep(max(wait, 0.1))
+                    flush_pending_pushes()
+                    wait = seconds_until_next_flush()
+            except Exception:
+                logger.exception("Push coalescing flusher failed")
+            with _flusher_lock:
+                if not _flusher_rerun:
+                    _flusher_thread = None
+                    return
+                _flusher_rerun = False
+    finally:
+        db_connection.close()
+
+
+def start_background_flusher():
+    """Flush closed windows from a background thread; at most one runs per process."""
+    global _flusher_thread, _flusher_rerun
+    with _flusher_lock:
+        if _flusher_thread is not None:
+            _flusher_rerun = True
+            return
+        _flusher_thread = threading.Thread(target=_run_flusher, name='push-coalesce-flusher', daemon=True)
+        _flusher_thread.start()
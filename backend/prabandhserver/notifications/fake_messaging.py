@@ -0,0 +1,99 @@
+"""
+In-process stand-in for firebase_admin.messaging, for tests and local development.
+
+    from notifications import sender
+    from notifications.backends import FirebaseBackend
+    from notifications.fake_messaging import FakeMessaging
+
+    fake = FakeMessaging(unregistered_tokens={'stale-token'})
+    previous = sender.set_push_backend(FirebaseBackend(messaging=fake))
+    ...
+    sender.set_push_backend(previous)
+
+Every multicast message is recorded in fake.sent, topic messages in
+fake.topic_messages and subscriptions in fake.subscriptions. Tokens listed in
+unregistered_tokens / invalid_tokens fail with the same exception types
+Firebase reports, so token pruning can be exercised without network access.
+"""
+import itertools
+
+from firebase_admin import messaging
+from firebase_admin.exceptions import InvalidArgumentError
+
+
+class FakeSendResponse:
+    def __init__(self, message_id=None, exception=None):
+        self.message_id = message_id
+        self.exception = exception
+
+    @property
+    def success(self):
+        return self.exception is None
+
+
+class FakeBatchResponse:
+    def __init__(self, responses):
+        self.responses = responses
+
+    @property
+    def success_count(self):
+        return sum(1 for response in self.responses if response.success)
+
+    @property
+    def failure_count(self):
+        return len(self.responses) - self.success_count
+
+
+class FakeTopicManagementResponse:
+    def __init__(self, success_count):
+        self.success_count = success_count
+        self.failure_count = 0
+        self.errors = []
+
+
+class FakeMessaging:
+    Notification = messaging.Notification
+    Message = messaging.Message
+    MulticastMessage = messaging.MulticastMessage
+
+    def __init__(self, unregistered_tokens=None, invalid_tokens=None):
+        self.unregistered_tokens = set(unregistered_tokens or ())
+        self.invalid_tokens = set(invalid_tokens or ())
+        self.sent = []
+        self.topic_messages = []
+        self.subscriptions = {}
+        self._ids = itertools.count(1)
+
+    def send(self, message, dry_run=False):
+        self.topic_messages.append(message)
+        return f'projects/fake/messages/{next(self._ids)}'
+
+    def subscribe_to_topic(self, tokens, topic):
+        tokens = [tokens] if isinstance(tokens, str) else tokens
+        self.subscriptions.setdefault(topic, set()).update(tokens)
+        return FakeTopicManagementResponse(len(tokens))
+
+    def unsubscribe_from_topic(self, tokens, topic):
+        tokens = [tokens] if isinstance(tokens, str) else tokens
+        self.subscriptions.setdefault(topic, set()).difference_update(tokens)
+        return FakeTopicManagementResponse(len(tokens))
+
+    def send_each_for_multicast(self, multicast_message, dry_run=False):
+        self.sent.append(multicast_message)
+        responses = []
+        for token in multicast_message.tokens:
+            if token in self.unregistered_tokens:
+                responses.append(FakeSendResponse(exception=messaging.UnregisteredError(
+                    'Requested entity was not found.'
+                )))
+            elif token in self.invalid_tokens:
+                responses.append(FakeSendResponse(exception=InvalidArgumentError(
+                    'The registration token is not a valid FCM registration token'
+                )))
+            else:
+                responses.append(FakeSendResponse(message_id=f'projects/fake/messages/{next(self._ids)}'))
+        return FakeBatchResponse(responses)
+
+    @property
+    def delivered_tokens(self):
+        return [token for message in self.sent for token in message.tokens]
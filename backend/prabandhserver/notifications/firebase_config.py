@@ -1,10 +1,18 @@
 # backend/prabandhserver/notifications/firebase_config.py
-import firebase_admin
-from firebase_admin import credentials
 import os
 
-if not firebase_admin._apps:
-    cred = credentials.Certificate(
-        os.path.join(os.path.dirname(__file__), "serviceAccountKey.json")
-    )
-    firebase_admin.initialize_app(cred)
+from django.conf import settings
+
+
+def initialize_firebase():
+    """Initialize the default Firebase app once. Called on the first push, not at import."""
+    import firebase_admin
+    from firebase_admin import credentials
+
+    if not firebase_admin._apps:
+        cred = credentials.Certificate(getattr(
+            settings,
+            'FIREBASE_CREDENTIALS_FILE',
+            os.path.join(os.path.dirname(__file__), "serviceAccountKey.json"),
+        ))
+        firebase_admin.initialize_app(cred)
@@ -0,0 +1,53 @@
+"""
+Persisted in-app notifications.
+
+Every push is also stored as a Notification row. The per-user unread total
+lives in NotificationUnreadCount and is adjusted in the same transaction as the
+rows, so reading it is a primary key lookup instead of a COUNT over the inbox.
+"""
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from leave_management.models import Notification, NotificationUnreadCount
+
+
+def create_notifications(user_ids, title, body, kind='general', payload=None):
+    """Store one notification per recipient. Returns the created rows."""
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return []
+    with transaction.atomic():
+        notifications = Notification.objects.bulk_create([
+            Notification(recipient_id=user_id, kind=kind, title=title[:255], body=body, payload=payload or {})
+            for user_id in user_ids
+        ])
+        NotificationUnreadCount.objects.bulk_create(
+            [NotificationUnreadCount(user_id=user_id) for user_id in user_ids],
+            ignore_conflicts=True,
+        )
+        NotificationUnreadCount.objects.filter(user_id__in=user_ids).update(unread=F('unread') + 1)
+    return notifications
+
+
+def mark_read(user, ids=None):
+    """Mark the given notification ids (or all of them) as read. Returns the number marked."""
+    unread = Notification.objects.filter(recipient=user, read_at__isnull=True)
+    if ids is not None:
+        unread = unread.filter(id__in=ids)
+    with transaction.atomic():
+        # Only rows that were still unread are counted, so a repeated call does not decrement twice
+        marked = unread.update(read_at=timezone.now())
+        if marked:
+            NotificationUnreadCount.objects.filter(user=user).update(unread=Greatest(F('unread') - marked, 0))
+    return marked
+
+
+def unread_count(user):
+    return (
+        NotificationUnreadCount.objects
+        .filter(user=user)
+        .values_list('unread', flat=True)
+        .first()
+    ) or 0
@@ -1,33 +1,105 @@
-from firebase_admin import messaging
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
 from leave_management.models import FCMToken
+from notifications.coalesce import get_coalesce_window, queue_pushes
+from notifications.inbox import create_notifications
+
+# FCM accepts at most 500 registration tokens per multicast request
+MAX_MULTICAST_TOKENS = 500
+DEFAULT_PUSH_BACKEND = 'notifications.backends.FirebaseBackend'
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_push_backend():
+    """The PUSH_NOTIFICATION_BACKEND instance, created on first use."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = import_string(getattr(settings, 'PUSH_NOTIFICATION_BACKEND', DEFAULT_PUSH_BACKEND))()
+    return _backend
+
+
+def set_push_backend(backend):
+    """Replace the push backend (e.g. in tests). Returns the previous one so it can be restored."""
+    global _backend
+    with _backend_lock:
+        previous = _backend
+        _backend = backend
+    return previous
+
+
+def send_push_to_users(users, title, body, data=None, kind='general', payload=None, coalesce=True):
+    """
+    Store the notification in each user's inbox, then push it to every
+    registered device of the given users.
+    With PUSH_COALESCE_WINDOW set the push is held back and merged with the
+    recipient's other pushes in that window (see notifications.coalesce);
+    coalesce=False sends it right away.
+    """
+    user_ids = [getattr(user, 'id', user) for user in users]
+    create_notifications(user_ids, title, body, kind=kind, payload=payload)
+
+    # FCM data values must be strings
+    data = {**{key: str(value) for key, value in (payload or {}).items()}, **(data or {}), 'kind': kind}
+    if coalesce and get_coalesce_window():
+        return {'queued': queue_pushes(user_ids, title, body, kind=kind, data=data)}
+    return deliver_push(user_ids, title, body, data=data)
+
+
+def deliver_push(user_ids, title, body, data=None):
+    """
+    Push one message to every registered device of the given users.
+    Tokens go out in multicast batches of MAX_MULTICAST_TOKENS; tokens that the
+    backend reports as unregistered or invalid are deleted.
+    Returns counts of sent, failed and pruned tokens.
+    """
+    tokens = list(
+        FCMToken.objects
+        .filter(user_id__in=user_ids, token__isnull=False)
+        .exclude(token='')
+        .values_list('token', flat=True)
+        .distinct()
+    )
+    result = {'sent': 0, 'failed': 0, 'pruned': 0}
+    if not tokens:
+        print(f"No FCM token found for users {user_ids}")
+        return result
+
+    backend = get_push_backend()
+    stale_tokens = []
+    for start in range(0, len(tokens), MAX_MULTICAST_TOKENS):
+        batch = tokens[start:start + MAX_MULTICAST_TOKENS]
+        try:
+            send_results = backend.send_multicast(batch, title, body, data=data)
+        except Exception as e:
+            print(f"Push Failed: {e}")
+            result['failed'] += len(batch)
+            continue
+
+        for send_result in send_results:
+            if send_result.success:
+                result['sent'] += 1
+                continue
+            result['failed'] += 1
+            if send_result.stale:
+                stale_tokens.append(send_result.token)
+            else:
+                print(f"Push Failed: {send_result.error}")
 
-# Ensure Firebase is initialized
-import notifications.firebase_config
+    if stale_tokens:
+        result['pruned'], _ = FCMToken.objects.filter(token__in=stale_tokens).delete()
+    print(f"Push notification sent: {result}")
+    return result
 
 
-def send_push_notifications(user, title, body):
+def send_push_notifications(user, title, body, data=None, kind='general', payload=None):
     try:
-        fcmtoken = (
-            FCMToken.objects
-            .filter(user=user, token__isnull=False)
-            .exclude(token='')
-            .first()
-        )
-        if not fcmtoken:
-            print(f"No FCM token found for user {user.id}")
-            return
-
-        token = fcmtoken.token
-        print(f"Using token: {token}")
-
-        message = messaging.Message(
-            notification=messaging.Notification(
-                title=title,
-                body=body,
-            ),
-            token=token,
-        )
-        response = messaging.send(message)
-        print(f"Push notification sent: {response}")
+        return send_push_to_users([user], title, body, data=data, kind=kind, payload=payload)
     except Exception as e:
         print(f"Push Failed: {e}")
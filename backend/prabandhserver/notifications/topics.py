@@ -0,0 +1,112 @@
+"""
+FCM topics for broadcasts.
+
+Every device token is subscribed to the topics of its owner: everyone, their
+school, their department and their role (emptype). A broadcast to a school
+is then a single send to that school's topic, however many faculty it has.
+The topics a token is subscribed to are stored on FCMToken.topics so a sync
+only subscribes to / unsubscribes from the difference.
+"""
+import hashlib
+import re
+from collections import defaultdict
+
+from django.conf import settings
+from django.utils.text import slugify
+
+from leave_management.models import FCMToken
+
+DEFAULT_TOPIC_PREFIX = 'prabandh'
+# FCM accepts at most 1000 registration tokens per topic management request
+MAX_TOPIC_BATCH = 1000
+AUDIENCE_TYPES = ['all', 'school', 'department', 'role']
+
+
+def _prefix():
+    return getattr(settings, 'PUSH_TOPIC_PREFIX', DEFAULT_TOPIC_PREFIX)
+
+
+def normalize_audience_value(value):
+    """
+    Department names and roles are matched case-insensitively; this is the form
+    stored on Circular.audience_value and used for topic names.
+    """
+    return str(value or '').strip().lower()
+
+
+def topic_for(audience_type, audience_value=None):
+    """FCM topic name for an audience. Topic names only allow [a-zA-Z0-9-_.~%]."""
+    if audience_type == 'all':
+        return f'{_prefix()}-all'
+    if audience_type == 'school':
+        return f'{_prefix()}-school-{int(audience_value)}'
+    value = normalize_audience_value(audience_value)
+    if audience_type == 'department':
+        # Keep the name readable; the hash keeps departments that slugify alike apart
+        digest = hashlib.sha1(value.encode('utf-8')).hexdigest()[:8]
+        return f'{_prefix()}-dept-{slugify(value)[:60]}-{digest}'
+    if audience_type == 'role':
+        return f"{_prefix()}-role-{re.sub(r'[^a-z0-9_]', '_', value)}"
+    raise ValueError(f'Unknown audience type: {audience_type}')
+
+
+def topics_for_user(user):
+    topics = [topic_for('all')]
+    if user.school_id:
+        topics.append(topic_for('school', user.school_id))
+    if user.department_id:
+        topics.append(topic_for('department', user.department.name))
+    if user.emptype:
+        topics.append(topic_for('role', user.emptype))
+    return topics
+
+
+def sync_token_topics(fcm_token, backend=None):
+    """Bring one token's subscriptions in line with its owner's school, department and role."""
+    from notifications.sender import get_push_backend
+
+    backend = backend or get_push_backend()
+    desired = topics_for_user(fcm_token.user)
+    current = set(fcm_token.topics or [])
+    for topic in [topic for topic in desired if topic not in current]:
+        backend.subscribe_to_topic([fcm_token.token], topic)
+    for topic in current - set(desired):
+        backend.unsubscribe_from_topic([fcm_token.token], topic)
+    if set(desired) != current:
+        fcm_token.topics = desired
+        fcm_token.save(update_fields=['topics'])
+    return desired
+
+
+def sync_all_topics(backend=None):
+    """
+    Resync every token, e.g. after faculty changed school or department in bulk.
+    Tokens are grouped per topic so each request carries up to MAX_TOPIC_BATCH tokens.
+    Returns the number of tokens whose subscriptions changed.
+    """
+    from notifications.sender import get_push_backend
+
+    backend = backend or get_push_backend()
+    subscribe = defaultdict(list)
+    unsubscribe = defaultdict(list)
+    changed = []
+    for fcm_token in FCMToken.objects.select_related('user', 'user__department').exclude(token=''):
+        desired = topics_for_user(fcm_token.user)
+        current = set(fcm_token.topics or [])
+        if set(desired) == current:
+            continue
+        for topic in desired:
+            if topic not in current:
+                subscribe[topic].append(fcm_token.token)
+        for topic in current - set(desired):
+            unsubscribe[topic].append(fcm_token.token)
+        fcm_token.topics = desired
+        changed.append(fcm_token)
+
+    for operations, method in ((subscribe, backend.subscribe_to_topic), (unsubscribe, backend.unsubscribe_from_topic)):
+        for topic, tokens in operations.items():
+            for start in range(0, len(tokens), MAX_TOPIC_BATCH):
+                method(tokens[start:start + MAX_TOPIC_BATCH], topic)
+
+    FCMToken.objects.bulk_update(changed, ['topics'], batch_size=500)
+    return len(changed)
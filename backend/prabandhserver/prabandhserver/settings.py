@@ -9,7 +9,9 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
+from corsheaders.defaults import default_headers
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -125,7 +127,8 @@ INSTALLED_APPS = [
     'facultyservices',  
     'hod',
     'deputy_registrar',
-    'notifications'
+    'notifications',
+    'uploads',
 ]
 
 MIDDLEWARE = [
@@ -210,6 +213,30 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Resumable chunked uploads (see uploads app)
+CHUNKED_UPLOAD_TEMP_DIR = BASE_DIR / 'tmp' / 'chunked_uploads'
+CHUNKED_UPLOAD_CHUNK_SIZE = 1024 * 1024  # Suggested chunk size sent to clients
+CHUNKED_UPLOAD_MAX_CHUNK_SIZE = 8 * 1024 * 1024
+CHUNKED_UPLOAD_MAX_SIZE = 50 * 1024 * 1024
+CHUNKED_UPLOAD_EXPIRY_HOURS = 24
+
+# Cache shared by every worker process. Cross-process state lives here: the holiday
+# calendar version, cached request principals, login throttle windows, the faculty
+# directory and the typeahead change log, so a per-process cache (LocMemCache) is
+# only correct with a single worker. The table is created by the
+# leave_management 0012_cache_table migration (or `manage.py createcachetable`).
+# Redis (django.core.cache.backends.redis.RedisCache) or Memcached work as well.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'prabandh_cache',
+        'OPTIONS': {
+            # One principal snapshot per active user, plus directory and throttle keys
+            'MAX_ENTRIES': 50000,
+        },
+    }
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -218,6 +245,9 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Use custom user model
 AUTH_USER_MODEL = 'authentication.Faculty'
 
+# Weekdays that are never counted as leave days (Monday=0 ... Sunday=6)
+LEAVE_WEEKEND_DAYS = [6]
+
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = False
 CORS_ALLOWED_ORIGINS = [
@@ -227,11 +257,40 @@ CORS_ALLOWED_ORIGINS = [
     'http://127.0.0.1:8084',
 ]
 CORS_ALLOW_CREDENTIALS = True
+CORS_ALLOW_HEADERS = [*default_headers, 'idempotency-key']
+
+# Stateless API authentication: clients use JWT only, login creates no Django session
+# and API requests never read or write django_session (the admin still uses sessions)
+AUTH_STATELESS = False
+# Keep issuing and accepting DRF Token keys ("Authorization: Token <key>")
+AUTH_LEGACY_TOKENS = True
+# Seconds a cached user snapshot is used by CachedJWTAuthentication / CachedTokenAuthentication.
+# Snapshots and their invalidation go through CACHES, shared by all worker processes.
+AUTH_PRINCIPAL_CACHE_TTL = 60
+# Seconds each process reuses a snapshot without reading CACHES; a change made in another
+# process (a deactivation, a role change) is seen by this one at most this late.
+AUTH_PRINCIPAL_LOCAL_TTL = 5
+
+# Login throttling (authentication/login_throttle.py). Attempts are counted per minute in CACHES.
+LOGIN_THROTTLE_ENABLED = True
+# Reverse proxies in front of the app. The client address is the X-Forwarded-For entry this
+# many hops from the right. 0 (clients connect directly) uses REMOTE_ADDR and ignores the
+# header, which clients can set to anything; only raise it where a proxy rewrites the header.
+LOGIN_TRUSTED_PROXY_COUNT = int(os.environ.get('LOGIN_TRUSTED_PROXY_COUNT', '0'))
+# Staff share the campus NAT address, so the per-IP limit only stops single-source floods;
+# the per-account limit and the lockout below are what stop password guessing.
+LOGIN_THROTTLE_IP_PER_MINUTE = 300
+LOGIN_THROTTLE_ACCOUNT_PER_MINUTE = 5
+# Lock an account after this many failed logins; each further failure doubles the lock
+LOGIN_LOCKOUT_THRESHOLD = 5
+LOGIN_LOCKOUT_BASE_SECONDS = 60
+LOGIN_LOCKOUT_MAX_SECONDS = 60 * 60
+LOGIN_LOCKOUT_RESET_SECONDS = 24 * 60 * 60
 
 # Session settings - Keep users logged in until manual logout
 SESSION_COOKIE_AGE = 60 * 60 * 24 * 365  # 1 year in seconds
 SESSION_EXPIRE_AT_BROWSER_CLOSE = False  # Don't expire when browser closes
-SESSION_SAVE_EVERY_REQUEST = True  # Refresh session on every request
+SESSION_SAVE_EVERY_REQUEST = not AUTH_STATELESS  # Refresh session on every request
 SESSION_COOKIE_HTTPONLY = True  # Prevent XSS attacks
 SESSION_COOKIE_SECURE = False  # Set to True in production with HTTPS
 SESSION_COOKIE_SAMESITE = 'Lax'  # CSRF protection
@@ -251,9 +310,9 @@ CSRF_COOKIE_SAMESITE = 'Lax'  # Can be 'Strict', 'Lax', or 'None' (with secure=T
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
-        'rest_framework.authentication.SessionAuthentication',
+        'authentication.authentication.CachedJWTAuthentication',
+        *(['authentication.authentication.CachedTokenAuthentication'] if AUTH_LEGACY_TOKENS else []),
+        *([] if AUTH_STATELESS else ['rest_framework.authentication.SessionAuthentication']),
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -294,9 +353,35 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=30),
 }
 
-# Logging Configuration
-import os
+# How long a stored Idempotency-Key response is replayed for retried POSTs
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+# A key still marked in progress after this long belongs to a request whose worker died;
+# the next retry runs the view again. Keep it above the worker request timeout.
+IDEMPOTENCY_PROCESSING_LEASE = timedelta(seconds=60)
+
+# Rows the HR faculty import endpoint accepts per file. Passwords are hashed in the request
+# (about 0.3s each), so larger files go through `manage.py import_faculty`.
+FACULTY_IMPORT_MAX_ROWS = 50
+
+# Push notifications (see notifications.backends). Firebase is initialized on the first send.
+# Use notifications.backends.ConsoleBackend, InMemoryBackend or FileSpoolBackend locally.
+PUSH_NOTIFICATION_BACKEND = 'notifications.backends.FirebaseBackend'
+FIREBASE_CREDENTIALS_FILE = BASE_DIR / 'notifications' / 'serviceAccountKey.json'
+PUSH_NOTIFICATION_SPOOL_DIR = BASE_DIR / 'tmp' / 'push_spool'
+# Prefix of the FCM topics used for circulars; keep it different per environment sharing a Firebase project
+PUSH_TOPIC_PREFIX = 'prabandh'
+# Seconds to hold a recipient's pushes so a burst goes out as one digest (0 sends immediately).
+# Only set it when `manage.py flush_pending_pushes --loop` runs as a dedicated worker; the
+# in-process flusher thread dies with its web worker and leaves held pushes unsent.
+PUSH_COALESCE_WINDOW = 0
+
+# Queued notification emails (see facultyservices.mail_queue)
+EMAIL_QUEUE_IN_PROCESS = True  # Drain the queue from a background thread of the web process
+EMAIL_QUEUE_BATCH_SIZE = 50
+EMAIL_QUEUE_MAX_PER_MINUTE = 60
+EMAIL_QUEUE_MAX_ATTEMPTS = 5
 
+# Logging Configuration
 # Ensure log directory exists
 LOGS_DIR = BASE_DIR / 'logs'
 os.makedirs(LOGS_DIR, exist_ok=True)
@@ -355,6 +440,11 @@ LOGGING = {
             'level': 'DEBUG',
             'propagate': False,
         },
+        'facultyservices': {
+            'handlers': ['console', 'file_errors'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
  
@@ -27,6 +27,7 @@ urlpatterns = [
     path('api/facultyservices/', include('facultyservices.urls')),  # Added faculty services URLs
     path('api/hod/', include('hod.urls')),  # Added HOD dashboard URLs
     path('api/', include('leave_management.urls_notifications')),
+    path('api/uploads/', include('uploads.urls')),  # Resumable chunked uploads
 ]
 
 # Add media URL configuration
@@ -0,0 +1,11 @@
+from django.contrib import admin
+from .models import ChunkedUpload
+
+
+class ChunkedUploadAdmin(admin.ModelAdmin):
+    list_display = ('filename', 'user', 'target', 'received_bytes', 'total_size', 'status', 'updated_at')
+    list_filter = ('status', 'target')
+    search_fields = ('filename', 'user__name')
+
+
+admin.site.register(ChunkedUpload, ChunkedUploadAdmin)
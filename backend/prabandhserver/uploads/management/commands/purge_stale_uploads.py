@@ -0,0 +1,33 @@
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from uploads.models import ChunkedUpload
+
+
+class Command(BaseCommand):
+    help = 'Delete abandoned chunked uploads and their temporary files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours',
+            type=int,
+            default=settings.CHUNKED_UPLOAD_EXPIRY_HOURS,
+            help='Remove uploads not touched for this many hours',
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        stale = ChunkedUpload.objects.filter(updated_at__lt=cutoff).exclude(status='complete')
+
+        removed = 0
+        for upload in stale.iterator():
+            if os.path.exists(upload.temp_path):
+                os.remove(upload.temp_path)
+            removed += 1
+        stale.delete()
+        ChunkedUpload.objects.filter(status='complete', updated_at__lt=cutoff).delete()
+
+        self.stdout.write(self.style.SUCCESS(f'Removed {removed} stale uploads'))
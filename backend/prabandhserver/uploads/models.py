@@ -0,0 +1,50 @@
+import os
+import uuid
+
+from django.conf import settings
+from django.db import models
+
+
+class ChunkedUpload(models.Model):
+    """
+    A resumable upload. Chunks are appended to a temporary file on disk and the
+    finished file is attached to its target model field on commit.
+    """
+    TARGET_CHOICES = [
+        ('profile_image', 'Profile Image'),
+        ('faculty_document', 'Faculty Document'),
+        ('event_file', 'Event File'),
+        ('leave_document', 'Leave Supporting Document'),
+    ]
+
+    STATUS_CHOICES = [
+        ('uploading', 'Uploading'),
+        ('complete', 'Complete'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='chunked_uploads')
+    target = models.CharField(max_length=30, choices=TARGET_CHOICES)
+    object_id = models.PositiveIntegerField(null=True, blank=True)
+    field = models.CharField(max_length=50, blank=True)
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, blank=True)
+    total_size = models.PositiveBigIntegerField()
+    received_bytes = models.PositiveBigIntegerField(default=0)
+    checksum = models.CharField(max_length=64)  # SHA-256 hex digest of the whole file
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='uploading')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'updated_at'], name='chunked_upload_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.received_bytes}/{self.total_size})"
+
+    @property
+    def temp_path(self):
+        return os.path.join(settings.CHUNKED_UPLOAD_TEMP_DIR, f'{self.id}.part')
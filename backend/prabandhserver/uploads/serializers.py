@@ -0,0 +1,42 @@
+import re
+
+from django.conf import settings
+from rest_framework import serializers
+
+from .models import ChunkedUpload
+
+
+class ChunkedUploadSerializer(serializers.ModelSerializer):
+    chunk_size = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ChunkedUpload
+        fields = [
+            'id', 'target', 'object_id', 'field', 'filename', 'content_type', 'total_size',
+            'received_bytes', 'checksum', 'status', 'chunk_size', 'created_at', 'updated_at'
+        ]
+        read_only_fields = ['id', 'received_bytes', 'status', 'chunk_size', 'created_at', 'updated_at']
+        extra_kwargs = {
+            'field': {'required': False, 'allow_blank': True},
+            'content_type': {'required': False, 'allow_blank': True},
+        }
+
+    def get_chunk_size(self, obj):
+        return settings.CHUNKED_UPLOAD_CHUNK_SIZE
+
+    def validate_checksum(self, value):
+        value = value.lower()
+        if not re.fullmatch(r'[0-9a-f]{64}', value):
+            raise serializers.ValidationError('checksum must be a SHA-256 hex digest.')
+        return value
+
+    def validate_total_size(self, value):
+        if value <= 0:
+            raise serializers.ValidationError('total_size must be positive.')
+        if value > settings.CHUNKED_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(f'File size exceeds {settings.CHUNKED_UPLOAD_MAX_SIZE // (1024 * 1024)}MB.')
+        return value
+
+    def validate_filename(self, value):
+        # Never let a client-supplied name escape the upload_to directory
+        return value.replace('\\', '/').rsplit('/', 1)[-1] or 'upload'
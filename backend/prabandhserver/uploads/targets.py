@@ -0,0 +1,76 @@
+"""
+Model fields that a chunked upload can be committed to.
+
+Each target checks that the user may write to the object, which content types
+it accepts, and how the finished file is attached.
+"""
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+
+from authentication.models import Faculty, FacultyDocument
+from facultyservices.models import EventsDetails
+from leave_management.models import LeaveApplication
+
+IMAGE_TYPES = ['image/jpeg', 'image/png', 'image/gif', 'image/webp']
+DOCUMENT_TYPES = ['application/pdf', 'image/jpeg', 'image/png']
+
+
+def _get(model, object_id):
+    try:
+        return model.objects.get(id=object_id)
+    except (model.DoesNotExist, ValueError, TypeError):
+        raise NotFound(f'{model.__name__} {object_id} not found.')
+
+
+def _check_content_type(upload, allowed):
+    if upload.content_type not in allowed:
+        raise ValidationError({'content_type': f"Invalid file type. Allowed: {', '.join(allowed)}"})
+
+
+def resolve_target(upload, user):
+    """Validate an upload's target for this user. Returns (instance, field_name)."""
+    if upload.target == 'profile_image':
+        _check_content_type(upload, IMAGE_TYPES)
+        return user, 'profile_image'
+
+    if upload.target == 'faculty_document':
+        _check_content_type(upload, DOCUMENT_TYPES)
+        faculty = _get(Faculty, upload.object_id)
+        if faculty.id != user.id and user.emptype != 'hr':
+            raise PermissionDenied('You can only upload documents to your own profile.')
+        if upload.field not in dict(FacultyDocument.DOCUMENT_TYPES):
+            raise ValidationError({'field': 'Invalid document_type.'})
+        return faculty, upload.field
+
+    if upload.target == 'event_file':
+        event = _get(EventsDetails, upload.object_id)
+        if upload.field not in EventsDetails.UPLOADABLE_FILE_FIELDS:
+            raise ValidationError({'field': 'Invalid file_type.'})
+        return event, upload.field
+
+    if upload.target == 'leave_document':
+        _check_content_type(upload, DOCUMENT_TYPES)
+        leave_application = _get(LeaveApplication, upload.object_id)
+        if leave_application.faculty_id != user.id:
+            raise PermissionDenied('You can only attach documents to your own leave applications.')
+        return leave_application, 'supporting_document'
+
+    raise ValidationError({'target': 'Invalid upload target.'})
+
+
+def attach_file(upload, instance, field, django_file):
+    """Attach the assembled file. Returns the object that now holds it."""
+    if upload.target == 'faculty_document':
+        # Replace existing document of same type for this faculty
+        FacultyDocument.objects.filter(faculty=instance, document_type=field).delete()
+        document = FacultyDocument(faculty=instance, document_type=field)
+        document.file.save(upload.filename, django_file, save=True)
+        return document
+
+    getattr(instance, field).save(upload.filename, django_file, save=False)
+    if upload.target == 'leave_document':
+        # save() would run the leave balance post_save handler, which restores the
+        # balance again whenever the application is rejected or cancelled
+        LeaveApplication.objects.filter(pk=instance.pk).update(**{field: getattr(instance, field).name})
+        return instance
+    instance.save(update_fields=[field])
+    return instance
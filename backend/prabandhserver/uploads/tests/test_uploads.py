@@ -0,0 +1,108 @@
+import hashlib
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.test import override_settings
+
+from authentication.tests.utils import APITestCase, make_faculty, next_monday
+from leave_management.models import LeaveApplication, LeaveBalance
+from leave_management.tests.utils import make_application
+from uploads.models import ChunkedUpload
+
+UPLOADS_URL = '/api/uploads/'
+PDF = b'%PDF-1.4\n' + b'0123456789abcdef' * 64
+
+
+class ChunkedUploadTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media, CHUNKED_UPLOAD_TEMP_DIR=Path(media) / 'chunks')
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.faculty = self.login(make_faculty())
+
+    def start(self, content=PDF, **fields):
+        data = {
+            'target': 'profile_image', 'filename': 'photo.png', 'content_type': 'image/png',
+            'total_size': len(content), 'checksum': hashlib.sha256(content).hexdigest(), **fields,
+        }
+        response = self.client.post(UPLOADS_URL, data, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data['id']
+
+    def put(self, upload_id, chunk, start, total=len(PDF)):
+        return self.client.generic(
+            'PUT', f'{UPLOADS_URL}{upload_id}/', chunk, content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE=f'bytes {start}-{start + len(chunk) - 1}/{total}',
+        )
+
+    def upload(self, upload_id, content=PDF, chunk_size=400):
+        for start in range(0, len(content), chunk_size):
+            response = self.put(upload_id, content[start:start + chunk_size], start, len(content))
+            self.assertEqual(response.status_code, 200, response.data)
+        return self.client.post(f'{UPLOADS_URL}{upload_id}/commit/')
+
+    def test_chunks_are_assembled_and_attached(self):
+        response = self.upload(self.start())
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['status'], 'complete')
+        self.faculty.refresh_from_db()
+        with self.faculty.profile_image.open('rb') as stored:
+            self.assertEqual(stored.read(), PDF)
+
+    def test_resume_reports_the_received_offset_and_rejects_gaps(self):
+        upload_id = self.start()
+        self.put(upload_id, PDF[:400], 0)
+
+        self.assertEqual(self.client.get(f'{UPLOADS_URL}{upload_id}/').data['received_bytes'], 400)
+        self.assertEqual(self.put(upload_id, PDF[500:600], 500).status_code, 416)
+
+    def test_resent_chunk_does_not_move_the_offset_back(self):
+        upload_id = self.start()
+        self.put(upload_id, PDF[:400], 0)
+        self.put(upload_id, PDF[400:800], 400)
+
+        response = self.put(upload_id, PDF[:400], 0)
+
+        self.assertEqual(response.data['received_bytes'], 800)
+
+    def test_incomplete_upload_cannot_be_committed(self):
+        upload_id = self.start()
+        self.put(upload_id, PDF[:400], 0)
+
+        self.assertEqual(self.client.post(f'{UPLOADS_URL}{upload_id}/commit/').status_code, 400)
+
+    def test_checksum_mismatch_fails_the_upload(self):
+        upload_id = self.start(checksum='0' * 64)
+
+        response = self.upload(upload_id)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(ChunkedUpload.objects.get(id=upload_id).status, 'failed')
+
+    def test_document_on_a_rejected_application_keeps_the_balance(self):
+        application = make_application(self.faculty, next_monday(), status='rejected_by_hr')
+        LeaveBalance.objects.filter(faculty=self.faculty).update(casual_leave_used=3)
+
+        upload_id = self.start(
+            target='leave_document', object_id=application.id, filename='note.pdf', content_type='application/pdf'
+        )
+        response = self.upload(upload_id)
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertTrue(LeaveApplication.objects.get(id=application.id).supporting_document.name.endswith('.pdf'))
+        self.assertEqual(LeaveBalance.objects.get(faculty=self.faculty).casual_leave_used, 3)
+
+    def test_documents_only_attach_to_own_applications(self):
+        application = make_application(make_faculty(), next_monday())
+
+        response = self.client.post(UPLOADS_URL, {
+            'target': 'leave_document', 'object_id': application.id, 'filename': 'note.pdf',
+            'content_type': 'application/pdf', 'total_size': len(PDF), 'checksum': hashlib.sha256(PDF).hexdigest(),
+        }, format='json')
+
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import ChunkedUploadInitView, ChunkedUploadDetailView, ChunkedUploadCommitView
+
+urlpatterns = [
+    path('', ChunkedUploadInitView.as_view(), name='chunked-upload-init'),
+    path('<uuid:upload_id>/', ChunkedUploadDetailView.as_view(), name='chunked-upload-detail'),
+    path('<uuid:upload_id>/commit/', ChunkedUploadCommitView.as_view(), name='chunked-upload-commit'),
+]
@@ -0,0 +1,157 @@
+import hashlib
+import os
+import re
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .models import ChunkedUpload
+from .serializers import ChunkedUploadSerializer
+from .targets import resolve_target, attach_file
+
+READ_BLOCK_SIZE = 64 * 1024
+CONTENT_RANGE_PATTERN = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+
+
+class _AssembledFile(File):
+    """
+    The finished temporary file. Exposing temporary_file_path lets
+    FileSystemStorage move it into place instead of copying it through memory.
+    """
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def _get_upload(request, upload_id):
+    return get_object_or_404(ChunkedUpload, id=upload_id, user=request.user)
+
+
+class ChunkedUploadInitView(APIView):
+    """
+    Start a resumable upload.
+    Body: target, object_id, field, filename, content_type, total_size, checksum (SHA-256 hex)
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = ChunkedUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = ChunkedUpload(user=request.user, **serializer.validated_data)
+        resolve_target(upload, request.user)
+        upload.save()
+
+        os.makedirs(settings.CHUNKED_UPLOAD_TEMP_DIR, exist_ok=True)
+        open(upload.temp_path, 'wb').close()
+        return Response(ChunkedUploadSerializer(upload).data, status=status.HTTP_201_CREATED)
+
+
+class ChunkedUploadDetailView(APIView):
+    """
+    GET returns the upload state, including received_bytes to resume from.
+    PUT appends one chunk of the raw request body; Content-Range: bytes <start>-<end>/<total>
+    gives its position (defaults to the current offset). DELETE aborts the upload.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, upload_id):
+        return Response(ChunkedUploadSerializer(_get_upload(request, upload_id)).data)
+
+    def put(self, request, upload_id):
+        upload = _get_upload(request, upload_id)
+        if upload.status != 'uploading':
+            return Response({'error': f'Upload is already {upload.status}.'}, status=status.HTTP_409_CONFLICT)
+
+        start = upload.received_bytes
+        content_range = request.headers.get('Content-Range')
+        if content_range:
+            match = CONTENT_RANGE_PATTERN.match(content_range.strip())
+            if not match or int(match.group(3)) != upload.total_size:
+                return Response({'error': 'Invalid Content-Range header.'}, status=status.HTTP_400_BAD_REQUEST)
+            start = int(match.group(1))
+
+        # A chunk may be re-sent (retry after a dropped connection) but never leave a gap
+        if start > upload.received_bytes:
+            return Response(
+                {'error': 'Chunk starts past the received data.', 'received_bytes': upload.received_bytes},
+                status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+            )
+
+        max_bytes = min(settings.CHUNKED_UPLOAD_MAX_CHUNK_SIZE, upload.total_size - start)
+        written = 0
+        # Stream the body to disk block by block instead of buffering the chunk in memory
+        with open(upload.temp_path, 'r+b') as temp_file:
+            temp_file.seek(start)
+            while True:
+                block = request.stream.read(READ_BLOCK_SIZE) if request.stream is not None else b''
+                if not block:
+                    break
+                written += len(block)
+                if written > max_bytes:
+                    temp_file.truncate(upload.received_bytes)
+                    return Response({'error': 'Chunk is larger than allowed.'}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+                temp_file.write(block)
+
+        # A late retry of an earlier chunk must not move the offset backwards
+        upload.received_bytes = max(upload.received_bytes, start + written)
+        upload.save(update_fields=['received_bytes', 'updated_at'])
+        return Response({'id': upload.id, 'received_bytes': upload.received_bytes, 'total_size': upload.total_size})
+
+    def delete(self, request, upload_id):
+        upload = _get_upload(request, upload_id)
+        if os.path.exists(upload.temp_path):
+            os.remove(upload.temp_path)
+        upload.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ChunkedUploadCommitView(APIView):
+    """
+    Verify size and checksum of the assembled file and attach it to its target field.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, upload_id):
+        upload = _get_upload(request, upload_id)
+        if upload.status != 'uploading':
+            return Response({'error': f'Upload is already {upload.status}.'}, status=status.HTTP_409_CONFLICT)
+        if upload.received_bytes != upload.total_size or os.path.getsize(upload.temp_path) != upload.total_size:
+            return Response(
+                {'error': 'Upload is incomplete.', 'received_bytes': upload.received_bytes},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        digest = hashlib.sha256()
+        with open(upload.temp_path, 'rb') as temp_file:
+            for block in iter(lambda: temp_file.read(READ_BLOCK_SIZE), b''):
+                digest.update(block)
+        if digest.hexdigest() != upload.checksum:
+            upload.status = 'failed'
+            upload.save(update_fields=['status', 'updated_at'])
+            os.remove(upload.temp_path)
+            return Response({'error': 'Checksum mismatch, please upload the file again.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        instance, field = resolve_target(upload, request.user)
+        with transaction.atomic():
+            with open(upload.temp_path, 'rb') as temp_file:
+                attached = attach_file(upload, instance, field, _AssembledFile(temp_file, name=upload.filename))
+            upload.status = 'complete'
+            upload.save(update_fields=['status', 'updated_at'])
+
+        if os.path.exists(upload.temp_path):
+            os.remove(upload.temp_path)
+
+        stored = getattr(attached, 'file', None) if upload.target == 'faculty_document' else getattr(attached, field)
+        return Response({
+            'id': upload.id,
+            'status': upload.status,
+            'target': upload.target,
+            'object_id': attached.id,
+            'url': request.build_absolute_uri(stored.url) if stored else None,
+        })
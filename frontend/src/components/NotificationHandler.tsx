@@ -1,6 +1,7 @@
 import { useEffect } from "react";
 import { messaging } from "../services/firebase";
 import { getToken, onMessage } from "firebase/messaging";
+import { axiosInstance } from "../services/authService";
 
 type Props = {
   userId: string;
@@ -32,11 +33,8 @@ const NotificationHandler = ({ userId }: Props) => {
           vapidKey: "BBBpr4fqn0yJwdVFgzZ6X802cF7o8QCNwemGy840x2ByX1-wIKgSPysIbCEFSKa-AwzLeNhymMNQNv-xCkgkEEU", // get from Firebase project settings → Cloud Messaging
         });
         if (currentToken) {
-            const response = await fetch(`${API_URL}save-fcm-token/`, {
-            method: "POST",
-            headers: { "Content-Type": "application/json" },
-            body: JSON.stringify({ id: userId, token: currentToken }),
-          });
+          // The server registers the token for the signed-in user
+          const response = await axiosInstance.post(`${API_URL}save-fcm-token/`, { token: currentToken });
           console.log("This is the response - ", response);
         }
       } else {